@@ -9,16 +9,23 @@ from ._version import *
 import logging
 logging.getLogger(__name__).addHandler(logging.NullHandler())
 
-from ._patches import apply as _apply_patches
-_apply_patches()
+from ._arcpy_import import import_arcpy as _import_arcpy
 
-from . import _native
-from . import _str
-from . import conversion
-from . import data
-from . import mapping
-from . import publishing
-from . import schematransform
-from . import toolbox
-from ._utils import get_arcgis_version
-from .TopicCategory import TopicCategory
\ No newline at end of file
+# None if ArcGIS isn't installed (e.g. on Linux), then only the parts of the library that don't need arcpy are
+# available, such as reading ArcGIS Pro documents with arcpyext.mapping._cim
+_arcpy = _import_arcpy()
+
+if _arcpy is not None:
+    from ._patches import apply as _apply_patches
+    _apply_patches()
+
+    from . import _native
+    from . import _str
+    from . import conversion
+    from . import data
+    from . import mapping
+    from . import publishing
+    from . import schematransform
+    from . import toolbox
+    from ._utils import get_arcgis_version
+    from .TopicCategory import TopicCategory
@@ -0,0 +1,33 @@
+# coding=utf-8
+"""This module contains a helper for importing arcpy where it may not be installed (e.g. on Linux)."""
+
+# Python 2/3 compatibility
+# pylint: disable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position,no-name-in-module
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+from future.builtins.disabled import *
+from future.builtins import *
+from future.standard_library import install_aliases
+install_aliases()
+# pylint: enable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position,no-name-in-module
+
+try:
+    from importlib.util import find_spec
+except ImportError:
+    # Python 2, where find_loader likewise returns None for a module that can't be found
+    from pkgutil import find_loader as find_spec
+
+
+def import_arcpy():
+    """Imports arcpy, returning None if it isn't installed.
+
+    An arcpy that is installed but fails to import (e.g. because ArcGIS isn't licensed, or a DLL can't be loaded)
+    raises its ImportError, rather than being mistaken for a missing arcpy.
+    """
+    try:
+        import arcpy
+    except ImportError:
+        if find_spec("arcpy") is not None:
+            raise
+        return None
+
+    return arcpy
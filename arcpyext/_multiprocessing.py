@@ -11,8 +11,17 @@ install_aliases()
 # pylint: enable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position,no-name-in-module
 
 import multiprocessing as _mp
+import pickle as _pickle
 import traceback as _tb
 
+from queue import Empty as _Empty
+
+from .exceptions import ArcPyExtError
+
+# how long (in seconds) to wait on results before checking that pool workers are still alive
+_POLL_INTERVAL = 1.0
+
+
 class Process(_mp.Process):
     """
     Extends multiprocessing.Process to catch exceptions thrown on the sub-process and make them available to the
@@ -36,4 +45,96 @@ class Process(_mp.Process):
     def exception(self):
         if self._pconn.poll():
             self._exception = self._pconn.recv()
-        return self._exception
\ No newline at end of file
+        return self._exception
+
+
+def imap_unordered(func, iterable, max_workers=None):
+    """
+    Applies a function to each item of an iterable across a pool of worker processes, yielding results as they become
+    available (not necessarily in the order of the iterable).
+
+    Each result is yielded as an (item, result, error) tuple.  If the function raised an exception for an item, result
+    is None and error is an (exception, traceback string) tuple, otherwise error is None.  If a worker process itself
+    fails, an ArcPyExtError is raised carrying the worker's traceback.
+
+    The function, the items and the results must all be picklable (e.g. the function must be defined at the top-level
+    of a module).
+
+    :param func: The function to apply to each item.
+    :param iterable: The items to process.
+    :param max_workers: The maximum number of worker processes to start, defaults to the number of CPUs.
+    """
+
+    items = list(iterable)
+    if not items:
+        return
+
+    max_workers = min(max_workers or _mp.cpu_count(), len(items))
+
+    tasks = _mp.Queue()
+    results = _mp.Queue()
+
+    for task in enumerate(items):
+        tasks.put(task)
+
+    # one sentinel per worker, signalling there is no more work
+    for _ in range(max_workers):
+        tasks.put(None)
+
+    workers = [Process(target=_pool_worker, args=(func, tasks, results)) for _ in range(max_workers)]
+    for w in workers:
+        w.daemon = True
+        w.start()
+
+    completed = False
+    try:
+        for _ in range(len(items)):
+            index, result, error = _get_pool_result(results, workers)
+            yield items[index], result, error
+
+        completed = True
+    finally:
+        for w in workers:
+            if not completed and w.is_alive():
+                # results are no longer wanted, stop any outstanding work
+                w.terminate()
+            w.join()
+
+
+def _get_pool_result(results, workers):
+    while True:
+        try:
+            return results.get(timeout=_POLL_INTERVAL)
+        except _Empty:
+            if any(w.is_alive() for w in workers):
+                continue
+
+        # all workers have exited, anything they sent before exiting is already in the queue
+        try:
+            return results.get(timeout=_POLL_INTERVAL)
+        except _Empty:
+            pass
+
+        for w in workers:
+            if w.exception:
+                exception, traceback = w.exception
+                raise ArcPyExtError("A worker process failed:\n{}".format(traceback), exception)
+
+        raise ArcPyExtError("Worker processes exited before all items were processed.")
+
+
+def _picklable_exception(exception):
+    try:
+        _pickle.loads(_pickle.dumps(exception))
+        return exception
+    except Exception:
+        # exception can't be sent between processes, send a stand-in that describes it
+        return RuntimeError("{}: {}".format(type(exception).__name__, exception))
+
+
+def _pool_worker(func, tasks, results):
+    for index, item in iter(tasks.get, None):
+        try:
+            results.put((index, func(item), None))
+        except Exception as e:
+            results.put((index, None, (_picklable_exception(e), _tb.format_exc())))
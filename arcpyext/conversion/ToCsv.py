@@ -11,30 +11,113 @@ install_aliases()
 # pylint: enable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position
 
 # Local imports
+from ._csv import get_csv_file_paths
 from ._ToCsvBase import ToCsvBase
+from ._transform import combine_where_clauses
 
 
 class ToCsv(ToCsvBase):
 
     #region Public overrides
 
-    def feature_class(self, input_fc, output_fc, use_field_alias_as_column_header=False):
+    def feature_class(
+        self,
+        input_fc,
+        output_fc,
+        use_field_alias_as_column_header=False,
+        compression=None,
+        max_rows_per_file=None,
+        max_bytes_per_file=None,
+        field_names=None,
+        where_clause=None,
+        use_domain_descriptions=False
+    ):
 
         return super().feature_class(
-            input_fc, output_fc, use_field_alias_as_column_header=use_field_alias_as_column_header
+            input_fc,
+            output_fc,
+            use_field_alias_as_column_header=use_field_alias_as_column_header,
+            compression=compression,
+            max_rows_per_file=max_rows_per_file,
+            max_bytes_per_file=max_bytes_per_file,
+            field_names=field_names,
+            where_clause=where_clause,
+            use_domain_descriptions=use_domain_descriptions
         )
 
-    def table(self, input_table, output_table, use_field_alias_as_column_header=False):
+    def table(
+        self,
+        input_table,
+        output_table,
+        use_field_alias_as_column_header=False,
+        compression=None,
+        max_rows_per_file=None,
+        max_bytes_per_file=None,
+        field_names=None,
+        where_clause=None,
+        use_domain_descriptions=False
+    ):
         return super().table(
-            input_table, output_table, use_field_alias_as_column_header=use_field_alias_as_column_header
+            input_table,
+            output_table,
+            use_field_alias_as_column_header=use_field_alias_as_column_header,
+            compression=compression,
+            max_rows_per_file=max_rows_per_file,
+            max_bytes_per_file=max_bytes_per_file,
+            field_names=field_names,
+            where_clause=where_clause,
+            use_domain_descriptions=use_domain_descriptions
         )
 
     def relationship_class(self, input_rel, output_rel):
         return super().relationship_class(input_rel, output_rel)
 
-    def workspace(self, input_workspace, output_path, use_field_alias_as_column_header=False):
+    def workspace(
+        self,
+        input_workspace,
+        output_path,
+        use_field_alias_as_column_header=False,
+        max_workers=None,
+        compression=None,
+        max_rows_per_file=None,
+        max_bytes_per_file=None,
+        incremental=False,
+        field_names=None,
+        where_clause=None,
+        use_domain_descriptions=False
+    ):
         return super().workspace(
-            input_workspace, output_path, use_field_alias_as_column_header=use_field_alias_as_column_header
+            input_workspace,
+            output_path,
+            max_workers=max_workers,
+            incremental=incremental,
+            use_field_alias_as_column_header=use_field_alias_as_column_header,
+            compression=compression,
+            max_rows_per_file=max_rows_per_file,
+            max_bytes_per_file=max_bytes_per_file,
+            field_names=field_names,
+            where_clause=where_clause,
+            use_domain_descriptions=use_domain_descriptions
         )
 
-    #endregion
\ No newline at end of file
+    #endregion
+
+    #region Private overrides
+
+    def _append_rows(self, desc, output, where_clause, **kwargs):
+        if kwargs.get("max_rows_per_file") or kwargs.get("max_bytes_per_file"):
+            # rows can't be appended to split output, as the last part may already be full
+            return False
+
+        kwargs["where_clause"] = combine_where_clauses(kwargs.get("where_clause"), where_clause)
+        self._dataset_to_csv(desc, output, append=True, **kwargs)
+        return True
+
+    def _delete_output(self, output, **kwargs):
+        for file_path in get_csv_file_paths(output):
+            file_path.unlink()
+
+    def _output_exists(self, output, **kwargs):
+        return len(get_csv_file_paths(output)) > 0
+
+    #endregion
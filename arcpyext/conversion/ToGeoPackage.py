@@ -17,25 +17,71 @@ from pathlib2 import Path
 
 # Local imports
 from ._ConvertBase import ConvertBase
+from ._geopackage import GeoPackageWriter
+
+# GeoPackage geometry types of each arcpy shape type, other shape types (e.g. multipatches) are written as GEOMETRY
+_GEOMETRY_TYPES = {
+    "Multipoint": "MULTIPOINT",
+    "Point": "POINT",
+    "Polygon": "MULTIPOLYGON",
+    "Polyline": "MULTILINESTRING"
+}
 
 
 class ToGeoPackage(ConvertBase):
     #region Public overrides
 
-    def feature_class(self, input_fc, output_fc):
-        super().feature_class(input_fc, output_fc)
+    def feature_class(
+        self,
+        input_fc,
+        output_fc,
+        field_names=None,
+        where_clause=None,
+        use_domain_descriptions=False,
+        simplify_tolerance=None
+    ):
+        super().feature_class(
+            input_fc,
+            output_fc,
+            field_names=field_names,
+            where_clause=where_clause,
+            use_domain_descriptions=use_domain_descriptions,
+            simplify_tolerance=simplify_tolerance
+        )
         self._clear_file_locks(Path(output_fc).parent)
 
-    def table(self, input_table, output_table):
-        super().table(input_table, output_table)
+    def table(self, input_table, output_table, field_names=None, where_clause=None, use_domain_descriptions=False):
+        super().table(
+            input_table,
+            output_table,
+            field_names=field_names,
+            where_clause=where_clause,
+            use_domain_descriptions=use_domain_descriptions
+        )
         self._clear_file_locks(Path(output_table).parent)
 
     def relationship_class(self, input_rel, output_rel):
         super().relationship_class(input_rel, output_rel)
 
-    def workspace(self, input_workspace, output_path, version=None):
-        super().workspace(input_workspace, output_path, version=version)
-        self._clear_file_locks(output_path)
+    def workspace(
+        self,
+        input_workspace,
+        output_path,
+        version=None,
+        field_names=None,
+        where_clause=None,
+        use_domain_descriptions=False,
+        simplify_tolerance=None
+    ):
+        super().workspace(
+            input_workspace,
+            output_path,
+            version=version,
+            field_names=field_names,
+            where_clause=where_clause,
+            use_domain_descriptions=use_domain_descriptions,
+            simplify_tolerance=simplify_tolerance
+        )
 
     #endregion
 
@@ -48,11 +94,11 @@ class ToGeoPackage(ConvertBase):
         # create parent directory if it doesn't exist
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        spatial_type = "GEOPACKAGE" if kwargs["version"] == None else "GEOPACKAGE_{}".format(kwargs["version"])
-        arcpy.CreateSQLiteDatabase_management(str(output_path), spatial_type)
+        # created directly, so arcpy never opens (and locks) the GeoPackage
+        GeoPackageWriter(output_path, _get_version(kwargs.get("version"))).close()
 
     def _feature_class(self, desc, output_fc, **kwargs):
-        arcpy.FeatureClassToFeatureClass_conversion(desc.catalogPath, str(output_fc.parent), str(output_fc.name))
+        self._dataset_to_geopackage(desc, output_fc, **kwargs)
 
     def _feature_class_default_name(self, desc, output_workspace, **kwargs):
         """
@@ -61,7 +107,7 @@ class ToGeoPackage(ConvertBase):
         return output_workspace.joinpath(desc.name)
 
     def _table(self, desc, output_table, **kwargs):
-        arcpy.TableToTable_conversion(desc.catalogPath, str(output_table.parent), str(output_table.name))
+        self._dataset_to_geopackage(desc, output_table, **kwargs)
 
     def _table_default_name(self, desc, output_workspace, **kwargs):
         """
@@ -81,10 +127,38 @@ class ToGeoPackage(ConvertBase):
     #region Private functions
 
     def _clear_file_locks(self, output_path):
-        # arcpy holds a lock on the geopackage after creation.
+        # arcpy holds a lock on the geopackage after checking whether the output exists.
         # Despite the documentation saying it only works with Enterprise geodatabases, running the below function
         # removes the lock, and is the only way I've found to do this (playing with the "Result" object returned from
         # the function proved fruitless - note that the documentation doesn't mention the function returning anything).
         arcpy.ClearWorkspaceCache_management(str(output_path))
 
-    #endregion
\ No newline at end of file
+    def _dataset_to_geopackage(self, desc, output, **kwargs):
+        version = _get_version(kwargs.pop("version", None))
+
+        fields = self._get_fields(desc, include_geometry=True, **kwargs)
+
+        # rows are written to the GeoPackage's database directly, with geometry read as well-known binary
+        with GeoPackageWriter(output.parent, version) as writer:
+            srs_id = -1
+            if desc.spatialReference is not None:
+                spatial_reference = desc.spatialReference
+                srs_id = writer.add_spatial_reference(
+                    spatial_reference.name, spatial_reference.factoryCode, spatial_reference.wkt
+                )
+
+            writer.write_table(
+                output.name, [(f.name, f.type) for f in fields],
+                self._read_rows(desc, fields, "WKB", **kwargs),
+                geometry_type=_GEOMETRY_TYPES.get(desc.shapeType, "GEOMETRY"),
+                srs_id=srs_id,
+                z=2 if desc.hasZ else 0,
+                m=2 if desc.hasM else 0
+            )
+
+    #endregion
+
+
+def _get_version(version):
+    # versions were given as strings or numbers when GeoPackages were created with CreateSQLiteDatabase
+    return None if version is None else float(version)
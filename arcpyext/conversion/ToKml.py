@@ -30,8 +30,8 @@ class ToKml(ToCsvBase):
     def relationship_class(self, input_rel, output_rel):
         return super().relationship_class(input_rel, output_rel)
 
-    def workspace(self, input_workspace, output_path):
-        return super().workspace(input_workspace, output_path)
+    def workspace(self, input_workspace, output_path, max_workers=None, incremental=False):
+        return super().workspace(input_workspace, output_path, max_workers=max_workers, incremental=incremental)
 
     #endregion
 
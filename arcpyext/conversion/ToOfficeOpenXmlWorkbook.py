@@ -17,20 +17,34 @@ from io import BytesIO
 
 # Third-party imports
 import arcpy
-import xlsxwriter
 
 from pathlib2 import Path
 
 # Local imports
 from ._ConvertBase import ConvertBase
-from ._helpers import get_textual_fields
+from ._metadata import MetadataCache
+from ._ooxml import Workbook
+
+
+# index of the last row of a worksheet (Excel sheets have 1,048,576 rows)
+_MAX_SHEET_ROW = 1048575
 
 
 class ToOfficeOpenXmlWorkbook(ConvertBase):
 
     #region Public overrides
 
-    def feature_class(self, input_fc, output_workbook, use_field_alias_as_column_header=False):
+    def feature_class(
+        self,
+        input_fc,
+        output_workbook,
+        use_field_alias_as_column_header=False,
+        constant_memory=False,
+        field_names=None,
+        where_clause=None,
+        use_domain_descriptions=False,
+        simplify_tolerance=None
+    ):
         if not arcpy.Exists(input_fc):
             raise ValueError("input_fc does not exist.")
 
@@ -40,23 +54,41 @@ class ToOfficeOpenXmlWorkbook(ConvertBase):
             raise ValueError("output_workbook already exists.")
 
         # get input feature class description for copy process
-        input_fc_desc = arcpy.Describe(input_fc)
+        input_fc_desc = MetadataCache().describe(input_fc)
 
         if not input_fc_desc.dataType == "FeatureClass":
             raise ValueError("input_fc is not of type 'FeatureClass'.")
 
-        output_workbook = xlsxwriter.Workbook(str(output_workbook))
+        output_workbook = self._create_workbook(output_workbook, constant_memory)
 
         sheet_name = self._feature_class_default_name(input_fc_desc, output_workbook)
 
-        self._feature_class(input_fc_desc, output_workbook, sheet_name, use_field_alias_as_column_header)
+        self._feature_class(
+            input_fc_desc,
+            output_workbook,
+            sheet_name,
+            use_field_alias_as_column_header,
+            field_names=field_names,
+            where_clause=where_clause,
+            use_domain_descriptions=use_domain_descriptions,
+            simplify_tolerance=simplify_tolerance
+        )
 
         output_workbook.close()
 
         del input_fc_desc
         arcpy.management.ClearWorkspaceCache()
 
-    def table(self, input_table, output_workbook, use_field_alias_as_column_header=False):
+    def table(
+        self,
+        input_table,
+        output_workbook,
+        use_field_alias_as_column_header=False,
+        constant_memory=False,
+        field_names=None,
+        where_clause=None,
+        use_domain_descriptions=False
+    ):
         if not arcpy.Exists(input_table):
             raise ValueError("input_table does not exist.")
 
@@ -66,16 +98,24 @@ class ToOfficeOpenXmlWorkbook(ConvertBase):
             raise ValueError("output_table already exists.")
 
         # get input feature class description for copy process
-        input_table_desc = arcpy.Describe(input_table)
+        input_table_desc = MetadataCache().describe(input_table)
 
         if not input_table_desc.dataType == "Table":
             raise ValueError("input_table is not of type 'Table'.")
 
-        output_workbook = xlsxwriter.Workbook(str(output_workbook))
+        output_workbook = self._create_workbook(output_workbook, constant_memory)
 
         sheet_name = self._table_default_name(input_table_desc, output_workbook)
 
-        self._table(input_table_desc, output_workbook, sheet_name, use_field_alias_as_column_header)
+        self._table(
+            input_table_desc,
+            output_workbook,
+            sheet_name,
+            use_field_alias_as_column_header,
+            field_names=field_names,
+            where_clause=where_clause,
+            use_domain_descriptions=use_domain_descriptions
+        )
 
         output_workbook.close()
 
@@ -85,11 +125,22 @@ class ToOfficeOpenXmlWorkbook(ConvertBase):
     def relationship_class(self, input_rel, output_rel):
         return super().relationship_class(input_rel, output_rel)
 
-    def workspace(self, input_workspace, output_path, use_field_alias_as_column_header=False):
+    def workspace(
+        self,
+        input_workspace,
+        output_path,
+        use_field_alias_as_column_header=False,
+        constant_memory=False,
+        field_names=None,
+        where_clause=None,
+        use_domain_descriptions=False,
+        simplify_tolerance=None
+    ):
         if not arcpy.Exists(input_workspace):
             raise ValueError("input_workspace does not exist.")
 
-        input_workspace_desc = arcpy.Describe(input_workspace)
+        # children are snapshots taken from a single description of the workspace
+        input_workspace_desc = MetadataCache().describe_workspace(input_workspace)
 
         if not input_workspace_desc.dataType == "Workspace":
             raise ValueError("input_workspace is not of type 'Workspace'.")
@@ -98,23 +149,34 @@ class ToOfficeOpenXmlWorkbook(ConvertBase):
         output_path = Path(output_path).resolve()
 
         output_workbook = self._create_output_workspace(
-            output_path, use_field_alias_as_column_header=use_field_alias_as_column_header
+            output_path,
+            use_field_alias_as_column_header=use_field_alias_as_column_header,
+            constant_memory=constant_memory
         )
 
+        transform_options = {
+            "field_names": field_names,
+            "where_clause": where_clause,
+            "use_domain_descriptions": use_domain_descriptions,
+            "simplify_tolerance": simplify_tolerance
+        }
+
         for c in input_workspace_desc.children:
             if c.dataType == 'FeatureClass':
                 self._feature_class(
                     c,
                     output_workbook,
                     self._feature_class_default_name(c, output_workbook),
-                    use_field_alias_as_column_header=use_field_alias_as_column_header
+                    use_field_alias_as_column_header=use_field_alias_as_column_header,
+                    **transform_options
                 )
             elif c.dataType == 'Table':
                 self._table(
                     c,
                     output_workbook,
                     self._table_default_name(c, output_workbook),
-                    use_field_alias_as_column_header=use_field_alias_as_column_header
+                    use_field_alias_as_column_header=use_field_alias_as_column_header,
+                    **transform_options
                 )
             elif c.dataType == 'RelationshipClass':
                 self._relationship_class(
@@ -136,10 +198,10 @@ class ToOfficeOpenXmlWorkbook(ConvertBase):
 
         # create directory if it doesn't exist
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        return xlsxwriter.Workbook(str(output_path))
+        return self._create_workbook(output_path, kwargs.get("constant_memory", False))
 
-    def _feature_class(self, desc, output_workbook, sheet_name, use_field_alias_as_column_header):
-        self._dataset_to_ooxml(desc.catalogPath, output_workbook, sheet_name, use_field_alias_as_column_header)
+    def _feature_class(self, desc, output_workbook, sheet_name, use_field_alias_as_column_header, **kwargs):
+        self._dataset_to_ooxml(desc, output_workbook, sheet_name, use_field_alias_as_column_header, **kwargs)
 
     def _feature_class_default_name(self, desc, output_workbook, **kwargs):
         """
@@ -147,8 +209,8 @@ class ToOfficeOpenXmlWorkbook(ConvertBase):
         """
         return self._get_default_name(desc, output_workbook)
 
-    def _table(self, desc, output_workbook, sheet_name, use_field_alias_as_column_header):
-        self._dataset_to_ooxml(desc.catalogPath, output_workbook, sheet_name, use_field_alias_as_column_header)
+    def _table(self, desc, output_workbook, sheet_name, use_field_alias_as_column_header, **kwargs):
+        self._dataset_to_ooxml(desc, output_workbook, sheet_name, use_field_alias_as_column_header, **kwargs)
 
     def _table_default_name(self, desc, output_workbook, **kwargs):
         """
@@ -167,49 +229,54 @@ class ToOfficeOpenXmlWorkbook(ConvertBase):
 
     #region Private functions
 
-    def _dataset_to_ooxml(self, dataset, workbook, sheet_name, use_field_alias_as_column_header):
+    def _create_workbook(self, output_path, constant_memory):
+        # in constant memory mode, each row is written out when the next is started, rather than kept until closing
+        return Workbook(str(output_path), {"constant_memory": constant_memory})
+
+    def _dataset_to_ooxml(self, desc, workbook, sheet_name, use_field_alias_as_column_header, **kwargs):
         worksheet = workbook.add_worksheet(sheet_name)
 
-        fields = get_textual_fields(dataset, include_geometry=True)
+        fields = self._get_fields(desc, include_geometry=True, **kwargs)
 
-        # get fields, including shape as well-known text, write data to spreadsheet
-        field_names = [f.name + "@WKT" if f.type == "Geometry" else f.name for f in fields]
-        row_no = 0
-        with arcpy.da.SearchCursor(dataset, field_names) as cursor:
-            for row in cursor:
-                row_no += 1
-                worksheet.write_row(row_no, 0, row)
+        header_attr = "name" if use_field_alias_as_column_header == False else "aliasName"
+        headers = [getattr(f, header_attr) for f in fields]
 
-        # create table layout, if any data was written
-        if row_no > 0:
-            header_attr = "name" if use_field_alias_as_column_header == False else "aliasName"
-            worksheet.add_table(
-                0, 0, row_no - 1,
-                len(fields) - 1, {"columns": [{
-                    "header": getattr(f, header_attr)
-                } for f in fields]}
-            )
+        # tables can't be added in constant memory mode (they write their header after the data), so the header is
+        # written before the data instead
+        if workbook.constant_memory:
+            worksheet.write_row(0, 0, headers)
 
-    def _get_default_name(self, desc, output_workbook, **kwargs):
-        # get the default name for OOXML, respecting the 31 character limit and avoiding collisions
+        # write data to spreadsheet, including shape as well-known text
+        row_no = 0
+        for row in self._read_rows(desc, fields, "WKT", **kwargs):
+            if row_no == _MAX_SHEET_ROW:
+                # sheet is full, continue on a new sheet
+                self._add_sheet_layout(worksheet, row_no, headers)
 
-        name = desc.name
+                worksheet = workbook.add_worksheet(workbook.get_unique_sheet_name(sheet_name))
+                if workbook.constant_memory:
+                    worksheet.write_row(0, 0, headers)
+                row_no = 0
 
-        if len(name) > 31:
-            name = name[:31]
+            row_no += 1
+            worksheet.write_row(row_no, 0, row)
 
-        worksheet = output_workbook.get_worksheet_by_name(name)
+        self._add_sheet_layout(worksheet, row_no, headers)
 
-        if worksheet != None:
-            # worksheet with that name already exists, generate a name that doesn't
-            i = 1
-            while True:
-                test_name = "{}~{}".format(name[:31 - (1 + len(str(i)))], str(i))
-                worksheet = output_workbook.get_worksheet_by_name(test_name)
-                if worksheet != None:
-                    name = test_name
-                    break
+    def _add_sheet_layout(self, worksheet, row_count, headers):
+        # create table layout, if any data was written
+        if row_count == 0:
+            return
+
+        if worksheet.constant_memory:
+            # filter and freeze the header row written with the data
+            worksheet.autofilter(0, 0, row_count, len(headers) - 1)
+            worksheet.freeze_panes(1, 0)
+        else:
+            worksheet.add_table(0, 0, row_count, len(headers) - 1, {"columns": [{"header": h} for h in headers]})
 
-        return name
+    def _get_default_name(self, desc, output_workbook, **kwargs):
+        # get the default name for OOXML, respecting the 31 character limit and avoiding collisions
+        return output_workbook.get_unique_sheet_name(desc.name)
 
     #endregion
\ No newline at end of file
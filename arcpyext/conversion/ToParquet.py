@@ -0,0 +1,136 @@
+# coding=utf-8
+"""Class for converting to the Apache Parquet format."""
+
+# Python 2/3 compatibility
+# pylint: disable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+from future.builtins.disabled import *
+from future.builtins import *
+from future.standard_library import install_aliases
+install_aliases()
+# pylint: enable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position
+
+# Local imports
+from ._ConvertBase import ConvertBase
+from ._parquet import PARQUET_COMPRESSION, PARQUET_ROW_GROUP_SIZE, ParquetFileWriter
+
+
+class ToParquet(ConvertBase):
+
+    #region Public overrides
+
+    def feature_class(
+        self,
+        input_fc,
+        output_fc,
+        row_group_size=PARQUET_ROW_GROUP_SIZE,
+        compression=PARQUET_COMPRESSION,
+        field_names=None,
+        where_clause=None,
+        use_domain_descriptions=False,
+        simplify_tolerance=None
+    ):
+        return super().feature_class(
+            input_fc,
+            output_fc,
+            row_group_size=row_group_size,
+            compression=compression,
+            field_names=field_names,
+            where_clause=where_clause,
+            use_domain_descriptions=use_domain_descriptions,
+            simplify_tolerance=simplify_tolerance
+        )
+
+    def table(
+        self,
+        input_table,
+        output_table,
+        row_group_size=PARQUET_ROW_GROUP_SIZE,
+        compression=PARQUET_COMPRESSION,
+        field_names=None,
+        where_clause=None,
+        use_domain_descriptions=False
+    ):
+        return super().table(
+            input_table,
+            output_table,
+            row_group_size=row_group_size,
+            compression=compression,
+            field_names=field_names,
+            where_clause=where_clause,
+            use_domain_descriptions=use_domain_descriptions
+        )
+
+    def relationship_class(self, input_rel, output_rel):
+        return super().relationship_class(input_rel, output_rel)
+
+    def workspace(
+        self,
+        input_workspace,
+        output_path,
+        max_workers=None,
+        row_group_size=PARQUET_ROW_GROUP_SIZE,
+        compression=PARQUET_COMPRESSION,
+        incremental=False,
+        field_names=None,
+        where_clause=None,
+        use_domain_descriptions=False,
+        simplify_tolerance=None
+    ):
+        return super().workspace(
+            input_workspace,
+            output_path,
+            max_workers=max_workers,
+            incremental=incremental,
+            row_group_size=row_group_size,
+            compression=compression,
+            field_names=field_names,
+            where_clause=where_clause,
+            use_domain_descriptions=use_domain_descriptions,
+            simplify_tolerance=simplify_tolerance
+        )
+
+    #endregion
+
+    #region Private overrides
+
+    def _create_output_workspace(self, output_path, **kwargs):
+
+        # create directory if it doesn't exist
+        output_path.mkdir(parents=True, exist_ok=True)
+
+    def _feature_class(self, desc, output_fc, **kwargs):
+        self._dataset_to_parquet(desc, output_fc, **kwargs)
+
+    def _feature_class_default_name(self, desc, output_workspace, **kwargs):
+        """
+        Creates a Path object representing the full path of an output feature class in the Parquet format.
+        """
+        return output_workspace.joinpath(desc.name + ".parquet")
+
+    def _table(self, desc, output_table, **kwargs):
+        self._dataset_to_parquet(desc, output_table, **kwargs)
+
+    def _table_default_name(self, desc, output_workspace, **kwargs):
+        """
+        Creates a Path object representing the full path of an output table in the Parquet format.
+        """
+        return output_workspace.joinpath(desc.name + ".parquet")
+
+    #endregion
+
+    #region Private functions
+
+    def _dataset_to_parquet(self, desc, output_file_path, **kwargs):
+        row_group_size = kwargs.pop("row_group_size", PARQUET_ROW_GROUP_SIZE)
+        compression = kwargs.pop("compression", PARQUET_COMPRESSION)
+
+        fields = self._get_fields(desc, include_geometry=True, **kwargs)
+
+        # geometry is read as well-known binary, under the name of its field
+        with ParquetFileWriter(
+            output_file_path, [(f.name, f.type) for f in fields], row_group_size, compression
+        ) as writer:
+            writer.write_rows(self._read_rows(desc, fields, "WKB", **kwargs))
+
+    #endregion
@@ -12,13 +12,26 @@ install_aliases()
 # pylint: enable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position
 
 # Standard library imports
+import logging
+import os
+import time
+
 from abc import ABCMeta as _ABCMeta, abstractmethod
+from functools import partial
 
 # Third-party imports
 import arcpy
 
 from pathlib2 import Path
 
+# Local imports
+from .._multiprocessing import imap_unordered
+from ..exceptions import ArcPyExtError
+from ._helpers import get_appended_rows_where_clause, get_dataset_manifest, get_textual_fields
+from ._manifest import read_manifest, remove_manifest, write_manifest
+from ._metadata import MetadataCache
+from ._transform import get_text_field, get_transform_options, map_values, select_fields, simplify_geometries
+
 
 class ConvertBase(with_metaclass(_ABCMeta, object)):
     def feature_class(self, input_fc, output_fc, **kwargs):
@@ -29,7 +42,7 @@ class ConvertBase(with_metaclass(_ABCMeta, object)):
             raise ValueError("output_fc already exists.")
 
         # get input feature class description for copy process
-        input_fc_desc = arcpy.Describe(input_fc)
+        input_fc_desc = MetadataCache().describe(input_fc)
 
         if not input_fc_desc.dataType == "FeatureClass":
             raise ValueError("input_fc is not of type 'FeatureClass'.")
@@ -49,7 +62,7 @@ class ConvertBase(with_metaclass(_ABCMeta, object)):
             raise ValueError("output_table already exists.")
 
         # get input feature class description for copy process
-        input_table_desc = arcpy.Describe(input_table)
+        input_table_desc = MetadataCache().describe(input_table)
 
         if not input_table_desc.dataType == "Table":
             raise ValueError("input_table is not of type 'Table'.")
@@ -65,11 +78,11 @@ class ConvertBase(with_metaclass(_ABCMeta, object)):
         if not arcpy.Exists(input_rel):
             raise ValueError("input_rel does not exist.")
 
-        if arcpy.Exists(input_rel):
+        if arcpy.Exists(output_rel):
             raise ValueError("output_rel already exists.")
 
         # get input feature class description for copy process
-        rel_class_desc = arcpy.Describe(input_rel)
+        rel_class_desc = MetadataCache().describe(input_rel)
 
         if not rel_class_desc.dataType == "RelationshipClass":
             raise ValueError("input_rel is not of type 'RelationshipClass'.")
@@ -81,13 +94,26 @@ class ConvertBase(with_metaclass(_ABCMeta, object)):
         del rel_class_desc
         arcpy.management.ClearWorkspaceCache()
 
-    def workspace(self, input_workspace, output_path, **kwargs):
+    def workspace(self, input_workspace, output_path, max_workers=None, **kwargs):
+        """Converts every feature class, table and relationship class in a workspace.
+
+        By default each dataset is converted in turn.  If max_workers is given, datasets are instead spread across a
+        pool of that many worker processes, each with its own arcpy session, and a list of the results for each dataset
+        is returned.  When called from a script, a parallel conversion must be guarded by
+        ``if __name__ == "__main__":`` so worker processes can be started on Windows.
+
+        If incremental is passed as True (for converters that support it), a manifest of the state of each feature class
+        and table is recorded alongside its output.  On later conversions, datasets that haven't changed are skipped,
+        and datasets that have only had rows added have just those rows appended where the output format allows it
+        (otherwise they're converted again).  Datasets shouldn't be edited while they are being converted.
+        """
         if not arcpy.Exists(input_workspace):
             raise ValueError("input_workspace does not exist.")
 
-        workspace_desc = arcpy.Describe(input_workspace)
+        # the workspace is described once, and every dataset is converted from the snapshot of its description
+        workspace_metadata = MetadataCache().describe_workspace(input_workspace)
 
-        if not workspace_desc.dataType == "Workspace":
+        if not workspace_metadata.dataType == "Workspace":
             raise ValueError("input_workspace is not of type 'Workspace'.")
 
         # get output_path as a Path object
@@ -95,19 +121,137 @@ class ConvertBase(with_metaclass(_ABCMeta, object)):
 
         self._create_output_workspace(output_path, **kwargs)
 
-        for child in workspace_desc.children:
-            if child.dataType == 'FeatureClass':
-                self._feature_class(child, self._feature_class_default_name(child, output_path, **kwargs), **kwargs)
-            elif child.dataType == 'Table':
-                self._table(child, self._table_default_name(child, output_path, **kwargs), **kwargs)
-            elif child.dataType == 'RelationshipClass':
-                self._relationship_class(
-                    child, self._relationship_class_default_name(child, output_path, **kwargs), **kwargs
-                )
+        # all output names are decided up front, so datasets converted at the same time never write to the same output
+        children = self._get_workspace_outputs(workspace_metadata.children, output_path, **kwargs)
+
+        del workspace_metadata
+
+        results = None
+        if max_workers:
+            # snapshots hold no connection to the workspace, so are sent to worker processes as they are
+            results = self._workspace_parallel(children, max_workers, **kwargs)
+        else:
+            for child, output in children:
+                self._workspace_child(child, output, **kwargs)
 
-        del workspace_desc
+        del children
         arcpy.management.ClearWorkspaceCache()
 
+        return results
+
+    def _get_workspace_outputs(self, children, output_path, **kwargs):
+        """Gets (child, output path) tuples for the children of a workspace that can be converted, renaming any
+        output that would collide with another (e.g. a feature class and a table both converted to Shapefiles)."""
+        outputs = []
+        used_outputs = set()
+
+        for child in children:
+            if child.dataType == "FeatureClass":
+                output = self._feature_class_default_name(child, output_path, **kwargs)
+            elif child.dataType == "Table":
+                output = self._table_default_name(child, output_path, **kwargs)
+            elif child.dataType == "RelationshipClass":
+                output = self._relationship_class_default_name(child, output_path, **kwargs)
+            else:
+                continue
+
+            # file names are compared case-insensitively, as they are on Windows
+            i = 0
+            unique_output = output
+            while os.path.normcase(str(unique_output)).lower() in used_outputs:
+                i += 1
+                unique_output = output.with_name("{}_{}{}".format(output.stem, i, output.suffix))
+
+            if unique_output != output:
+                _get_logger().warning(
+                    "Output '%s' already used, converting '%s' to '%s'.", output, child.name, unique_output
+                )
+
+            used_outputs.add(os.path.normcase(str(unique_output)).lower())
+            outputs.append((child, unique_output))
+
+        return outputs
+
+    def _workspace_child(self, desc, output, **kwargs):
+        """Converts a child of a workspace, returning how it was converted ("converted", "appended" or "skipped")."""
+        if kwargs.pop("incremental", False) and desc.dataType in ("FeatureClass", "Table"):
+            return self._workspace_child_incremental(desc, output, **kwargs)
+
+        if desc.dataType == "FeatureClass":
+            self._feature_class(desc, output, **kwargs)
+        elif desc.dataType == "Table":
+            self._table(desc, output, **kwargs)
+        elif desc.dataType == "RelationshipClass":
+            self._relationship_class(desc, output, **kwargs)
+
+        return "converted"
+
+    def _workspace_child_incremental(self, desc, output, **kwargs):
+        """Converts a feature class or table only if it has changed since its output's manifest was recorded, appending
+        just the new rows if it has only been appended to and the output format allows it."""
+        logger = _get_logger()
+
+        previous_manifest = read_manifest(output)
+        manifest = get_dataset_manifest(desc)
+        manifest["transform"] = get_transform_options(kwargs)
+
+        if previous_manifest == manifest and self._output_exists(output, **kwargs):
+            logger.info("Skipping '%s', unchanged since it was last converted.", desc.name)
+            return "skipped"
+
+        where_clause = None
+        if previous_manifest is not None and self._output_exists(output, **kwargs):
+            where_clause = get_appended_rows_where_clause(desc, previous_manifest, manifest)
+
+        # remove the manifest before changing the output, so a failed conversion is never taken as complete
+        remove_manifest(output)
+
+        if where_clause is not None and self._append_rows(desc, output, where_clause, **kwargs):
+            logger.info("Appended new rows of '%s'.", desc.name)
+            action = "appended"
+        else:
+            self._delete_output(output, **kwargs)
+            self._workspace_child(desc, output, **kwargs)
+            action = "converted"
+
+        write_manifest(output, manifest)
+        return action
+
+    def _workspace_parallel(self, children, max_workers, **kwargs):
+        logger = _get_logger()
+
+        results = []
+        failures = []
+        convert = partial(_convert_workspace_child, self, kwargs=kwargs)
+
+        for (desc, output), result, error in imap_unordered(convert, children, max_workers):
+            name = desc.name
+            action, seconds = result if result else (None, None)
+            results.append({
+                "name": name,
+                "dataType": desc.dataType,
+                "catalogPath": desc.catalogPath,
+                "outputPath": output,
+                "action": action,
+                "seconds": seconds,
+                "error": error
+            })
+
+            if error:
+                failures.append(results[-1])
+                logger.error("Failed to convert '%s' (%d of %d):\n%s", name, len(results), len(children), error[1])
+            else:
+                logger.info("Finished '%s' (%s, %d of %d) in %.1fs.", name, action, len(results), len(children), seconds)
+
+        if failures:
+            raise ArcPyExtError(
+                "Failed to convert {} of {} datasets: {}".format(
+                    len(failures), len(children), ", ".join(f["name"] for f in failures)
+                ), failures[0]["error"][0]
+            )
+
+        return results
+
     @abstractmethod
     def _create_output_workspace(self, output_path, **kwargs):
         return
@@ -154,3 +298,83 @@ class ConvertBase(with_metaclass(_ABCMeta, object)):
         Creates a Path object representing the full path of an output feature class in whatever the destination format is.
         """
         return output_workspace.joinpath(desc.name + ".txt")
+
+    def _append_rows(self, desc, output, where_clause, **kwargs):
+        """
+        Appends the rows of a feature class or table selected by a where clause to its existing output, returning False
+        if the output format doesn't support appending.
+        """
+        return False
+
+    def _delete_output(self, output, **kwargs):
+        """
+        Deletes an existing output, before it is converted again.
+        """
+        if arcpy.Exists(str(output)):
+            arcpy.management.Delete(str(output))
+        elif output.exists():
+            output.unlink()
+
+    def _output_exists(self, output, **kwargs):
+        return arcpy.Exists(str(output)) or output.exists()
+
+    def _get_fields(self, desc, include_geometry=False, **kwargs):
+        """
+        Gets the fields of a feature class or table that are read by _read_rows, limited to the names in the field_names
+        option (if given).  Fields with values replaced by domain descriptions are typed as strings.
+        """
+        fields = select_fields(get_textual_fields(desc, include_geometry), kwargs.get("field_names"))
+
+        if kwargs.get("use_domain_descriptions"):
+            fields = [get_text_field(f) if f.name in desc.codedValues else f for f in fields]
+
+        return fields
+
+    def _read_rows(self, desc, fields, geometry_format="WKB", **kwargs):
+        """
+        Reads the values of fields (as returned by _get_fields) from a feature class or table, streaming each row
+        through the row-transform pipeline as it's read:
+
+        - where_clause: only rows matching the clause are read (it's passed to the cursor, to be evaluated by the data
+          source)
+        - use_domain_descriptions: values of fields with coded value domains are replaced by their descriptions
+        - simplify_tolerance: geometries are simplified, deviating from the original by no more than the tolerance (in
+          the units of the dataset's spatial reference)
+
+        Geometry is read in geometry_format ("WKB" or "WKT").
+        """
+        simplify_tolerance = kwargs.get("simplify_tolerance")
+
+        cursor_fields = [f.name for f in fields]
+        geometry_index = next((i for i, f in enumerate(fields) if f.type == "Geometry"), None)
+        if geometry_index is not None:
+            # geometry objects are only needed to simplify, otherwise geometry is read in its output format
+            cursor_fields[geometry_index] = "SHAPE@" if simplify_tolerance else "SHAPE@" + geometry_format
+
+        with arcpy.da.SearchCursor(desc.catalogPath, cursor_fields, kwargs.get("where_clause")) as cursor:
+            rows = cursor
+
+            if simplify_tolerance and geometry_index is not None:
+                rows = simplify_geometries(rows, geometry_index, simplify_tolerance, geometry_format)
+
+            if kwargs.get("use_domain_descriptions"):
+                rows = map_values(rows, [desc.codedValues.get(f.name) for f in fields])
+
+            for row in rows:
+                yield row
+
+
+def _convert_workspace_child(converter, child, kwargs):
+    """Converts one child of a workspace on a worker process, returning how it was converted and the number of seconds
+    it took."""
+    desc, output = child
+
+    start = time.time()
+    action = converter._workspace_child(desc, output, **kwargs)
+    arcpy.management.ClearWorkspaceCache()
+
+    return action, time.time() - start
+
+
+def _get_logger():
+    return logging.getLogger("arcpyext.conversion")
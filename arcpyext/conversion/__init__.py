@@ -1,13 +1,21 @@
-from .ToCsv import ToCsv as _ToCsv
-from .ToGeoPackage import ToGeoPackage as _ToGeoPackage
-from .ToKml import ToKml as _ToKml
-from .ToMapInfoTab import ToMapInfoTab as _ToMapInfoTab
-from .ToOfficeOpenXmlWorkbook import ToOfficeOpenXmlWorkbook as _ToOfficeOpenXmlWorkbook
-from .ToShapefile import ToShapefile as _ToShapefile
+from .._arcpy_import import import_arcpy as _import_arcpy
 
-to_csv = _ToCsv()
-to_geopackage = _ToGeoPackage()
-to_kml = _ToKml()
-to_mapinfo_tab = _ToMapInfoTab()
-to_shapefile = _ToShapefile()
-to_ooxml_workbook = _ToOfficeOpenXmlWorkbook()
\ No newline at end of file
+# None if arcpy isn't installed, then only the arcpy-independent writers (e.g. _csv) can be used
+_arcpy = _import_arcpy()
+
+if _arcpy is not None:
+    from .ToCsv import ToCsv as _ToCsv
+    from .ToGeoPackage import ToGeoPackage as _ToGeoPackage
+    from .ToKml import ToKml as _ToKml
+    from .ToMapInfoTab import ToMapInfoTab as _ToMapInfoTab
+    from .ToOfficeOpenXmlWorkbook import ToOfficeOpenXmlWorkbook as _ToOfficeOpenXmlWorkbook
+    from .ToParquet import ToParquet as _ToParquet
+    from .ToShapefile import ToShapefile as _ToShapefile
+
+    to_csv = _ToCsv()
+    to_geopackage = _ToGeoPackage()
+    to_kml = _ToKml()
+    to_mapinfo_tab = _ToMapInfoTab()
+    to_parquet = _ToParquet()
+    to_shapefile = _ToShapefile()
+    to_ooxml_workbook = _ToOfficeOpenXmlWorkbook()
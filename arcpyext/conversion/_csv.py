@@ -0,0 +1,283 @@
+# coding=utf-8
+"""This module contains a writer for CSV files that writes rows in batches, optionally compressing the output and
+splitting it in to parts."""
+
+# Python 2/3 compatibility
+# pylint: disable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+from future.builtins.disabled import *
+from future.builtins import *
+from future.standard_library import install_aliases
+install_aliases()
+# pylint: enable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position
+
+# Standard library imports
+import csv
+import io
+import os
+import re
+import sys
+import zlib
+
+from itertools import islice
+
+# Third-party imports
+from pathlib2 import Path
+
+# number of rows fetched from a cursor and written at a time
+CSV_CHUNK_SIZE = 10000
+
+# size of the buffer in front of output CSV files
+CSV_WRITE_BUFFER_SIZE = 1024 * 1024
+
+# file extensions added for each supported compression
+COMPRESSION_EXTENSIONS = {"gzip": ".gz", "xz": ".xz", "zstd": ".zst"}
+
+
+def _encode_text(value):
+    return str(value).encode("utf-8")
+
+
+# Python 3's csv module writes each type of value the way CSV output has always been written (e.g. None as an empty
+# field, dates as "YYYY-MM-DD HH:MM:SS"), so values only need converting on Python 2, where they're written as encoded
+# text (object IDs are never null, and are written the same by the csv module, so don't need converting)
+if sys.version_info[0] < 3:
+    _DEFAULT_CONVERTER = _encode_text
+    _CONVERTERS = {"OID": None}
+else:
+    _DEFAULT_CONVERTER = None
+    _CONVERTERS = {}
+
+
+class CsvFileWriter(object):
+    """Writes a header and rows to a CSV file, optionally compressed with gzip, xz or zstd (which requires the
+    zstandard package).
+
+    If a maximum number of rows or bytes per file is given, the output is split in to parts, each with the header row.
+    Parts are named by inserting the part number before the file's extensions (e.g. roads.csv.gz is written as
+    roads.part0001.csv.gz, roads.part0002.csv.gz, ...).  The byte limit applies to the CSV data before compression, and
+    rows are never split across parts (a row larger than the limit is written to a part on its own).
+
+    Rows can be appended to an existing (unsplit) file, in which case the header isn't written again.  Compressed files
+    are appended to by adding a new compressed stream, which gzip, xz and zstd readers all read as part of the file.
+    """
+
+    _append = False
+    _compression = None
+    _file_path = None
+    _file_paths = None
+    _header_data = None
+    _max_bytes_per_file = None
+    _max_rows_per_file = None
+
+    # state of the part being written
+    _compressor = None
+    _file = None
+    _part_bytes = 0
+    _part_rows = 0
+
+    def __init__(
+        self, file_path, headers, compression=None, max_rows_per_file=None, max_bytes_per_file=None, append=False
+    ):
+        if compression is not None and compression not in COMPRESSION_EXTENSIONS:
+            raise ValueError("compression must be one of: {}".format(", ".join(sorted(COMPRESSION_EXTENSIONS))))
+
+        if append and (max_rows_per_file or max_bytes_per_file):
+            raise ValueError("Rows can't be appended to CSV output that is split in to parts.")
+
+        # fail before any file is created if the compression isn't available
+        _create_compressor(compression)
+
+        self._append = append
+        self._compression = compression
+        self._file_path = Path(str(file_path))
+        self._file_paths = []
+        self._max_bytes_per_file = max_bytes_per_file
+        self._max_rows_per_file = max_rows_per_file
+
+        # output is written in chunks encoded by the csv module in memory, so the size of each is known before writing
+        self._buffer = io.BytesIO() if sys.version_info[0] < 3 else io.StringIO()
+        self._csv_writer = csv.writer(self._buffer, dialect="excel")
+
+        if sys.version_info[0] < 3:
+            headers = [_encode_text(h) for h in headers]
+        self._header_data = self._encode_rows([headers])
+
+        self._open_part()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def file_paths(self):
+        """The paths of the files written to, in order."""
+        return list(self._file_paths)
+
+    def close(self):
+        if self._file is None:
+            return
+
+        try:
+            if self._compressor is not None:
+                self._file.write(self._compressor.flush())
+        finally:
+            self._file.close()
+            self._file = None
+            self._compressor = None
+
+    def write_rows(self, rows, converters=None, chunk_size=CSV_CHUNK_SIZE):
+        """Writes rows (e.g. from an arcpy.da.SearchCursor) in chunks, returning the number of rows written.
+
+        :param rows: An iterable of rows.
+        :param converters: An optional list of functions (or None) to convert the values of each column with, as
+                           returned by get_value_converters.
+        :param chunk_size: The number of rows to fetch and write at a time.
+        """
+        convert_row = _get_row_converter(converters)
+        max_bytes = self._max_bytes_per_file
+        max_rows = self._max_rows_per_file
+        rows = iter(rows)
+        row_count = 0
+
+        while True:
+            # don't fetch more rows than will fit in the current part (or the next, if the current part is full)
+            fetch_size = chunk_size
+            if max_rows:
+                fetch_size = min(chunk_size, (max_rows - self._part_rows) or max_rows)
+
+            chunk = list(islice(rows, fetch_size))
+            if not chunk:
+                return row_count
+
+            if (max_rows and self._part_rows >= max_rows) or (max_bytes and self._part_bytes >= max_bytes):
+                self._next_part()
+
+            if convert_row is not None:
+                chunk = [convert_row(row) for row in chunk]
+
+            data = self._encode_rows(chunk)
+
+            if max_bytes and self._part_bytes + len(data) > max_bytes:
+                # chunk would overfill the part, write it a row at a time, starting new parts as they fill
+                for row in chunk:
+                    row_data = self._encode_rows([row])
+                    if self._part_rows and self._part_bytes + len(row_data) > max_bytes:
+                        self._next_part()
+                    self._write(row_data, 1)
+            else:
+                self._write(data, len(chunk))
+
+            row_count += len(chunk)
+
+    def _encode_rows(self, rows):
+        self._csv_writer.writerows(rows)
+        data = self._buffer.getvalue()
+
+        self._buffer.seek(0)
+        self._buffer.truncate()
+
+        return data if sys.version_info[0] < 3 else data.encode("utf-8")
+
+    def _next_part(self):
+        self.close()
+        self._open_part()
+
+    def _open_part(self):
+        split = self._max_rows_per_file or self._max_bytes_per_file
+        file_path = _get_part_path(self._file_path, len(self._file_paths) + 1) if split else self._file_path
+
+        self._file = io.open(str(file_path), "ab" if self._append else "wb", buffering=CSV_WRITE_BUFFER_SIZE)
+        self._compressor = _create_compressor(self._compression)
+        self._file_paths.append(file_path)
+        self._part_bytes = 0
+        self._part_rows = 0
+
+        if not self._append:
+            self._write(self._header_data, 0)
+
+    def _write(self, data, row_count):
+        self._file.write(data if self._compressor is None else self._compressor.compress(data))
+        self._part_bytes += len(data)
+        self._part_rows += row_count
+
+
+def get_csv_file_paths(file_path):
+    """Gets the paths of the existing files written for a CSV file path, either the file itself or its parts."""
+    file_path = Path(str(file_path))
+
+    # glob characters in the file name (e.g. "roads [2020].csv") are escaped, so only the part number is a wildcard
+    part_pattern = _get_part_path(file_path.with_name(_escape_glob(file_path.name)), "*").name
+
+    return ([file_path] if file_path.exists() else []) + sorted(file_path.parent.glob(part_pattern))
+
+
+def get_compression_extension(compression):
+    """Gets the file extension added for a compression (e.g. ".gz" for gzip), or an empty string for None."""
+    return COMPRESSION_EXTENSIONS[compression] if compression else ""
+
+
+def get_value_converters(field_types):
+    """Gets a function to convert values of each of the given field types (e.g. "Date", "Double") for writing, or None
+    where values can be written as they are."""
+    return [_CONVERTERS.get(field_type, _DEFAULT_CONVERTER) for field_type in field_types]
+
+
+def _create_compressor(compression):
+    if compression is None:
+        return None
+
+    if compression == "gzip":
+        # a window size over 16 writes a gzip header and trailer
+        return zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    if compression == "xz":
+        try:
+            import lzma
+        except ImportError:
+            raise ValueError("xz compression requires the lzma module (Python 3.3 or later).")
+        return lzma.LZMACompressor(format=lzma.FORMAT_XZ)
+
+    try:
+        import zstandard
+    except ImportError:
+        raise ValueError("zstd compression requires the zstandard package.")
+    return zstandard.ZstdCompressor().compressobj()
+
+
+def _escape_glob(name):
+    # as glob.escape does, which isn't available on Python 2
+    return re.sub(r"([*?[])", r"[\1]", name)
+
+
+def _get_part_path(file_path, part_number):
+    name = file_path.name
+
+    # insert the part number before ".csv" and any compression extension, or failing that, before the last extension
+    extension_index = name.lower().rfind(".csv")
+    if extension_index <= 0:
+        extension_index = len(os.path.splitext(name)[0])
+
+    part_number = part_number if part_number == "*" else "{:04d}".format(part_number)
+    return file_path.with_name("{}.part{}{}".format(name[:extension_index], part_number, name[extension_index:]))
+
+
+def _get_row_converter(converters):
+    if not converters or all(c is None for c in converters):
+        # rows can be written as they are
+        return None
+
+    if all(c is not None for c in converters):
+        return lambda row: [c(v) for c, v in zip(converters, row)]
+
+    converted_columns = [(i, c) for i, c in enumerate(converters) if c is not None]
+
+    def convert_row(row):
+        row = list(row)
+        for i, c in converted_columns:
+            row[i] = c(row[i])
+        return row
+
+    return convert_row
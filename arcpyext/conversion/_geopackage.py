@@ -0,0 +1,559 @@
+# coding=utf-8
+"""This module contains a writer for OGC GeoPackage files, which writes rows directly to the package's SQLite database
+(with bulk inserts, and a spatial index built as features are written), rather than with geoprocessing tools."""
+
+# Python 2/3 compatibility
+# pylint: disable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+from future.builtins.disabled import *
+from future.builtins import *
+from future.standard_library import install_aliases
+install_aliases()
+# pylint: enable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position
+
+# Standard library imports
+import logging
+import os
+import sqlite3
+import struct
+
+from itertools import islice
+
+# number of rows inserted at a time (all rows of a table are inserted in a single transaction)
+GEOPACKAGE_CHUNK_SIZE = 10000
+
+# SQLite application ID and user version of each GeoPackage version (None creates a version 1.2 GeoPackage)
+GEOPACKAGE_VERSIONS = {
+    None: (0x47504B47, 10200),
+    1.0: (0x47503130, 0),
+    1.1: (0x47503131, 0),
+    1.2: (0x47504B47, 10200),
+    1.3: (0x47504B47, 10300)
+}
+
+# GeoPackage column types for each arcpy field type, types not listed here are written as text
+_COLUMN_TYPES = {
+    "BigInteger": "INTEGER",
+    "Blob": "BLOB",
+    "Date": "DATETIME",
+    "DateOnly": "DATE",
+    "Double": "DOUBLE",
+    "Integer": "MEDIUMINT",
+    "Single": "FLOAT",
+    "SmallInteger": "SMALLINT"
+}
+
+# first ID given to spatial reference systems that don't have an EPSG or ESRI code (well above the codes either uses,
+# but within the 32-bit IDs of geometry blobs)
+_CUSTOM_SRS_ID_START = 1000000000
+
+# spatial reference systems every GeoPackage must have
+_DEFAULT_SPATIAL_REF_SYS = [
+    ("Undefined cartesian SRS", -1, "NONE", -1, "undefined", "undefined cartesian coordinate reference system"),
+    ("Undefined geographic SRS", 0, "NONE", 0, "undefined", "undefined geographic coordinate reference system"),
+    (
+        "WGS 84 geodetic", 4326, "EPSG", 4326, 'GEOGCS["WGS 84",DATUM["WGS_1984",SPHEROID["WGS 84",6378137,'
+        '298.257223563,AUTHORITY["EPSG","7030"]],AUTHORITY["EPSG","6326"]],PRIMEM["Greenwich",0,AUTHORITY["EPSG",'
+        '"8901"]],UNIT["degree",0.0174532925199433,AUTHORITY["EPSG","9122"]],AUTHORITY["EPSG","4326"]]',
+        "longitude/latitude coordinates in decimal degrees on the WGS 84 spheroid"
+    )
+]
+
+_CREATE_CORE_TABLES = """
+CREATE TABLE IF NOT EXISTS gpkg_spatial_ref_sys (
+    srs_name TEXT NOT NULL,
+    srs_id INTEGER NOT NULL PRIMARY KEY,
+    organization TEXT NOT NULL,
+    organization_coordsys_id INTEGER NOT NULL,
+    definition TEXT NOT NULL,
+    description TEXT
+);
+CREATE TABLE IF NOT EXISTS gpkg_contents (
+    table_name TEXT NOT NULL PRIMARY KEY,
+    data_type TEXT NOT NULL,
+    identifier TEXT UNIQUE,
+    description TEXT DEFAULT '',
+    last_change DATETIME NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ','now')),
+    min_x DOUBLE,
+    min_y DOUBLE,
+    max_x DOUBLE,
+    max_y DOUBLE,
+    srs_id INTEGER,
+    CONSTRAINT fk_gc_r_srs_id FOREIGN KEY (srs_id) REFERENCES gpkg_spatial_ref_sys(srs_id)
+);
+CREATE TABLE IF NOT EXISTS gpkg_geometry_columns (
+    table_name TEXT NOT NULL,
+    column_name TEXT NOT NULL,
+    geometry_type_name TEXT NOT NULL,
+    srs_id INTEGER NOT NULL,
+    z TINYINT NOT NULL,
+    m TINYINT NOT NULL,
+    CONSTRAINT pk_geom_cols PRIMARY KEY (table_name, column_name),
+    CONSTRAINT uk_gc_table_name UNIQUE (table_name),
+    CONSTRAINT fk_gc_tn FOREIGN KEY (table_name) REFERENCES gpkg_contents(table_name),
+    CONSTRAINT fk_gc_srs FOREIGN KEY (srs_id) REFERENCES gpkg_spatial_ref_sys (srs_id)
+);
+CREATE TABLE IF NOT EXISTS gpkg_extensions (
+    table_name TEXT,
+    column_name TEXT,
+    extension_name TEXT NOT NULL,
+    definition TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    CONSTRAINT ge_tce UNIQUE (table_name, column_name, extension_name)
+);
+"""
+
+# triggers that keep a spatial index up to date as features are edited (by applications that provide the ST_
+# functions), from the GeoPackage R-tree spatial index extension
+_CREATE_RTREE_TRIGGERS = """
+CREATE TRIGGER "{r}_insert" AFTER INSERT ON "{t}"
+WHEN (new."{c}" NOT NULL AND NOT ST_IsEmpty(NEW."{c}"))
+BEGIN
+  INSERT OR REPLACE INTO "{r}" VALUES (
+    NEW."{i}", ST_MinX(NEW."{c}"), ST_MaxX(NEW."{c}"), ST_MinY(NEW."{c}"), ST_MaxY(NEW."{c}")
+  );
+END;
+CREATE TRIGGER "{r}_update1" AFTER UPDATE OF "{c}" ON "{t}"
+WHEN OLD."{i}" = NEW."{i}" AND (NEW."{c}" NOTNULL AND NOT ST_IsEmpty(NEW."{c}"))
+BEGIN
+  INSERT OR REPLACE INTO "{r}" VALUES (
+    NEW."{i}", ST_MinX(NEW."{c}"), ST_MaxX(NEW."{c}"), ST_MinY(NEW."{c}"), ST_MaxY(NEW."{c}")
+  );
+END;
+CREATE TRIGGER "{r}_update2" AFTER UPDATE OF "{c}" ON "{t}"
+WHEN OLD."{i}" = NEW."{i}" AND (NEW."{c}" ISNULL OR ST_IsEmpty(NEW."{c}"))
+BEGIN
+  DELETE FROM "{r}" WHERE id = OLD."{i}";
+END;
+CREATE TRIGGER "{r}_update3" AFTER UPDATE ON "{t}"
+WHEN OLD."{i}" != NEW."{i}" AND (NEW."{c}" NOTNULL AND NOT ST_IsEmpty(NEW."{c}"))
+BEGIN
+  DELETE FROM "{r}" WHERE id = OLD."{i}";
+  INSERT OR REPLACE INTO "{r}" VALUES (
+    NEW."{i}", ST_MinX(NEW."{c}"), ST_MaxX(NEW."{c}"), ST_MinY(NEW."{c}"), ST_MaxY(NEW."{c}")
+  );
+END;
+CREATE TRIGGER "{r}_update4" AFTER UPDATE ON "{t}"
+WHEN OLD."{i}" != NEW."{i}" AND (NEW."{c}" ISNULL OR ST_IsEmpty(NEW."{c}"))
+BEGIN
+  DELETE FROM "{r}" WHERE id IN (OLD."{i}", NEW."{i}");
+END;
+CREATE TRIGGER "{r}_delete" AFTER DELETE ON "{t}"
+WHEN old."{c}" NOT NULL
+BEGIN
+  DELETE FROM "{r}" WHERE id = OLD."{i}";
+END;
+"""
+
+_RTREE_EXTENSION_DEFINITION = "http://www.geopackage.org/spec120/#extension_rtree"
+
+# WKB geometry type codes
+_WKB_POINT = 1
+_WKB_LINESTRING = 2
+_WKB_POLYGON = 3
+
+
+class GeoPackageWriter(object):
+    """Writes tables of rows to a GeoPackage, creating the GeoPackage if it doesn't exist.
+
+    Each table is written in a single transaction, with rows inserted in chunks.  Geometry is given as well-known binary
+    (WKB), and is stored as GeoPackage geometry blobs, with a spatial index (R-tree) of the features' envelopes.  While
+    writing, the database is in write-ahead log mode, and is returned to a single file when the writer is closed.
+    """
+
+    _connection = None
+
+    def __init__(self, file_path, version=None):
+        """Opens a GeoPackage for writing.
+
+        :param file_path: The path of the GeoPackage.
+        :param version: The GeoPackage version (1.0, 1.1, 1.2 or 1.3) of a created GeoPackage, None for 1.2.
+        """
+        if version not in GEOPACKAGE_VERSIONS:
+            versions = sorted(v for v in GEOPACKAGE_VERSIONS if v is not None)
+            raise ValueError("version must be None or one of: {}".format(", ".join(str(v) for v in versions)))
+
+        file_path = str(file_path)
+        created = not os.path.exists(file_path)
+
+        # transactions are started and committed explicitly
+        self._connection = sqlite3.connect(file_path, isolation_level=None)
+
+        try:
+            if created:
+                application_id, user_version = GEOPACKAGE_VERSIONS[version]
+                self._connection.execute("PRAGMA application_id = {}".format(application_id))
+                self._connection.execute("PRAGMA user_version = {}".format(user_version))
+
+            self._connection.execute("PRAGMA journal_mode = WAL")
+            self._connection.execute("PRAGMA synchronous = NORMAL")
+            self._connection.execute("PRAGMA cache_size = -65536")
+            self._connection.execute("PRAGMA temp_store = MEMORY")
+
+            self._connection.executescript(_CREATE_CORE_TABLES)
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO gpkg_spatial_ref_sys VALUES (?, ?, ?, ?, ?, ?)", _DEFAULT_SPATIAL_REF_SYS
+            )
+        except:
+            self._connection.close()
+            self._connection = None
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def add_spatial_reference(self, name, factory_code, definition):
+        """Adds a spatial reference system, if the GeoPackage doesn't already have it, returning its ID.
+
+        :param name: The name of the spatial reference.
+        :param factory_code: The EPSG or ESRI code (WKID) of the spatial reference, or 0 for a custom spatial reference.
+        :param definition: The well-known text of the spatial reference.
+        """
+        if factory_code:
+            # codes above the range used by EPSG are Esri's own
+            organization = "EPSG" if factory_code < 32768 else "ESRI"
+            existing = self._connection.execute(
+                "SELECT srs_id FROM gpkg_spatial_ref_sys WHERE organization = ? AND organization_coordsys_id = ?",
+                (organization, factory_code)
+            ).fetchone()
+
+            # the code is used as the ID, unless that's taken (e.g. by a custom spatial reference in a GeoPackage
+            # written by something else)
+            srs_id = factory_code if self._is_srs_id_free(factory_code) else self._get_free_srs_id()
+        elif not definition or definition.startswith("{"):
+            # unknown coordinate system (the definition of which is a class ID, not well-known text)
+            return -1
+        else:
+            organization = "NONE"
+            existing = self._connection.execute(
+                "SELECT srs_id FROM gpkg_spatial_ref_sys WHERE definition = ?", (definition, )
+            ).fetchone()
+            srs_id = self._get_free_srs_id()
+
+        if existing:
+            return existing[0]
+
+        self._connection.execute(
+            "INSERT INTO gpkg_spatial_ref_sys VALUES (?, ?, ?, ?, ?, NULL)",
+            (name, srs_id, organization, factory_code or srs_id, definition)
+        )
+        return srs_id
+
+    def close(self):
+        if self._connection is None:
+            return
+
+        try:
+            # return to a single database file, GeoPackages are meant to be shared as one file
+            self._connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._connection.execute("PRAGMA journal_mode = DELETE")
+        except sqlite3.OperationalError:
+            # another connection has the database open (e.g. arcpy, after checking the output exists)
+            _get_logger().warning("GeoPackage is in use, leaving it in write-ahead log mode.")
+        finally:
+            self._connection.close()
+            self._connection = None
+
+    def write_table(
+        self,
+        table_name,
+        fields,
+        rows,
+        geometry_type="GEOMETRY",
+        srs_id=-1,
+        z=0,
+        m=0,
+        chunk_size=GEOPACKAGE_CHUNK_SIZE
+    ):
+        """Creates a table and writes rows (e.g. from an arcpy.da.SearchCursor) to it, returning the number of rows
+        written.
+
+        A table with a Geometry field is written as features, other tables as attributes.  The OID field is used as the
+        table's primary key, if there isn't one, a "fid" column is added, numbering the rows in order.
+
+        :param table_name: The name of the table.
+        :param fields: A list of (name, arcpy field type) tuples, one for each column of the rows.
+        :param rows: An iterable of rows, with geometry as WKB.
+        :param geometry_type: The GeoPackage geometry type name of the features (e.g. "POINT" or "MULTIPOLYGON").
+        :param srs_id: The ID of the spatial reference system of the features (see add_spatial_reference).
+        :param z: Whether the features have Z values, 0 if they're prohibited, 1 if mandatory or 2 if optional.
+        :param m: Whether the features have M values, 0 if they're prohibited, 1 if mandatory or 2 if optional.
+        :param chunk_size: The number of rows inserted at a time.
+        """
+        connection = self._connection
+
+        if connection.execute("SELECT 1 FROM sqlite_master WHERE lower(name) = lower(?)", (table_name, )).fetchone():
+            raise ValueError("Table '{}' already exists.".format(table_name))
+
+        field_types = [t for _, t in fields]
+        geometry_index = field_types.index("Geometry") if "Geometry" in field_types else None
+        oid_index = field_types.index("OID") if "OID" in field_types else None
+
+        id_column = fields[oid_index][0] if oid_index is not None else "fid"
+        columns = [] if oid_index is not None else ['"fid" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL']
+        for i, (name, field_type) in enumerate(fields):
+            if i == oid_index:
+                columns.append('"{}" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL'.format(_escape(name)))
+            elif i == geometry_index:
+                columns.append('"{}" {}'.format(_escape(name), geometry_type))
+            else:
+                columns.append('"{}" {}'.format(_escape(name), _COLUMN_TYPES.get(field_type, "TEXT")))
+
+        insert_columns = ([] if oid_index is not None else ["fid"]) + [name for name, _ in fields]
+        insert_sql = 'INSERT INTO "{}" ({}) VALUES ({})'.format(
+            _escape(table_name), ", ".join('"{}"'.format(_escape(c)) for c in insert_columns),
+            ", ".join("?" * len(insert_columns))
+        )
+
+        geometry_column = fields[geometry_index][0] if geometry_index is not None else None
+        rtree_table = "rtree_{}_{}".format(table_name, geometry_column) if geometry_column else None
+        convert_row = _get_row_converter(field_types, srs_id)
+        extent = [None, None, None, None]
+        row_count = 0
+
+        # positions of the ID and geometry in inserted rows, which start with the row number if there's no OID field
+        id_index = 0 if oid_index is None else oid_index
+        geometry_insert_index = None if geometry_index is None else geometry_index + (1 if oid_index is None else 0)
+
+        connection.execute("BEGIN")
+        try:
+            connection.execute('CREATE TABLE "{}" ({})'.format(_escape(table_name), ", ".join(columns)))
+
+            if rtree_table is not None:
+                rtree_table = self._create_rtree(rtree_table)
+
+            rows = iter(rows)
+            while True:
+                chunk = list(islice(rows, chunk_size))
+                if not chunk:
+                    break
+
+                chunk = [convert_row(row) for row in chunk]
+                if oid_index is None:
+                    chunk = [[row_count + i + 1] + row for i, row in enumerate(chunk)]
+
+                # converted geometries are (blob, envelope) pairs, blobs are inserted and envelopes are indexed
+                index_rows = []
+                if geometry_insert_index is not None:
+                    for row in chunk:
+                        geometry = row[geometry_insert_index]
+                        if geometry is None:
+                            continue
+
+                        row[geometry_insert_index], envelope = geometry
+                        if envelope is not None:
+                            _expand_extent(extent, envelope)
+                            index_rows.append((row[id_index], ) + envelope)
+
+                connection.executemany(insert_sql, chunk)
+
+                if rtree_table is not None and index_rows:
+                    connection.executemany(
+                        'INSERT INTO "{}" VALUES (?, ?, ?, ?, ?)'.format(_escape(rtree_table)), index_rows
+                    )
+
+                row_count += len(chunk)
+
+            if geometry_index is None:
+                connection.execute(
+                    "INSERT INTO gpkg_contents (table_name, data_type, identifier) VALUES (?, 'attributes', ?)",
+                    (table_name, table_name)
+                )
+            else:
+                connection.execute(
+                    "INSERT INTO gpkg_contents (table_name, data_type, identifier, min_x, min_y, max_x, max_y, srs_id) "
+                    "VALUES (?, 'features', ?, ?, ?, ?, ?, ?)",
+                    (table_name, table_name, extent[0], extent[2], extent[1], extent[3], srs_id)
+                )
+                connection.execute(
+                    "INSERT INTO gpkg_geometry_columns VALUES (?, ?, ?, ?, ?, ?)",
+                    (table_name, geometry_column, geometry_type, srs_id, z, m)
+                )
+
+                if rtree_table is not None:
+                    # triggers are created after the features are written, so they don't fire while bulk loading
+                    self._create_rtree_triggers(rtree_table, table_name, geometry_column, id_column)
+                    connection.execute(
+                        "INSERT INTO gpkg_extensions VALUES (?, ?, 'gpkg_rtree_index', ?, 'write-only')",
+                        (table_name, geometry_column, _RTREE_EXTENSION_DEFINITION)
+                    )
+
+            connection.execute("COMMIT")
+        except:
+            connection.execute("ROLLBACK")
+            raise
+
+        return row_count
+
+    def _create_rtree(self, rtree_table):
+        try:
+            self._connection.execute(
+                'CREATE VIRTUAL TABLE "{}" USING rtree(id, minx, maxx, miny, maxy)'.format(_escape(rtree_table))
+            )
+        except sqlite3.OperationalError:
+            # SQLite library wasn't built with the R-tree module
+            _get_logger().warning("SQLite doesn't support R-tree indexes, '%s' not created.", rtree_table)
+            return None
+
+        return rtree_table
+
+    def _create_rtree_triggers(self, rtree_table, table_name, geometry_column, id_column):
+        # executescript would commit the open transaction, so each trigger is created on its own
+        for statement in _CREATE_RTREE_TRIGGERS.strip().split("END;"):
+            if statement.strip():
+                self._connection.execute(
+                    statement.format(
+                        r=_escape(rtree_table), t=_escape(table_name), c=_escape(geometry_column), i=_escape(id_column)
+                    ) + "END;"
+                )
+
+    def _get_free_srs_id(self):
+        return max(
+            _CUSTOM_SRS_ID_START,
+            self._connection.execute("SELECT MAX(srs_id) + 1 FROM gpkg_spatial_ref_sys").fetchone()[0]
+        )
+
+    def _is_srs_id_free(self, srs_id):
+        return self._connection.execute(
+            "SELECT 1 FROM gpkg_spatial_ref_sys WHERE srs_id = ?", (srs_id, )
+        ).fetchone() is None
+
+
+def get_geometry_blob(wkb, srs_id):
+    """Gets a GeoPackage geometry blob for a WKB geometry, and the geometry's (min x, max x, min y, max y) envelope
+    (None if it's empty)."""
+    envelope = get_wkb_envelope(wkb)
+
+    # flags: little-endian, with an xy envelope (except for points, where it would just repeat the coordinates), or
+    # empty
+    point = _get_wkb_type(wkb)[0] == _WKB_POINT
+    if envelope is None:
+        header = struct.pack("<2sBBi", b"GP", 0, 0x11, srs_id)
+    elif point:
+        header = struct.pack("<2sBBi", b"GP", 0, 0x01, srs_id)
+    else:
+        header = struct.pack("<2sBBi4d", b"GP", 0, 0x03, srs_id, *envelope)
+
+    return sqlite3.Binary(header + bytes(wkb)), envelope
+
+
+def get_wkb_envelope(wkb):
+    """Gets the (min x, max x, min y, max y) envelope of a WKB geometry, or None if it's empty."""
+    envelope = [None, None, None, None]
+    _read_wkb_envelope(wkb, 0, envelope)
+    return None if envelope[0] is None else tuple(envelope)
+
+
+def _escape(identifier):
+    return identifier.replace('"', '""')
+
+
+def _expand_extent(extent, envelope):
+    min_x, max_x, min_y, max_y = envelope
+
+    if extent[0] is None:
+        extent[:] = envelope
+        return
+
+    extent[0] = min(extent[0], min_x)
+    extent[1] = max(extent[1], max_x)
+    extent[2] = min(extent[2], min_y)
+    extent[3] = max(extent[3], max_y)
+
+
+def _format_date(value):
+    return value.isoformat()
+
+
+def _format_datetime(value):
+    # GeoPackage date-times are ISO 8601 times, with milliseconds, and a Z if they're UTC times.  Cursors return naive
+    # date-times in whatever time zone the data was captured in, so only date-times that know their time zone are
+    # converted to UTC, the rest are written as they are, without a time zone
+    offset = value.utcoffset()
+    if offset is None:
+        suffix = ""
+    else:
+        value = (value - offset).replace(tzinfo=None)
+        suffix = "Z"
+
+    return "{}.{:03d}{}".format(value.strftime("%Y-%m-%dT%H:%M:%S"), value.microsecond // 1000, suffix)
+
+
+def _get_logger():
+    return logging.getLogger("arcpyext.conversion")
+
+
+def _get_row_converter(field_types, srs_id):
+    converters = []
+    for i, field_type in enumerate(field_types):
+        if field_type == "Geometry":
+            converters.append((i, lambda v: None if v is None else get_geometry_blob(v, srs_id)))
+        elif field_type == "Date":
+            converters.append((i, lambda v: None if v is None else _format_datetime(v)))
+        elif field_type == "DateOnly":
+            converters.append((i, lambda v: None if v is None else _format_date(v)))
+        elif field_type not in _COLUMN_TYPES and field_type not in ("OID", "String"):
+            # values of types written as text that may not already be text (e.g. times)
+            converters.append((i, lambda v: None if v is None else str(v)))
+
+    def convert_row(row):
+        row = list(row)
+        for i, convert in converters:
+            row[i] = convert(row[i])
+        return row
+
+    return convert_row
+
+
+def _get_wkb_type(wkb, offset=0):
+    byte_order = "<" if struct.unpack_from("B", wkb, offset)[0] == 1 else ">"
+    wkb_type = struct.unpack_from(byte_order + "I", wkb, offset + 1)[0]
+
+    # dimensions are either given by ISO type codes (e.g. 1001 for a point with Z), or by extended WKB flags
+    iso_dimensions = (wkb_type & 0xFFFF) // 1000
+    has_z = iso_dimensions in (1, 3) or bool(wkb_type & 0x80000000)
+    has_m = iso_dimensions in (2, 3) or bool(wkb_type & 0x40000000)
+    has_srid = bool(wkb_type & 0x20000000)
+
+    return (wkb_type & 0xFFFF) % 1000, byte_order, 2 + has_z + has_m, has_srid
+
+
+def _read_coordinates(wkb, offset, byte_order, dimensions, count, envelope):
+    if count:
+        coordinates = struct.unpack_from("{}{}d".format(byte_order, count * dimensions), wkb, offset)
+        xs = coordinates[0::dimensions]
+        ys = coordinates[1::dimensions]
+
+        # empty points are written with NaN coordinates
+        if not (count == 1 and xs[0] != xs[0]):
+            _expand_extent(envelope, (min(xs), max(xs), min(ys), max(ys)))
+
+    return offset + count * dimensions * 8
+
+
+def _read_wkb_envelope(wkb, offset, envelope):
+    geometry_type, byte_order, dimensions, has_srid = _get_wkb_type(wkb, offset)
+    offset += 9 if has_srid else 5
+
+    if geometry_type == _WKB_POINT:
+        return _read_coordinates(wkb, offset, byte_order, dimensions, 1, envelope)
+
+    count = struct.unpack_from(byte_order + "I", wkb, offset)[0]
+    offset += 4
+
+    if geometry_type == _WKB_LINESTRING:
+        return _read_coordinates(wkb, offset, byte_order, dimensions, count, envelope)
+
+    if geometry_type == _WKB_POLYGON:
+        for _ in range(count):
+            point_count = struct.unpack_from(byte_order + "I", wkb, offset)[0]
+            offset = _read_coordinates(wkb, offset + 4, byte_order, dimensions, point_count, envelope)
+        return offset
+
+    # multi-part geometries and geometry collections are a count followed by WKB geometries
+    for _ in range(count):
+        offset = _read_wkb_envelope(wkb, offset, envelope)
+    return offset
@@ -10,13 +10,113 @@ from future.standard_library import install_aliases
 install_aliases()
 # pylint: enable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position
 
+import re
+
 import arcpy
 
+from ._manifest import MANIFEST_TIMESTAMP_FORMAT, create_manifest, get_schema_hash
+
+# extensions of the workspaces that are databases, which sort rows for an ORDER BY clause, other datasources (e.g.
+# shapefiles and dBASE tables) ignore it
+_ORDERED_WORKSPACE_EXTENSIONS = (".gdb", ".geodatabase", ".gpkg", ".mdb", ".sde", ".sqlite")
+
 
 def get_textual_fields(dataset, include_geometry=False):
-    """Get fields of a dataset, filter out ones that can't be written to human-readable text."""
+    """Get fields of a dataset, filter out ones that can't be written to human-readable text.
+
+    The dataset is either a path, or a description (e.g. a DatasetMetadata snapshot) whose fields are used rather than
+    listing them again."""
     exclude_list = ["Blob", "Raster"]
     if not include_geometry:
         exclude_list.append("Geometry")
 
-    return [f for f in arcpy.ListFields(dataset) if f.type not in exclude_list]
\ No newline at end of file
+    fields = getattr(dataset, "fields", None)
+    if fields is None:
+        fields = arcpy.ListFields(dataset)
+
+    return [f for f in fields if f.type not in exclude_list]
+
+
+def get_appended_rows_where_clause(desc, previous_manifest, manifest):
+    """Gets a where clause selecting the rows appended to a dataset since a previous manifest was recorded, or None if
+    the dataset has changed in any other way (e.g. rows were deleted, or edited according to editor tracking).
+
+    Without editor tracking, edits to existing rows can't be detected, so a dataset that has only gained rows with
+    higher object IDs is treated as appended to."""
+    if previous_manifest["schemaHash"] != manifest["schemaHash"]:
+        return None
+
+    previous_max_oid = previous_manifest["maxOid"]
+    if previous_max_oid is None or manifest["maxOid"] is None or manifest["maxOid"] <= previous_max_oid:
+        return None
+
+    oid_field = arcpy.AddFieldDelimiters(desc.catalogPath, desc.OIDFieldName)
+    where_clause = "{} > {}".format(oid_field, previous_max_oid)
+
+    # object IDs only increase, so if all added rows are above the previous maximum, no rows have been deleted
+    with arcpy.da.SearchCursor(desc.catalogPath, ["OID@"], where_clause) as cursor:
+        appended_row_count = sum(1 for _ in cursor)
+
+    if manifest["rowCount"] - previous_manifest["rowCount"] != appended_row_count:
+        return None
+
+    if manifest["lastEdited"] is not None:
+        if previous_manifest["lastEdited"] is None:
+            # editor tracking wasn't recorded previously, so edits since then can't be ruled out
+            return None
+
+        # no previously converted rows may have been edited since
+        last_edited = _get_max_value(
+            desc.catalogPath, desc.editedAtFieldName, "{} <= {}".format(oid_field, previous_max_oid)
+        )
+        last_edited = last_edited.strftime(MANIFEST_TIMESTAMP_FORMAT) if last_edited else None
+        if last_edited is not None and last_edited > previous_manifest["lastEdited"]:
+            return None
+
+    return where_clause
+
+
+def get_dataset_manifest(desc):
+    """Gets a manifest of the current state of a feature class or table, from its description (the schema is taken
+    from the description's fields)."""
+    row_count = int(arcpy.management.GetCount(desc.catalogPath)[0])
+    max_oid = _get_max_value(desc.catalogPath, desc.OIDFieldName) if desc.hasOID else None
+
+    last_edited = None
+    if getattr(desc, "editorTrackingEnabled", False) and desc.editedAtFieldName:
+        last_edited = _get_max_value(desc.catalogPath, desc.editedAtFieldName)
+
+    return create_manifest(
+        row_count, max_oid, last_edited, get_schema_hash(desc.fields, getattr(desc, "codedValues", None))
+    )
+
+
+def _get_max_value(dataset, field_name, where_clause=None):
+    if _is_ordered_datasource(dataset):
+        # the database sorts the rows (using an index where there is one), so only the first row is read
+        field = arcpy.AddFieldDelimiters(dataset, field_name)
+        not_null_clause = "{} IS NOT NULL".format(field)
+        where_clause = "({}) AND {}".format(where_clause, not_null_clause) if where_clause else not_null_clause
+
+        with arcpy.da.SearchCursor(
+            dataset, [field_name], where_clause, sql_clause=(None, "ORDER BY {} DESC".format(field))
+        ) as cursor:
+            for row in cursor:
+                return row[0]
+
+        return None
+
+    # rows are scanned, as other datasources don't sort rows
+    max_value = None
+
+    with arcpy.da.SearchCursor(dataset, [field_name], where_clause) as cursor:
+        for row in cursor:
+            if row[0] is not None and (max_value is None or row[0] > max_value):
+                max_value = row[0]
+
+    return max_value
+
+
+def _is_ordered_datasource(dataset):
+    # datasets are in a database if any folder on their path is one (e.g. a feature class in a feature dataset)
+    return any(part.lower().endswith(_ORDERED_WORKSPACE_EXTENSIONS) for part in re.split(r"[\\/]", str(dataset)))
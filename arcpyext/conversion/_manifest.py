@@ -0,0 +1,103 @@
+# coding=utf-8
+"""This module contains functions for the manifests recorded alongside converted datasets, which describe the state of
+the source dataset when it was converted, so unchanged datasets can be skipped when converting again."""
+
+# Python 2/3 compatibility
+# pylint: disable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+from future.builtins.disabled import *
+from future.builtins import *
+from future.standard_library import install_aliases
+install_aliases()
+# pylint: enable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position
+
+# Standard library imports
+import hashlib
+import io
+import json
+import logging
+import os
+
+# version of the manifest format, manifests of other versions are ignored
+MANIFEST_VERSION = 1
+
+# format of timestamps in manifests, fixed so that they can be compared as strings
+MANIFEST_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+
+_MANIFEST_SUFFIX = ".manifest.json"
+
+
+def create_manifest(row_count, max_oid, last_edited, schema_hash):
+    """Creates a manifest of the state of a dataset.
+
+    :param row_count: The number of rows in the dataset.
+    :param max_oid: The highest object ID in the dataset, or None if it has no rows or object IDs.
+    :param last_edited: The latest editor tracking edit date in the dataset (a datetime), or None if editor tracking
+                        isn't enabled.
+    :param schema_hash: A hash of the dataset's fields, as returned by get_schema_hash.
+    """
+    return {
+        "version": MANIFEST_VERSION,
+        "rowCount": row_count,
+        "maxOid": max_oid,
+        "lastEdited": last_edited.strftime(MANIFEST_TIMESTAMP_FORMAT) if last_edited else None,
+        "schemaHash": schema_hash
+    }
+
+
+def get_manifest_path(output_path):
+    """Gets the path of the manifest recorded for an output dataset."""
+    return str(output_path) + _MANIFEST_SUFFIX
+
+
+def get_schema_hash(fields, coded_values=None):
+    """Gets a hash of the schema of a dataset, from its fields (e.g. as returned by arcpy.ListFields).
+
+    :param fields: The fields of the dataset.
+    :param coded_values: The values and descriptions of the coded value domains of fields, by field name (e.g. the
+                         codedValues of a DatasetMetadata snapshot), as descriptions are written in place of values.
+    """
+    coded_values = coded_values or {}
+    schema = [
+        [
+            f.name, f.type, f.length, f.precision, f.scale, f.isNullable, f.domain,
+            sorted([str(k), v] for k, v in coded_values.get(f.name, {}).items())
+        ] for f in fields
+    ]
+    return hashlib.sha256(json.dumps(schema).encode("utf-8")).hexdigest()
+
+
+def read_manifest(output_path):
+    """Reads the manifest recorded for an output dataset, or None if there isn't one."""
+    manifest_path = get_manifest_path(output_path)
+
+    if not os.path.isfile(manifest_path):
+        return None
+
+    try:
+        with io.open(manifest_path, "r", encoding="utf-8") as manifest_file:
+            manifest = json.load(manifest_file)
+    except ValueError:
+        # corrupt manifest, treat the output as if it was never converted
+        _get_logger().warning("Ignoring unreadable conversion manifest '%s'.", manifest_path)
+        return None
+
+    return manifest if manifest.get("version") == MANIFEST_VERSION else None
+
+
+def remove_manifest(output_path):
+    """Removes the manifest recorded for an output dataset, if there is one."""
+    manifest_path = get_manifest_path(output_path)
+
+    if os.path.isfile(manifest_path):
+        os.remove(manifest_path)
+
+
+def write_manifest(output_path, manifest):
+    """Records the manifest of an output dataset."""
+    with io.open(get_manifest_path(output_path), "w", encoding="utf-8") as manifest_file:
+        manifest_file.write(str(json.dumps(manifest, indent=2)))
+
+
+def _get_logger():
+    return logging.getLogger("arcpyext.conversion")
@@ -0,0 +1,235 @@
+# coding=utf-8
+"""This module contains a per-run cache of dataset metadata, so each workspace and dataset is described once per
+conversion, and every converter works from the same snapshot of its fields, shape type and spatial reference."""
+
+# Python 2/3 compatibility
+# pylint: disable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+from future.builtins.disabled import *
+from future.builtins import *
+from future.standard_library import install_aliases
+install_aliases()
+# pylint: enable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position
+
+# Standard library imports
+import os
+
+# Third-party imports
+import arcpy
+
+
+class FieldMetadata(object):
+    """A snapshot of the properties of a field (as returned by arcpy.ListFields, or from a description's fields)."""
+
+    aliasName = None
+    domain = None
+    isNullable = True
+    length = None
+    name = None
+    precision = None
+    required = False
+    scale = None
+    type = None
+
+    def __init__(self, field):
+        self.aliasName = field.aliasName
+        self.domain = getattr(field, "domain", None)
+        self.isNullable = field.isNullable
+        self.length = field.length
+        self.name = field.name
+        self.precision = field.precision
+        self.required = getattr(field, "required", False)
+        self.scale = field.scale
+        self.type = field.type
+
+    def __repr__(self):
+        return "FieldMetadata({!r}, {!r})".format(self.name, self.type)
+
+
+class SpatialReferenceMetadata(object):
+    """A snapshot of the properties of a spatial reference."""
+
+    factoryCode = None
+    name = None
+    type = None
+    wkt = None
+
+    def __init__(self, spatial_reference):
+        self.factoryCode = spatial_reference.factoryCode
+        self.name = spatial_reference.name
+        self.type = spatial_reference.type
+
+        # exported string is the well-known text, followed by the coordinate domains and resolutions
+        self.wkt = spatial_reference.exportToString().split(";")[0]
+
+    def __repr__(self):
+        return "SpatialReferenceMetadata({!r}, {!r})".format(self.name, self.factoryCode)
+
+
+class DatasetMetadata(object):
+    """A snapshot of the description of a feature class, table or relationship class.
+
+    Properties are named as they are on arcpy descriptions, so a snapshot can be used in place of one by converters.
+    Unlike a description, a snapshot holds no connection to its workspace and can be sent to worker processes.
+
+    The codedValues property holds the values and descriptions of the coded value domains of fields, by field name
+    (subtype-specific domains aren't included).
+    """
+
+    catalogPath = None
+    codedValues = None
+    dataType = None
+    destinationClassNames = None
+    editedAtFieldName = None
+    editorTrackingEnabled = False
+    fields = None
+    hasM = False
+    hasOID = False
+    hasZ = False
+    name = None
+    OIDFieldName = None
+    originClassKeys = None
+    originClassNames = None
+    shapeFieldName = None
+    shapeType = None
+    spatialReference = None
+
+    def __init__(self, desc):
+        self.catalogPath = desc.catalogPath
+        self.codedValues = {}
+        self.dataType = desc.dataType
+        self.name = desc.name
+
+        if self.dataType in ("FeatureClass", "Table"):
+            self.fields = [FieldMetadata(f) for f in desc.fields]
+            self.hasOID = desc.hasOID
+            self.OIDFieldName = desc.OIDFieldName if self.hasOID else None
+
+            # editor tracking properties are only present on descriptions of geodatabase datasets
+            self.editorTrackingEnabled = getattr(desc, "editorTrackingEnabled", False)
+            self.editedAtFieldName = getattr(desc, "editedAtFieldName", None) if self.editorTrackingEnabled else None
+
+        if self.dataType == "FeatureClass":
+            self.hasM = desc.hasM
+            self.hasZ = desc.hasZ
+            self.shapeFieldName = desc.shapeFieldName
+            self.shapeType = desc.shapeType
+            self.spatialReference = SpatialReferenceMetadata(desc.spatialReference)
+        elif self.dataType == "RelationshipClass":
+            self.destinationClassNames = list(desc.destinationClassNames)
+            self.originClassKeys = [tuple(k) for k in desc.originClassKeys]
+            self.originClassNames = list(desc.originClassNames)
+
+    def __repr__(self):
+        return "DatasetMetadata({!r}, {!r})".format(self.name, self.dataType)
+
+
+class WorkspaceMetadata(object):
+    """A snapshot of the description of a workspace, with snapshots of each of its children."""
+
+    catalogPath = None
+    children = None
+    dataType = None
+    name = None
+
+    def __init__(self, desc, children):
+        self.catalogPath = desc.catalogPath
+        self.children = children
+        self.dataType = desc.dataType
+        self.name = desc.name
+
+
+class MetadataCache(object):
+    """A cache of dataset and workspace metadata, kept for a single conversion run.
+
+    Datasets are described once, when first asked for, and described again only if the cache is cleared.  A cache
+    shouldn't outlive the run it was created for, as it won't see changes made to schemas after they're described.
+    """
+
+    _datasets = None
+    _workspaces = None
+
+    def __init__(self):
+        self._datasets = {}
+        self._workspaces = {}
+
+    def clear(self):
+        """Removes all metadata from the cache."""
+        self._datasets.clear()
+        self._workspaces.clear()
+
+    def describe(self, dataset):
+        """Gets a snapshot of the description of a feature class, table or relationship class, by path."""
+        key = _get_key(dataset)
+
+        metadata = self._datasets.get(key)
+        if metadata is None:
+            desc = arcpy.Describe(dataset)
+            metadata = self._datasets[key] = DatasetMetadata(desc)
+
+            if _has_domains([metadata]):
+                _add_coded_values([metadata], _get_workspace_path(desc))
+
+        return metadata
+
+    def describe_workspace(self, workspace):
+        """Gets a snapshot of the description of a workspace, by path.
+
+        The workspace is described once, and the snapshots of its children are taken from that description (so aren't
+        described individually).  Children that aren't feature classes, tables or relationship classes (e.g. feature
+        datasets) are left out."""
+        key = _get_key(workspace)
+
+        metadata = self._workspaces.get(key)
+        if metadata is None:
+            desc = arcpy.Describe(workspace)
+
+            children = []
+            if desc.dataType == "Workspace":
+                for child in desc.children:
+                    if child.dataType not in ("FeatureClass", "Table", "RelationshipClass"):
+                        continue
+
+                    child_key = _get_key(child.catalogPath)
+                    if child_key not in self._datasets:
+                        self._datasets[child_key] = DatasetMetadata(child)
+                    children.append(self._datasets[child_key])
+
+                # domains are listed once for the whole workspace
+                if _has_domains(children):
+                    _add_coded_values(children, desc.catalogPath)
+
+            metadata = self._workspaces[key] = WorkspaceMetadata(desc, children)
+
+        return metadata
+
+    def get_fields(self, dataset):
+        """Gets snapshots of the fields of a feature class or table, by path."""
+        return self.describe(dataset).fields
+
+
+def _add_coded_values(datasets, workspace):
+    coded_values = {d.name: d.codedValues for d in arcpy.da.ListDomains(workspace) if d.domainType == "CodedValue"}
+
+    for dataset in datasets:
+        for field in dataset.fields or []:
+            if field.domain in coded_values:
+                dataset.codedValues[field.name] = coded_values[field.domain]
+
+
+def _get_key(path):
+    # paths are compared case-insensitively, as geodatabase and file names are
+    return os.path.normcase(os.path.abspath(str(path))).lower()
+
+
+def _get_workspace_path(desc):
+    # datasets in feature datasets are two levels below their workspace
+    path = desc.path
+    if arcpy.Describe(path).dataType == "FeatureDataset":
+        path = os.path.dirname(path)
+
+    return path
+
+
+def _has_domains(datasets):
+    return any(f.domain for d in datasets for f in d.fields or [])
@@ -0,0 +1,149 @@
+# coding=utf-8
+"""This module contains an Office Open XML workbook that hands out unique, valid worksheet names in constant time, so
+workspaces with many similarly named datasets can be written to a single workbook."""
+
+# Python 2/3 compatibility
+# pylint: disable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+from future.builtins.disabled import *
+from future.builtins import *
+from future.standard_library import install_aliases
+install_aliases()
+# pylint: enable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position
+
+# Standard library imports
+import re
+
+# Third-party imports
+import xlsxwriter
+import xlsxwriter.exceptions
+
+# maximum length of a worksheet name (an Excel limit)
+MAX_SHEET_NAME_LENGTH = 31
+
+# characters Excel doesn't allow in worksheet names
+_INVALID_SHEET_NAME_CHARS = re.compile(r"[\[\]:*?/\\]")
+
+
+class SheetNameAllocator(object):
+    """Allocates unique worksheet names for a workbook.
+
+    Names are compared case-insensitively (as Excel compares them), and a name that has already been allocated is made
+    unique by replacing its end with a "~" and a number.  The next number to try is remembered for each name, so
+    allocating many similarly named sheets doesn't probe every number already taken.
+    """
+
+    _next_suffixes = None
+    _used_names = None
+
+    def __init__(self, used_names=()):
+        self._next_suffixes = {}
+        self._used_names = set()
+
+        for name in used_names:
+            self.reserve(name)
+
+    def __contains__(self, name):
+        return name.lower() in self._used_names
+
+    def __len__(self):
+        return len(self._used_names)
+
+    def allocate(self, name):
+        """Allocates a unique, valid worksheet name, based on the name given.
+
+        Characters Excel doesn't allow are replaced with underscores, and the name is truncated to 31 characters.
+        """
+        name = get_valid_sheet_name(name)
+        key = name.lower()
+
+        if key in self._used_names:
+            suffix = self._next_suffixes.get(key, 1)
+
+            while True:
+                suffix_text = "~{}".format(suffix)
+                candidate = name[:MAX_SHEET_NAME_LENGTH - len(suffix_text)] + suffix_text
+                suffix += 1
+
+                if candidate.lower() not in self._used_names:
+                    break
+
+            self._next_suffixes[key] = suffix
+            name = candidate
+
+        self._used_names.add(name.lower())
+        return name
+
+    def reserve(self, name):
+        """Marks a worksheet name as used (e.g. for sheets added without being allocated a name)."""
+        self._used_names.add(name.lower())
+
+
+class Workbook(xlsxwriter.Workbook):
+    """An xlsxwriter workbook that keeps track of the names of its worksheets, so unique names can be allocated for new
+    worksheets."""
+
+    _adding_named_sheet = False
+    _sheet_names = None
+    _used_names = None
+
+    def __init__(self, filename=None, options=None):
+        super().__init__(filename, options)
+        self._sheet_names = SheetNameAllocator()
+        self._used_names = set()
+
+    def add_chartsheet(self, name=None, chartsheet_class=None):
+        chartsheet = super().add_chartsheet(name, chartsheet_class)
+        self._add_used_name(chartsheet.name)
+        return chartsheet
+
+    def add_worksheet(self, name=None, worksheet_class=None):
+        if not name:
+            # default names (e.g. Sheet1) are only known to xlsxwriter, which checks them itself
+            worksheet = super().add_worksheet(name, worksheet_class)
+            self._add_used_name(worksheet.name)
+            return worksheet
+
+        # xlsxwriter checks a new name against each sheet from worksheets(), which is quadratic over a workbook's
+        # sheets, so the name is looked up in a set instead, and no sheets are listed while it's added
+        if name.lower() in self._used_names:
+            raise xlsxwriter.exceptions.DuplicateWorksheetName(
+                "Sheetname '{}', with case ignored, is already in use.".format(name)
+            )
+
+        self._adding_named_sheet = True
+        try:
+            worksheet = super().add_worksheet(name, worksheet_class)
+        finally:
+            self._adding_named_sheet = False
+
+        self._add_used_name(worksheet.name)
+        return worksheet
+
+    def get_unique_sheet_name(self, name):
+        """Gets a valid worksheet name, based on the name given, that isn't used by another sheet in the workbook.  The
+        name is reserved, so it won't be handed out again."""
+        return self._sheet_names.allocate(name)
+
+    def worksheets(self):
+        if self._adding_named_sheet:
+            return []
+
+        return super().worksheets()
+
+    def _add_used_name(self, name):
+        self._used_names.add(name.lower())
+
+        # sheets added by name are reserved, so names aren't allocated that clash with them
+        self._sheet_names.reserve(name)
+
+
+def get_valid_sheet_name(name):
+    """Gets a name that's valid for an Excel worksheet, by replacing characters that aren't allowed and truncating it
+    to 31 characters."""
+    name = _INVALID_SHEET_NAME_CHARS.sub("_", name)[:MAX_SHEET_NAME_LENGTH]
+
+    # names can't start or end with an apostrophe
+    name = name.strip("'")
+
+    return name or "Sheet"
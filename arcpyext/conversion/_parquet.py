@@ -0,0 +1,128 @@
+# coding=utf-8
+"""This module contains a writer for Apache Parquet files that writes rows in batches, using the optional pyarrow
+package."""
+
+# Python 2/3 compatibility
+# pylint: disable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+from future.builtins.disabled import *
+from future.builtins import *
+from future.standard_library import install_aliases
+install_aliases()
+# pylint: enable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position
+
+# Standard library imports
+from itertools import islice
+
+# Third-party imports
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    # pyarrow is optional, it's only needed to write Parquet files
+    pyarrow = None
+
+# number of rows read in to each record batch, and written to each row group
+PARQUET_ROW_GROUP_SIZE = 65536
+
+# compression used for all columns, unless another is given
+PARQUET_COMPRESSION = "snappy"
+
+# Arrow types written for each arcpy field type, as (pyarrow type function, arguments), geometry is written as
+# well-known binary (WKB) and other types not listed here as text
+_ARROW_TYPES = {
+    "BigInteger": ("int64", ),
+    "Date": ("timestamp", "us"),
+    "DateOnly": ("date32", ),
+    "Double": ("float64", ),
+    "Geometry": ("binary", ),
+    "GlobalID": ("string", ),
+    "GUID": ("string", ),
+    "Integer": ("int32", ),
+    "OID": ("int64", ),
+    "Single": ("float32", ),
+    "SmallInteger": ("int16", ),
+    "String": ("string", ),
+    "TimeOnly": ("time64", "us"),
+    "TimestampOffset": ("timestamp", "us", "UTC")
+}
+
+
+class ParquetFileWriter(object):
+    """Writes rows to a Parquet file, one row group per batch of rows.
+
+    Columns are typed by the arcpy field type they're read from.  Compression is either the name of a codec used for
+    all columns (e.g. "snappy", "zstd", "gzip" or "none"), or a dictionary of codecs by column name, with columns not in
+    the dictionary compressed with the default codec.
+    """
+
+    _row_group_size = None
+    _schema = None
+    _text_columns = None
+    _writer = None
+
+    def __init__(self, file_path, fields, row_group_size=PARQUET_ROW_GROUP_SIZE, compression=PARQUET_COMPRESSION):
+        """Creates a Parquet file.
+
+        :param file_path: The path of the file to write.
+        :param fields: A list of (name, arcpy field type) tuples, one for each column of the rows that will be written.
+        :param row_group_size: The number of rows in each row group.
+        :param compression: The codec used for all columns, or a dictionary of codecs by column name.
+        """
+        if pyarrow is None:
+            raise ValueError("Writing Parquet files requires the pyarrow package.")
+
+        self._row_group_size = row_group_size
+        self._schema = pyarrow.schema([
+            pyarrow.field(name, _get_arrow_type(field_type), field_type != "OID") for name, field_type in fields
+        ])
+
+        # values of types that aren't known are written as text
+        self._text_columns = set(i for i, (_, field_type) in enumerate(fields) if field_type not in _ARROW_TYPES)
+
+        if isinstance(compression, dict):
+            compression = {name: compression.get(name, PARQUET_COMPRESSION) for name in self._schema.names}
+
+        self._writer = pyarrow.parquet.ParquetWriter(str(file_path), self._schema, compression=compression)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        if self._writer is None:
+            return
+
+        self._writer.close()
+        self._writer = None
+
+    def write_rows(self, rows):
+        """Writes rows (e.g. from an arcpy.da.SearchCursor), returning the number of rows written."""
+        rows = iter(rows)
+        row_count = 0
+
+        while True:
+            chunk = list(islice(rows, self._row_group_size))
+            if not chunk:
+                return row_count
+
+            self._writer.write_batch(self._create_record_batch(chunk), row_group_size=self._row_group_size)
+            row_count += len(chunk)
+
+    def _create_record_batch(self, rows):
+        arrays = []
+
+        # arrays are built a column at a time, from the columns of the batch of rows
+        for i, (column, field) in enumerate(zip(zip(*rows), self._schema)):
+            if i in self._text_columns:
+                column = [None if v is None else str(v) for v in column]
+            arrays.append(pyarrow.array(column, type=field.type))
+
+        return pyarrow.RecordBatch.from_arrays(arrays, schema=self._schema)
+
+
+def _get_arrow_type(field_type):
+    arrow_type = _ARROW_TYPES.get(field_type, ("string", ))
+    return getattr(pyarrow, arrow_type[0])(*arrow_type[1:])
@@ -0,0 +1,105 @@
+# coding=utf-8
+"""This module contains the stages of the row-transform pipeline, which rows read for conversion are streamed through
+(e.g. to replace coded values with their domain descriptions, or to simplify geometries)."""
+
+# Python 2/3 compatibility
+# pylint: disable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+from future.builtins.disabled import *
+from future.builtins import *
+from future.standard_library import install_aliases
+install_aliases()
+# pylint: enable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position
+
+# Standard library imports
+import copy
+
+# options of the row-transform pipeline, as passed to converters
+TRANSFORM_OPTIONS = ("field_names", "where_clause", "use_domain_descriptions", "simplify_tolerance")
+
+
+def combine_where_clauses(*where_clauses):
+    """Combines where clauses so that rows must match all of them, ignoring any that are empty (returns None if all
+    are)."""
+    where_clauses = [w for w in where_clauses if w]
+
+    if not where_clauses:
+        return None
+    if len(where_clauses) == 1:
+        return where_clauses[0]
+
+    return " AND ".join("({})".format(w) for w in where_clauses)
+
+
+def get_text_field(field):
+    """Gets a copy of a field (e.g. a FieldMetadata snapshot) with its type changed to String, for fields whose values
+    are replaced with text."""
+    text_field = copy.copy(field)
+    text_field.type = "String"
+    return text_field
+
+
+def get_transform_options(options):
+    """Gets the row-transform options from a dictionary of converter options, in a form that can be recorded in a
+    manifest (so that output converted with different options isn't treated as up to date)."""
+    transform_options = {}
+
+    for name in TRANSFORM_OPTIONS:
+        value = options.get(name)
+        if value:
+            transform_options[name] = list(value) if name == "field_names" else value
+
+    return transform_options
+
+
+def map_values(rows, value_maps):
+    """Replaces values in each row with the values they map to, leaving values that aren't mapped as they are.
+
+    :param rows: An iterable of rows.
+    :param value_maps: A list with a dictionary (or None) for each column of the rows, mapping values to their
+                       replacement (e.g. coded values to their domain descriptions).
+    """
+    mapped_columns = [(i, m) for i, m in enumerate(value_maps) if m]
+
+    if not mapped_columns:
+        for row in rows:
+            yield row
+        return
+
+    for row in rows:
+        row = list(row)
+        for i, value_map in mapped_columns:
+            row[i] = value_map.get(row[i], row[i])
+        yield row
+
+
+def select_fields(fields, field_names):
+    """Selects fields by name (case-insensitively), in the order the names are given.  Names that aren't fields are
+    ignored, so the same names can be selected across datasets with differing fields.  All fields are returned if no
+    names are given."""
+    if not field_names:
+        return list(fields)
+
+    fields_by_name = {f.name.lower(): f for f in fields}
+    return [fields_by_name[n.lower()] for n in field_names if n.lower() in fields_by_name]
+
+
+def simplify_geometries(rows, geometry_index, tolerance, geometry_format):
+    """Simplifies the geometry in each row, and converts it to the format it's written in.
+
+    :param rows: An iterable of rows, with geometry objects (e.g. as read with the SHAPE@ token).
+    :param geometry_index: The index of the geometry column in each row.
+    :param tolerance: The maximum distance simplified geometries may deviate from the original, in the units of the
+                      geometry's spatial reference.
+    :param geometry_format: The name of the geometry property the simplified geometry is written as (e.g. "WKB" or
+                            "WKT").
+    """
+    for row in rows:
+        row = list(row)
+        geometry = row[geometry_index]
+
+        if geometry is not None:
+            geometry = getattr(geometry.generalize(tolerance), geometry_format)
+            row[geometry_index] = bytes(geometry) if geometry_format == "WKB" else geometry
+
+        yield row
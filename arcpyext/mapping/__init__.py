@@ -1 +1,7 @@
-from ._mapping import *
\ No newline at end of file
+from .._arcpy_import import import_arcpy as _import_arcpy
+
+# None if arcpy isn't installed, then only the ArcGIS Pro document readers in _cim can be used
+_arcpy = _import_arcpy()
+
+if _arcpy is not None:
+    from ._mapping import *
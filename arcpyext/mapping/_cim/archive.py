@@ -0,0 +1,177 @@
+# coding=utf-8
+"""This module contains a reader for the zip archives ArcGIS Pro documents are stored in."""
+
+# Python 2/3 compatibility
+# pylint: disable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position,import-error,no-name-in-module
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+from future.builtins.disabled import *
+from future.builtins import *
+from future.standard_library import install_aliases
+install_aliases()
+# pylint: enable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position,import-error,no-name-in-module
+
+# Standard lib imports
+import io
+import struct
+import zipfile
+import zlib
+
+# Local imports
+from .helpers import LruCache
+
+# default upper limit on the total size of decompressed members held in memory
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+
+# size of the compressed blocks read when decompressing only the start of a member
+_PREFIX_READ_SIZE = 4096
+
+# general purpose flag bit of a zip entry indicating it is encrypted
+_ZIP_FLAG_ENCRYPTED = 0x01
+
+# positions of the file name and extra field lengths in a zip local file header
+_ZIP_FH_FILENAME_LENGTH = 10
+_ZIP_FH_EXTRA_FIELD_LENGTH = 11
+
+
+class ProjectArchive(object):
+    """Reads the members of the zip archive an ArcGIS Pro project (or other zip-based document) is stored in.
+
+    The archive's central directory is indexed once, when opened.  Members are then read straight from their offset in
+    the archive and decompressed on demand, with decompressed members held in a cache bounded by their total size in
+    bytes.  Supports the ``read`` function of ``zipfile.ZipFile``, so it can be used in place of one for reading.
+    """
+
+    _cache = None
+    _file_handle = None
+    _file_path = None
+    _index = None
+    _zip = None
+
+    def __init__(self, file_path, cache_bytes=DEFAULT_CACHE_BYTES):
+        self._file_path = str(file_path)
+        self._cache = LruCache(cache_bytes, get_size=len)
+
+    def __contains__(self, name):
+        return name in self._get_index()
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    #region PROPERTIES
+
+    @property
+    def file_path(self):
+        return self._file_path
+
+    #endregion
+
+    #region PUBLIC FUNCTIONS
+
+    def close(self):
+        """Closes the archive, not required when used inside a 'with' statement."""
+        if self._zip:
+            self._zip.close()
+            self._file_handle.close()
+            self._zip = None
+            self._file_handle = None
+            self._index = None
+            self._cache.clear()
+
+    def namelist(self):
+        """Gets the names of all members of the archive."""
+        return list(self._get_index())
+
+    def open(self):
+        """Opens the archive for reading, not required when used inside a 'with' statement."""
+        if not self._zip:
+            self._zip = zipfile.ZipFile(self._file_path, mode="r", allowZip64=True)
+            self._file_handle = io.open(self._file_path, "rb")
+
+            # index members by name, the start of each member's data is resolved (once) when it is first read
+            self._index = {info.filename: {"info": info, "dataOffset": None} for info in self._zip.infolist()}
+
+    def read(self, name):
+        """Reads the decompressed bytes of a member, raising a KeyError if the archive has no member with that name."""
+        return self._cache.get(name, lambda: self._read_member(name))
+
+    def read_text(self, name, encoding="utf-8"):
+        """Reads a member as text."""
+        return self.read(name).decode(encoding)
+
+    def read_view(self, name, size=None):
+        """Reads a member as a memoryview over its decompressed bytes, which can be sliced without copying.
+
+        If a size is given, only (up to) that many bytes from the start of the member are returned.  If the member isn't
+        already cached, only that much of it is decompressed, and it is not added to the cache.
+        """
+        if size is not None and not name in self._cache:
+            return memoryview(self._read_member(name, size))
+
+        view = memoryview(self.read(name))
+        return view if size is None else view[:size]
+
+    #endregion
+
+    def _get_index(self):
+        if self._index is None:
+            raise ValueError("The archive is not open.")
+
+        return self._index
+
+    def _read_member(self, name, size=None):
+        member = self._get_index()[name]
+        info = member["info"]
+
+        if info.flag_bits & _ZIP_FLAG_ENCRYPTED or not info.compress_type in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+            # not something we can read directly, let zipfile deal with it
+            if size is None:
+                return self._zip.read(info)
+
+            with self._zip.open(info) as member_handle:
+                return member_handle.read(size)
+
+        if member["dataOffset"] is None:
+            # data starts after the local file header, which can have a different extra field to the central directory
+            self._file_handle.seek(info.header_offset)
+            local_header = struct.unpack(zipfile.structFileHeader, self._file_handle.read(zipfile.sizeFileHeader))
+            member["dataOffset"] = (
+                info.header_offset + zipfile.sizeFileHeader + local_header[_ZIP_FH_FILENAME_LENGTH] +
+                local_header[_ZIP_FH_EXTRA_FIELD_LENGTH]
+            )
+
+        self._file_handle.seek(member["dataOffset"])
+
+        if size is not None:
+            return self._read_member_prefix(info, size)
+
+        data = self._file_handle.read(info.compress_size)
+
+        if info.compress_type == zipfile.ZIP_DEFLATED:
+            # raw deflate stream, no zlib header
+            data = zlib.decompress(data, -zlib.MAX_WBITS)
+
+        if zlib.crc32(data) & 0xffffffff != info.CRC:
+            raise zipfile.BadZipFile("Bad CRC-32 for archive member '{}'.".format(name))
+
+        return data
+
+    def _read_member_prefix(self, info, size):
+        # reads the first bytes of a member, with the file handle positioned at the start of its data
+        if info.compress_type == zipfile.ZIP_STORED:
+            return self._file_handle.read(min(size, info.compress_size))
+
+        # raw deflate stream, no zlib header
+        decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+        remaining = info.compress_size
+        data = b""
+
+        while len(data) < size and remaining > 0:
+            chunk = self._file_handle.read(min(remaining, _PREFIX_READ_SIZE))
+            remaining -= len(chunk)
+            data += decompressor.decompress(chunk, size - len(data))
+
+        return data
@@ -9,57 +9,44 @@ from future.standard_library import install_aliases
 install_aliases()
 # pylint: enable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position,import-error,no-name-in-module
 
-import json
-
+# Local imports
+from .helpers import get_cim_type, get_json_cim_type
 from .layers import (
     ProFeatureLayer, ProFeatureMosaicSubLayer, ProGroupLayer, ProImageMosaicSubLayer, ProMosaicLayer, ProRasterLayer,
     ProTiledServiceLayer, ProVectorTileLayer
 )
 
+# layer classes by the CIM type of the layer document
+LAYER_TYPES = {
+    "CIMFeatureLayer": ProFeatureLayer,
+    "CIMFeatureMosaicSubLayer": ProFeatureMosaicSubLayer,
+    "CIMGroupLayer": ProGroupLayer,
+    "CIMImageMosaicSubLayer": ProImageMosaicSubLayer,
+    "CIMMosaicLayer": ProMosaicLayer,
+    "CIMRasterLayer": ProRasterLayer,
+    "CIMTiledServiceLayer": ProTiledServiceLayer,
+    "CIMVectorTileLayer": ProVectorTileLayer
+}
+
+# number of bytes read from the start of a layer document to determine its type
+_SNIFF_SIZE = 256
+
+
+def create_layer(proj_zip, layer_path, cim_cache):
+    """Factory function for creating a layer object based on the type of the layer file at the given path.
+
+    Returns None for unsupported layer types.
+    """
 
-def create_layer(proj_zip, layer_string):
-    """Factory function for creating a layer object bassed on the input string."""
-    # determine layer type, try to pass as JSON first
-    layer_obj = None
+    # the type is almost always at the start of the document, so try to get it from there without parsing the document
+    layer_type = get_cim_type(proj_zip.read_view(layer_path, _SNIFF_SIZE))
 
-    if layer_string.startswith("{"):
-        # layer is a JSON string, decode to determine type
+    if layer_type is None:
+        # JSON document with the type further in, fall back to parsing the whole document
+        layer_type = get_json_cim_type(proj_zip.read_text(layer_path))
 
-        layer_json = json.loads(layer_string)
-        layer_type = layer_json["type"]
-        if layer_type == "CIMFeatureLayer":
-            layer_obj = ProFeatureLayer(proj_zip, layer_string)
-        elif layer_type == "CIMGroupLayer":
-            layer_obj = ProGroupLayer(proj_zip, layer_string)
-        elif layer_type == "CIMRasterLayer":
-            layer_obj = ProRasterLayer(proj_zip, layer_string)
-        elif layer_type == "CIMMosaicLayer":
-            layer_obj = ProMosaicLayer(proj_zip, layer_string)
-        elif layer_type == "CIMFeatureMosaicSubLayer":
-            layer_obj = ProFeatureMosaicSubLayer(proj_zip, layer_string)
-        elif layer_type == "CIMImageMosaicSubLayer":
-            layer_obj = ProImageMosaicSubLayer(proj_zip, layer_string)
-        elif layer_type == "CIMTiledServiceLayer":
-            layer_obj = ProTiledServiceLayer(proj_zip, layer_string)
-        elif layer_type == "CIMVectorTileLayer":
-            layer_obj = ProVectorTileLayer(proj_zip, layer_string)
-    else:
-        # layer is probably XML, fallback to that
-        if layer_string.startswith("<CIMFeatureLayer"):
-            layer_obj = ProFeatureLayer(proj_zip, layer_string)
-        elif layer_string.startswith("<CIMGroupLayer"):
-            layer_obj = ProGroupLayer(proj_zip, layer_string)
-        elif layer_string.startswith("<CIMRasterLayer"):
-            layer_obj = ProRasterLayer(proj_zip, layer_string)
-        elif layer_string.startswith("<CIMMosaicLayer"):
-            layer_obj = ProMosaicLayer(proj_zip, layer_string)
-        elif layer_string.startswith("<CIMFeatureMosaicSubLayer"):
-            layer_obj = ProFeatureMosaicSubLayer(proj_zip, layer_string)
-        elif layer_string.startswith("<CIMImageMosaicSubLayer"):
-            layer_obj = ProImageMosaicSubLayer(proj_zip, layer_string)
-        elif layer_string.startswith("<CIMTiledServiceLayer"):
-            layer_obj = ProTiledServiceLayer(proj_zip, layer_string)
-        elif layer_string.startswith("<CIMVectorTileLayer"):
-            layer_obj = ProVectorTileLayer(proj_zip, layer_string)
+    layer_class = LAYER_TYPES.get(layer_type)
+    if layer_class is None:
+        return None
 
-    return layer_obj
+    return layer_class(proj_zip, layer_path, cim_cache)
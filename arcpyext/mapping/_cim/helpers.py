@@ -10,14 +10,124 @@ from future.utils import raise_from
 install_aliases()
 # pylint: enable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position,import-error,no-name-in-module
 
+# Standard lib imports
+import json
+import re
+
+from collections import OrderedDict
+
+# a JSON CIM document where "type" is the first key, e.g. {"type" : "CIMFeatureLayer", ...
+_JSON_CIM_TYPE_PATTERN = re.compile(br'^(?:\xef\xbb\xbf)?\s*\{\s*"type"\s*:\s*"([^"]+)"')
+
+# the root element of an XML CIM document, optionally after an XML declaration, e.g. <CIMFeatureLayer ...
+_XML_CIM_TYPE_PATTERN = re.compile(br'^(?:\xef\xbb\xbf)?\s*(?:<\?xml[^>]*\?>\s*)?<([A-Za-z_][\w.-]*)')
+
+
+class LruCache(object):
+    """A cache holding at most a fixed number of items, discarding the least recently used item when full.
+
+    If a size function is given, the cache is instead bounded by the total size of its items (e.g. bytes when using
+    len).
+    """
+
+    _get_size = None
+    _items = None
+    _max_size = None
+    _total_size = 0
+
+    def __init__(self, max_size, get_size=None):
+        self._items = OrderedDict()
+        self._max_size = max_size
+        self._get_size = get_size or (lambda value: 1)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    @property
+    def max_size(self):
+        return self._max_size
+
+    @property
+    def total_size(self):
+        return self._total_size
+
+    def clear(self):
+        """Removes all items from the cache."""
+        self._items.clear()
+        self._total_size = 0
+
+    def get(self, key, factory):
+        """Gets the item for a key, creating it with the given factory function (and caching it) if not present."""
+        try:
+            # remove and re-insert to mark the item as the most recently used
+            value, size = self._items.pop(key)
+        except KeyError:
+            value = factory()
+            size = self._get_size(value)
+
+            if self._max_size is not None and size > self._max_size:
+                # would push everything else out and still not fit, don't cache it
+                return value
+
+            self._total_size += size
+
+        self._items[key] = (value, size)
+
+        while self._max_size is not None and self._total_size > self._max_size:
+            _, (_, discarded_size) = self._items.popitem(last=False)
+            self._total_size -= discarded_size
+
+        return value
+
+
+def get_cim_type(cim_bytes):
+    """Gets the CIM type (e.g. CIMFeatureLayer) of a JSON or XML CIM document from its bytes, or None if unknown.
+
+    Only the start of the document is examined, so this can be given just the first few hundred bytes (e.g. a slice of
+    a memoryview from a ProjectArchive).  None is returned if the type can't be determined from those bytes, which
+    is the case for a JSON document where "type" isn't the first key.
+    """
+    for pattern in (_JSON_CIM_TYPE_PATTERN, _XML_CIM_TYPE_PATTERN):
+        match = pattern.match(cim_bytes)
+        if match:
+            return match.group(1).decode("utf-8")
+
+    return None
+
+
+def get_json_cim_type(cim_string):
+    """Gets the CIM type of a JSON CIM document by parsing the whole document, or None if it isn't JSON."""
+    # strip any byte order mark
+    cim_string = cim_string.lstrip("\ufeff")
+
+    if not cim_string.lstrip().startswith("{"):
+        return None
+
+    return json.loads(cim_string).get("type")
+
+
+def read_cim(cim_class, zip_file_obj, inner_file_path):
+    """Reads a CIM object of the given CIM class (.NET or pure-Python) from an XML or JSON file in a zip file."""
+    cim_string = read_file_in_zip(zip_file_obj, inner_file_path)
+
+    # pick the reader by the format of the document, JSON is assumed if the CIM class can't read XML
+    if hasattr(cim_class, "FromXml") and not cim_string.lstrip("\ufeff \t\r\n").startswith("{"):
+        return cim_class.FromXml(cim_string)
+
+    return cim_class.FromJson(cim_string)
+
 
 def read_file_in_zip(zip_file_obj, inner_file_path, decode="utf-8"):
-    """Reads in an XML file as UTF-8 from a zip file."""
-    with zip_file_obj.open(inner_file_path) as zip_file_handle:
-        if decode:
-            return zip_file_handle.read().decode(decode)
+    """Reads in a file as UTF-8 from a zip file (or ProjectArchive), returning bytes if decode is not set."""
+    file_bytes = zip_file_obj.read(inner_file_path)
+
+    if decode:
+        return file_bytes.decode(decode)
 
-        return zip_file_handle.read()
+    return file_bytes
 
 
 def passthrough_prop(prop_name, doc=None, obj_name="_cim_obj"):
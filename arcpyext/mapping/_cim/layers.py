@@ -16,28 +16,39 @@ from future.utils import with_metaclass
 from abc import ABCMeta
 
 # Local imports
-from .helpers import passthrough_prop
+from .helpers import passthrough_prop, read_cim
 from .tables import ProFeatureTable
 
 # .NET Imports
-from ArcGIS.Core.CIM import (
-    CIMFeatureLayer, CIMFeatureMosaicSubLayer, CIMGroupLayer, CIMImageMosaicSubLayer, CIMMosaicLayer, CIMRasterLayer,
-    CIMTiledServiceLayer, CIMVectorTileLayer
-)
+try:
+    from ArcGIS.Core.CIM import (
+        CIMFeatureLayer, CIMFeatureMosaicSubLayer, CIMGroupLayer, CIMImageMosaicSubLayer, CIMMosaicLayer,
+        CIMRasterLayer, CIMTiledServiceLayer, CIMVectorTileLayer
+    )
+except ImportError:
+    # ArcGIS Pro SDK not available, fall back to the pure-Python CIM reader
+    from .pycim import (
+        CIMFeatureLayer, CIMFeatureMosaicSubLayer, CIMGroupLayer, CIMImageMosaicSubLayer, CIMMosaicLayer,
+        CIMRasterLayer, CIMTiledServiceLayer, CIMVectorTileLayer
+    )
 
 
 class ProLayerBase(with_metaclass(ABCMeta, object)):
+    """Base class for layers, which read their CIM definition from the project only when it is first needed."""
 
     _children = None
-    _cim_obj = None
+    _cim_cache = None
+    _cim_class = None
+    _layer_path = None
     _long_name = None
     _parent = None
     _proj_zip = None
 
-    def __init__(self, proj_zip, cim_obj):
+    def __init__(self, proj_zip, layer_path, cim_cache):
         self._children = []
         self._proj_zip = proj_zip
-        self._cim_obj = cim_obj
+        self._layer_path = layer_path
+        self._cim_cache = cim_cache
 
     description = passthrough_prop("Description")
     name = passthrough_prop("Name")
@@ -67,6 +78,12 @@ class ProLayerBase(with_metaclass(ABCMeta, object)):
 
         return "\\".join(name_parts)
 
+    @property
+    def _cim_obj(self):
+        return self._cim_cache.get(
+            self._layer_path, lambda: read_cim(self._cim_class, self._proj_zip, self._layer_path)
+        )
+
     def _get_child_paths(self):
         return []
 
@@ -75,9 +92,6 @@ class ProBasicFeatureLayer(ProLayerBase):
 
     _feature_table = None
 
-    def __init__(self, proj_zip, cim_obj):
-        super().__init__(proj_zip, cim_obj)
-
     @property
     def feature_table(self):
         if not self._feature_table:
@@ -87,30 +101,15 @@ class ProBasicFeatureLayer(ProLayerBase):
 
 
 class ProFeatureLayer(ProBasicFeatureLayer):
-    def __init__(self, proj_zip, layer_string):
-        try:
-            super().__init__(proj_zip, CIMFeatureLayer.FromXml(layer_string))
-        except AttributeError:
-            # probably JSON, attempt that
-            super().__init__(proj_zip, CIMFeatureLayer.FromJson(layer_string))
+    _cim_class = CIMFeatureLayer
 
 
 class ProFeatureMosaicSubLayer(ProLayerBase):
-    def __init__(self, proj_zip, layer_string):
-        try:
-            super().__init__(proj_zip, CIMFeatureMosaicSubLayer.FromXml(layer_string))
-        except AttributeError:
-            # probably JSON, attempt that
-            super().__init__(proj_zip, CIMFeatureMosaicSubLayer.FromJson(layer_string))
+    _cim_class = CIMFeatureMosaicSubLayer
 
 
 class ProGroupLayer(ProLayerBase):
-    def __init__(self, proj_zip, layer_string):
-        try:
-            super().__init__(proj_zip, CIMGroupLayer.FromXml(layer_string))
-        except AttributeError:
-            # probably JSON, attempt that
-            super().__init__(proj_zip, CIMGroupLayer.FromJson(layer_string))
+    _cim_class = CIMGroupLayer
 
     def _get_child_paths(self):
         # Layers can be a none if the group layer is empty, so guard against that
@@ -118,48 +117,23 @@ class ProGroupLayer(ProLayerBase):
 
 
 class ProImageMosaicSubLayer(ProLayerBase):
-    def __init__(self, proj_zip, layer_string):
-        try:
-            super().__init__(proj_zip, CIMImageMosaicSubLayer.FromXml(layer_string))
-        except AttributeError:
-            # probably JSON, attempt that
-            super().__init__(proj_zip, CIMImageMosaicSubLayer.FromJson(layer_string))
+    _cim_class = CIMImageMosaicSubLayer
 
 
 class ProMosaicLayer(ProLayerBase):
-    def __init__(self, proj_zip, layer_string):
-        try:
-            super().__init__(proj_zip, CIMMosaicLayer.FromXml(layer_string))
-        except AttributeError:
-            # probably JSON, attempt that
-            super().__init__(proj_zip, CIMMosaicLayer.FromJson(layer_string))
+    _cim_class = CIMMosaicLayer
 
     def _get_child_paths(self):
         return [self._cim_obj.BoundaryLayer[8:], self._cim_obj.FootprintLayer[8:], self._cim_obj.ImageLayer[8:]]
 
 
 class ProRasterLayer(ProLayerBase):
-    def __init__(self, proj_zip, layer_string):
-        try:
-            super().__init__(proj_zip, CIMRasterLayer.FromXml(layer_string))
-        except AttributeError:
-            # probably JSON, attempt that
-            super().__init__(proj_zip, CIMRasterLayer.FromJson(layer_string))
+    _cim_class = CIMRasterLayer
 
 
 class ProTiledServiceLayer(ProLayerBase):
-    def __init__(self, proj_zip, layer_string):
-        try:
-            super().__init__(proj_zip, CIMTiledServiceLayer.FromXml(layer_string))
-        except AttributeError:
-            # probably JSON, attempt that
-            super().__init__(proj_zip, CIMTiledServiceLayer.FromJson(layer_string))
+    _cim_class = CIMTiledServiceLayer
 
 
 class ProVectorTileLayer(ProLayerBase):
-    def __init__(self, proj_zip, layer_string):
-        try:
-            super().__init__(proj_zip, CIMVectorTileLayer.FromXml(layer_string))
-        except AttributeError:
-            # probably JSON, attempt that
-            super().__init__(proj_zip, CIMVectorTileLayer.FromJson(layer_string))
+    _cim_class = CIMVectorTileLayer
@@ -9,44 +9,64 @@ from future.standard_library import install_aliases
 install_aliases()
 # pylint: enable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position,import-error,no-name-in-module
 
-# Third-party imports
-import arcpy
-
 # Local imports
-from .helpers import read_file_in_zip, passthrough_prop
+from ..._arcpy_import import import_arcpy
+from .helpers import passthrough_prop, read_cim
 from .factories import create_layer
 from .tables import ProStandaloneTable
 
 # .NET Imports
-from ArcGIS.Core.CIM import CIMMap
+try:
+    from ArcGIS.Core.CIM import CIMMap
+except ImportError:
+    # ArcGIS Pro SDK not available, fall back to the pure-Python CIM reader
+    from .pycim import CIMMap
+
+# None if arcpy isn't installed (e.g. on Linux), spatial_reference can't be used, but spatial_reference_wkid can
+arcpy = import_arcpy()
 
 
 class ProMap(object):
+    """A map in an ArcGIS Pro project, which reads its CIM definition from the project only when it is first needed."""
 
+    _cim_cache = None
     _layers = None
+    _map_path = None
+    _name = None
+    _proj_zip = None
     _spatial_reference = None
     _tables = None
 
-    def __init__(self, proj_zip, map_string):
+    def __init__(self, proj_zip, map_path, cim_cache, name=None):
         self._proj_zip = proj_zip
-        try:
-            self._cim_obj = CIMMap.FromXml(map_string)
-        except AttributeError:
-            # probably in JSON format, try that
-            self._cim_obj = CIMMap.FromJson(map_string)
+        self._map_path = map_path
+        self._cim_cache = cim_cache
+        self._name = name
 
     #region PROPERTIES
 
     description = passthrough_prop("Description")
-    name = passthrough_prop("Name")
+
+    @property
+    def name(self):
+        # the name is known from the project item without having to read the map, if it was provided
+        if self._name is None:
+            self._name = self._cim_obj.Name
+
+        return self._name
 
     @property
     def spatial_reference(self):
+        """The spatial reference of the map as an arcpy.SpatialReference, requires arcpy."""
         if not self._spatial_reference:
-            self._spatial_reference = arcpy.SpatialReference(self._cim_obj.SpatialReference.Wkid)
+            self._spatial_reference = arcpy.SpatialReference(self.spatial_reference_wkid)
 
         return self._spatial_reference
 
+    @property
+    def spatial_reference_wkid(self):
+        return self._cim_obj.SpatialReference.Wkid
+
     @property
     def layers(self):
         if self._layers is None:
@@ -67,27 +87,23 @@ class ProMap(object):
     @property
     def tables(self):
         if self._tables is None:
-            self._tables = []
-
             # table paths are pre-pended with 'CIMPATH=', strip that to get the actual zip file path
             table_paths = [tp[8:] for tp in (self._cim_obj.StandaloneTables or [])]
 
             # build tables
-            for tp in table_paths:
-                # get xml, determine type, create layer object, add to list
-                table_string = read_file_in_zip(self._proj_zip, tp)
-
-                self._tables.append(ProStandaloneTable(self._proj_zip, table_string))
+            self._tables = [ProStandaloneTable(self._proj_zip, tp, self._cim_cache) for tp in table_paths]
 
         return self._tables.copy()
 
+    @property
+    def _cim_obj(self):
+        return self._cim_cache.get(self._map_path, lambda: read_cim(CIMMap, self._proj_zip, self._map_path))
+
     #endregion
 
     def _create_layers(self, layer_path):
-        # get xml, determine type, create layer object, add to list
-        layer_string = read_file_in_zip(self._proj_zip, layer_path)
-
-        layer_obj = create_layer(self._proj_zip, layer_string)
+        # determine type, create layer object, add to list
+        layer_obj = create_layer(self._proj_zip, layer_path, self._cim_cache)
         self._layers.append(layer_obj)
 
         if layer_obj:
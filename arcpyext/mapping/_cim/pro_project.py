@@ -10,27 +10,33 @@ from future.utils import raise_from
 install_aliases()
 # pylint: enable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position,import-error,no-name-in-module
 
-# Standard lib imports
-import zipfile
-
 # .NET Imports
-from ArcGIS.Core.CIM import CIMGISProject
+try:
+    from ArcGIS.Core.CIM import CIMGISProject
+except ImportError:
+    # ArcGIS Pro SDK not available, fall back to the pure-Python CIM reader
+    from .pycim import CIMGISProject
 
 # Local imports
-from .helpers import read_file_in_zip
+from .archive import ProjectArchive
+from .helpers import LruCache, read_file_in_zip
 from .pro_map import ProMap
 
+# default number of parsed map, layer and table CIM objects held in memory per project
+DEFAULT_CIM_CACHE_SIZE = 256
+
 
 class ProProject(object):
 
+    _cim_cache = None
     _cims = None
     _pro_maps = None
     _proj_zip = None
 
-    def __init__(self, proj_file_path):
+    def __init__(self, proj_file_path, cim_cache_size=DEFAULT_CIM_CACHE_SIZE):
         self._proj_file_path = proj_file_path
         self._cims = {}
-        self._cimmaps = {}
+        self._cim_cache = LruCache(cim_cache_size)
 
     def __enter__(self):
         self.open()
@@ -47,12 +53,10 @@ class ProProject(object):
             # get project items of type map
             cimproject_items = [i for i in self._cimgisproject.ProjectItems if i.ItemType == "Map"]
 
+            # create a ProMap object for each map, the map isn't read from the archive until it is used
             # map paths are pre-pended with 'CIMPATH=', strip that to get the actual zip file path
-            map_paths = [pi.CatalogPath[8:] for pi in cimproject_items]
-
-            # get XML for each map in archive, create ProMap object
             self._pro_maps = [
-                ProMap(self._proj_zip, read_file_in_zip(self._proj_zip, map_path)) for map_path in map_paths
+                ProMap(self._proj_zip, pi.CatalogPath[8:], self._cim_cache, pi.Name) for pi in cimproject_items
             ]
 
         # return a shallow copy so our internal list isn't altered
@@ -103,10 +107,13 @@ class ProProject(object):
         if self._proj_zip:
             self._proj_zip.close()
             self._proj_zip = None
+            self._pro_maps = None
+            self._cim_cache.clear()
 
     def open(self):
         """Opens the ArcGIS Project for reading, not required when used inside a 'with' statement."""
         if not self._proj_zip:
-            self._proj_zip = zipfile.ZipFile(self._proj_file_path, mode="r", allowZip64=True)
+            self._proj_zip = ProjectArchive(self._proj_file_path)
+            self._proj_zip.open()
 
     #endregion
@@ -0,0 +1,178 @@
+# coding=utf-8
+"""This module contains a pure-Python reader for CIM documents, used when the ArcGIS Pro SDK (ArcGIS.Core.CIM) can't be
+loaded through pythonnet (e.g. on Linux).
+
+The classes mirror the subset of the SDK's CIM classes used by arcpyext.  Each has FromXml and FromJson functions, and
+the objects they read expose the document's properties as attributes named as they are in the SDK (e.g.
+ServiceLayerID), so they can be used interchangeably with their .NET counterparts.
+"""
+
+# Python 2/3 compatibility
+# pylint: disable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position,import-error,no-name-in-module
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+from future.builtins.disabled import *
+from future.builtins import *
+from future.standard_library import install_aliases
+install_aliases()
+# pylint: enable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position,import-error,no-name-in-module
+
+# Standard lib imports
+import json
+import re
+import xml.etree.ElementTree as ET
+
+# name of the attribute XML CIM documents store the type of an element in
+_XSI_TYPE = "{http://www.w3.org/2001/XMLSchema-instance}type"
+
+# untyped XML elements with a name ending in ID (e.g. ServiceLayerID or WKID) and an integer value are read as integers
+_XML_INTEGER_NAME_PATTERN = re.compile(r"id$")
+_XML_INTEGER_VALUE_PATTERN = re.compile(r"^-?\d+$")
+
+# readers for XML elements with a primitive schema type, e.g. xsi:type="xs:double"
+_XML_PRIMITIVE_TYPES = {
+    "boolean": lambda text: text == "true",
+    "double": float,
+    "float": float,
+    "int": int,
+    "long": int,
+    "short": int,
+    "string": lambda text: text
+}
+
+
+class CimObject(object):
+    """An object read from a CIM document.
+
+    Properties are available as attributes, matched case-insensitively (documents name some properties differently to
+    the SDK, e.g. WKID in XML and wkid in JSON, for the SDK's Wkid).  As with the SDK, properties that aren't set in the
+    document are None.
+    """
+
+    _cim_type = None
+    _properties = None
+
+    def __init__(self, cim_type, properties):
+        self._cim_type = cim_type
+        self._properties = properties
+
+    def __getattr__(self, name):
+        # only called for attributes not found normally, CIM property names always start with an upper case letter
+        if not name[:1].isupper():
+            raise AttributeError("'{}' object has no attribute '{}'".format(self.__class__.__name__, name))
+
+        return self._properties.get(name.lower())
+
+    def __repr__(self):
+        return "<{} ({})>".format(self.__class__.__name__, self._cim_type)
+
+    @property
+    def cim_type(self):
+        """The CIM type of the object as named in the document, e.g. CIMFeatureLayer."""
+        return self._cim_type
+
+    @classmethod
+    def FromJson(cls, json_string):
+        """Reads an object of this class from a JSON CIM document."""
+        json_obj = json.loads(json_string.lstrip("\ufeff"))
+        return cls(json_obj.get("type"), _read_json_properties(json_obj))
+
+    @classmethod
+    def FromXml(cls, xml_string):
+        """Reads an object of this class from an XML CIM document."""
+        root = ET.fromstring(xml_string.lstrip("\ufeff"))
+        return cls(_get_xml_type(root) or root.tag, _read_xml_properties(root))
+
+
+class CIMFeatureLayer(CimObject):
+    pass
+
+
+class CIMFeatureMosaicSubLayer(CimObject):
+    pass
+
+
+class CIMGISProject(CimObject):
+    pass
+
+
+class CIMGroupLayer(CimObject):
+    pass
+
+
+class CIMImageMosaicSubLayer(CimObject):
+    pass
+
+
+class CIMMap(CimObject):
+    pass
+
+
+class CIMMosaicLayer(CimObject):
+    pass
+
+
+class CIMRasterLayer(CimObject):
+    pass
+
+
+class CIMStandaloneTable(CimObject):
+    pass
+
+
+class CIMTiledServiceLayer(CimObject):
+    pass
+
+
+class CIMVectorTileLayer(CimObject):
+    pass
+
+
+def _get_xml_type(element):
+    xml_type = element.get(_XSI_TYPE)
+
+    # strip the namespace prefix, e.g. typens:CIMFeatureLayer
+    return xml_type.split(":")[-1] if xml_type else None
+
+
+def _read_json_properties(json_obj):
+    return {k.lower(): _read_json_value(v) for k, v in json_obj.items() if k != "type"}
+
+
+def _read_json_value(value):
+    if isinstance(value, dict):
+        return CimObject(value.get("type"), _read_json_properties(value))
+
+    if isinstance(value, list):
+        return [_read_json_value(v) for v in value]
+
+    return value
+
+
+def _read_xml_properties(element):
+    return {child.tag.lower(): _read_xml_value(child) for child in element}
+
+
+def _read_xml_value(element):
+    xml_type = _get_xml_type(element)
+    xml_type_prefix = element.get(_XSI_TYPE, "").split(":")[0]
+
+    if xml_type and xml_type.startswith("ArrayOf"):
+        return [_read_xml_value(child) for child in element]
+
+    if xml_type and xml_type_prefix == "xs":
+        # primitive value
+        read_primitive = _XML_PRIMITIVE_TYPES.get(xml_type)
+        return read_primitive(element.text or "") if read_primitive else element.text
+
+    if xml_type or len(element):
+        return CimObject(xml_type or element.tag, _read_xml_properties(element))
+
+    # untyped value, the SDK would know the type from its schema, so infer booleans and IDs from the text and name
+    text = element.text or ""
+    if text in ("true", "false"):
+        return text == "true"
+
+    if _XML_INTEGER_NAME_PATTERN.search(element.tag.lower()) and _XML_INTEGER_VALUE_PATTERN.match(text):
+        return int(text)
+
+    return text
@@ -14,10 +14,14 @@ from future.utils import with_metaclass
 from abc import ABCMeta
 
 # Local imports
-from .helpers import passthrough_prop
+from .helpers import passthrough_prop, read_cim
 
 # .NET Imports
-from ArcGIS.Core.CIM import CIMStandaloneTable
+try:
+    from ArcGIS.Core.CIM import CIMStandaloneTable
+except ImportError:
+    # ArcGIS Pro SDK not available, fall back to the pure-Python CIM reader
+    from .pycim import CIMStandaloneTable
 
 
 class ProFieldDescription(object):
@@ -35,9 +39,7 @@ class ProFieldDescription(object):
 class ProDisplayTableBase(with_metaclass(ABCMeta, object)):
     _fields = None
 
-    def __init__(self, cim_obj):
-        self._cim_obj = cim_obj
-
+    data_connection = passthrough_prop("DataConnection")
     definition_query = passthrough_prop("DefinitionExpression")
 
     @property
@@ -53,18 +55,30 @@ class ProDisplayTableBase(with_metaclass(ABCMeta, object)):
 
 
 class ProFeatureTable(ProDisplayTableBase):
+
+    _cim_obj = None
+
     def __init__(self, cim_obj):
-        super().__init__(cim_obj)
+        self._cim_obj = cim_obj
 
 
 class ProStandaloneTable(ProDisplayTableBase):
-    def __init__(self, proj_zip, xml_string):
+    """A standalone table, which reads its CIM definition from the project only when it is first needed."""
+
+    _cim_cache = None
+    _proj_zip = None
+    _table_path = None
+
+    def __init__(self, proj_zip, table_path, cim_cache):
         self._proj_zip = proj_zip
-        try:
-            super().__init__(CIMStandaloneTable.FromXml(xml_string))
-        except AttributeError:
-            # probably JSON, attempt that
-            super().__init__(CIMStandaloneTable.FromJson(xml_string))
+        self._table_path = table_path
+        self._cim_cache = cim_cache
 
     name = passthrough_prop("Name")
-    service_id = passthrough_prop("ServiceTableID")
\ No newline at end of file
+    service_id = passthrough_prop("ServiceTableID")
+
+    @property
+    def _cim_obj(self):
+        return self._cim_cache.get(
+            self._table_path, lambda: read_cim(CIMStandaloneTable, self._proj_zip, self._table_path)
+        )
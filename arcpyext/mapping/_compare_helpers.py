@@ -16,6 +16,9 @@ try:
 except ImportError:
     from collections import Mapping, Sequence
 
+# the description keys that together identify the data source of a layer or table
+DATASOURCE_INFO_KEYS = ("workspacePath", "datasetName", "database", "server", "service")
+
 
 def dictionaries_eq(a, b):
     return set(iteritems(a)) == set(iteritems(b))
@@ -42,15 +45,39 @@ def lowercase_dict(d):
     return {k: process_value(v) for (k, v) in iteritems(d)}
 
 
+def create_datasource_key(layer_desc):
+    """Creates a hashable, case-insensitive key for the data source of a layer or table description.
+
+    Two descriptions have equal keys when their data source info dictionaries are equal ignoring case.
+    """
+    return tuple(str(layer_desc.get(k, "")).lower() for k in DATASOURCE_INFO_KEYS)
+
+
+def create_fields_signature(layer_desc):
+    """Creates a hashable signature of the visible fields (name and type) of a layer or table description."""
+    return tuple((f["name"], f["type"]) for f in layer_desc.get("fields") or [] if f["visible"])
+
+
+def get_datasource_key(layer_desc):
+    """Gets the data source key of a layer or table description, using the key precomputed by describe if present."""
+    key = layer_desc.get("datasourceKey")
+
+    # descriptions that have been round-tripped through JSON hold lists rather than tuples
+    return create_datasource_key(layer_desc) if key is None else tuple(key)
+
+
+def get_fields_signature(layer_desc):
+    """Gets the fields signature of a layer or table description, using the signature precomputed by describe if
+    present."""
+    signature = layer_desc.get("fieldsSignature")
+
+    # descriptions that have been round-tripped through JSON hold lists rather than tuples
+    return create_fields_signature(layer_desc) if signature is None else tuple(tuple(f) for f in signature)
+
+
 def get_datasource_info(layer_desc):
     # wrapped in str to ensure consistant type across source and Py versions
-    return {
-        "workspacePath": str(layer_desc.get("workspacePath", "")),
-        "datasetName": str(layer_desc.get("datasetName", "")),
-        "database": str(layer_desc.get("database", "")),
-        "server": str(layer_desc.get("server", "")),
-        "service": str(layer_desc.get("service", ""))
-    }
+    return {k: str(layer_desc.get(k, "")) for k in DATASOURCE_INFO_KEYS}
 
 
 def get_dict_subset(d, *keys):
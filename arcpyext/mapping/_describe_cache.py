@@ -0,0 +1,161 @@
+# coding=utf-8
+"""This module contains a persistent, on-disk cache for map document/project descriptions."""
+
+# Python 2/3 compatibility
+# pylint: disable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position,import-error,no-name-in-module
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+from future.builtins.disabled import *
+from future.builtins import *
+from future.standard_library import install_aliases
+install_aliases()
+# pylint: enable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position,import-error,no-name-in-module
+
+# Standard lib imports
+import hashlib
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+
+# Local imports
+from .._version import __version__
+
+# size of the blocks read when hashing a document
+_HASH_BLOCK_SIZE = 1024 * 1024
+
+
+class DescribeCache(object):
+    """A directory-based cache of map document/project descriptions.
+
+    Each description is stored against the path of the described file, along with a fingerprint of that file (size,
+    modification time and a SHA-256 hash of its contents).  A stored description is only returned while the file still
+    matches its fingerprint; a changed modification time alone (e.g. after a fresh checkout) is resolved by comparing
+    the content hash, so unchanged documents are still served from the cache.
+    """
+
+    _cache_dir = None
+
+    def __init__(self, cache_dir):
+        self._cache_dir = os.path.abspath(str(cache_dir))
+
+    @property
+    def cache_dir(self):
+        return self._cache_dir
+
+    def clear(self):
+        """Removes all stored descriptions from the cache."""
+        if not os.path.isdir(self._cache_dir):
+            return
+
+        for entry_name in os.listdir(self._cache_dir):
+            if entry_name.endswith(".json"):
+                os.remove(os.path.join(self._cache_dir, entry_name))
+
+    def get(self, file_path):
+        """Gets the stored description of a file, or None if there is no description or the file has changed."""
+        entry = self._read_entry(file_path)
+        if entry is None:
+            return None
+
+        stat = os.stat(file_path)
+        fingerprint = entry["fingerprint"]
+
+        if fingerprint["size"] != stat.st_size:
+            return None
+
+        if fingerprint["mtime"] != stat.st_mtime:
+            # file has been touched, check if the contents have actually changed
+            if fingerprint["sha256"] != _hash_file(file_path):
+                return None
+
+            # contents are the same, update the stored modification time to skip hashing next time
+            fingerprint["mtime"] = stat.st_mtime
+            self._write_entry(file_path, entry)
+
+        return entry["description"]
+
+    def put(self, file_path, description):
+        """Stores the description of a file."""
+        stat = os.stat(file_path)
+
+        self._write_entry(
+            file_path, {
+                "fingerprint": {
+                    "size": stat.st_size,
+                    "mtime": stat.st_mtime,
+                    "sha256": _hash_file(file_path)
+                },
+                "description": description
+            }
+        )
+
+    def _entry_path(self, file_path):
+        # entries are named by a hash of the normalised file path, and are kept separate across arcpyext versions and
+        # Python versions (which describe documents using different ArcGIS platforms)
+        key = "{}|{}|{}".format(
+            __version__, sys.version_info[0], os.path.normcase(os.path.abspath(str(file_path)))
+        )
+        return os.path.join(self._cache_dir, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+
+    def _read_entry(self, file_path):
+        entry_path = self._entry_path(file_path)
+
+        if not os.path.isfile(entry_path):
+            return None
+
+        try:
+            with io.open(entry_path, "r", encoding="utf-8") as entry_file:
+                return json.load(entry_file)
+        except ValueError:
+            # corrupt entry, treat as a cache miss
+            _get_logger().warning("Ignoring unreadable describe cache entry '%s'.", entry_path)
+            return None
+
+    def _write_entry(self, file_path, entry):
+        try:
+            entry_string = json.dumps(entry)
+        except TypeError:
+            # description can't be stored, don't fail the describe because of it
+            _get_logger().warning("Description of '%s' could not be stored in the describe cache.", file_path)
+            return
+
+        if not os.path.isdir(self._cache_dir):
+            os.makedirs(self._cache_dir)
+
+        # write to a temporary file and move it in to place, so concurrent readers never see a partial entry
+        entry_path = self._entry_path(file_path)
+        temp_handle, temp_path = tempfile.mkstemp(suffix=".tmp", dir=self._cache_dir)
+        try:
+            with io.open(temp_handle, "w", encoding="utf-8") as temp_file:
+                temp_file.write(str(entry_string))
+            _replace_file(temp_path, entry_path)
+        except:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+
+def _get_logger():
+    return logging.getLogger("arcpyext.mapping")
+
+
+def _hash_file(file_path):
+    file_hash = hashlib.sha256()
+
+    with io.open(file_path, "rb") as file_handle:
+        for block in iter(lambda: file_handle.read(_HASH_BLOCK_SIZE), b""):
+            file_hash.update(block)
+
+    return file_hash.hexdigest()
+
+
+def _replace_file(src, dst):
+    if hasattr(os, "replace"):
+        os.replace(src, dst)
+    else:
+        # Python 2, rename won't overwrite on Windows
+        if os.path.exists(dst):
+            os.remove(dst)
+        os.rename(src, dst)
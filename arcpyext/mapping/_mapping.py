@@ -15,15 +15,19 @@ from future.utils import iteritems
 # Standard library imports
 import sys
 
+from functools import partial
+
 try:
     from collections.abc import Mapping
 except ImportError:
     from collections import Mapping
 
 # Local imports
-from ._compare_helpers import lowercase_dict
+from ._compare_helpers import create_datasource_key, create_fields_signature, lowercase_dict
+from ._describe_cache import DescribeCache
 from ._mapping_helpers import tokenise_datasource
 from .compare_types import *
+from .._multiprocessing import imap_unordered
 from ..exceptions import MapLayerError, ChangeDataSourcesError
 
 # Python-version dependent imports
@@ -143,6 +147,9 @@ def create_replacement_data_sources_list(mxd_proj_or_desc, data_source_templates
         ) for template in data_source_templates
     ] #yapf: disable
 
+    # only the description keys used by match criteria take part in matching, so only those need to be frozen
+    criteria_keys = set(key for template in template_sets for key, _ in template["matchCriteria"])
+
     # freeze values in dict for set comparison
     def freeze(d):
         """Freezes dicts and lists for set comparison."""
@@ -154,6 +161,10 @@ def create_replacement_data_sources_list(mxd_proj_or_desc, data_source_templates
             return tuple(freeze(value) for value in d)
         return d
 
+    def freeze_criteria_values(layer_or_table):
+        """Freezes the values of a layer/table description that can be matched against, once per layer/table."""
+        return freeze({key: value for key, value in iteritems(layer_or_table) if key in criteria_keys})
+
     def match_new_data_source(layer_or_table):
         logger = _get_logger()
 
@@ -164,9 +175,12 @@ def create_replacement_data_sources_list(mxd_proj_or_desc, data_source_templates
             return None
 
         new_conn = None
+
+        # The layer_or_table variable contains properties that can't be put into sets without freezing
+        frozen_layer_or_table = freeze_criteria_values(layer_or_table)
+
         for template in template_sets:
-            # The layer_or_table variable contains properties that can't be put into sets without freezing
-            if template["matchCriteria"].issubset(set(freeze(layer_or_table))):
+            if template["matchCriteria"].issubset(frozen_layer_or_table):
                 new_conn = template["dataSource"].copy()
 
                 # Test #2: If the target workspace is a collection of workspaces, infer the target child workspace by using a
@@ -217,7 +231,7 @@ def create_replacement_data_sources_list(mxd_proj_or_desc, data_source_templates
         }
 
 
-def describe(mxd_or_proj):
+def describe(mxd_or_proj, cache=None):
     """
     Describe a Map Document, ArcGIS Pro project or ArcGIS Pro Layer file.
 
@@ -225,6 +239,8 @@ def describe(mxd_or_proj):
 
     :param mxd_proj_or_desc: The map to be validated
     :type mxd_proj_or_desc: arcpy.mapping.MapDocument/arcpy.mapping.ArcGISProject (Python-version dependent) or str (file path)
+    :param cache: An optional cache of descriptions, used to skip re-describing documents that haven't changed on disk
+    :type cache: DescribeCache or str (path to a cache directory)
     :returns: dict describing the object
     """
 
@@ -232,14 +248,50 @@ def describe(mxd_or_proj):
         isinstance(mxd_or_proj, Document) or isinstance(mxd_or_proj, LayerFile)
     ) else mxd_or_proj
 
+    if cache is not None and not isinstance(cache, DescribeCache):
+        cache = DescribeCache(cache)
+
+    if cache is not None:
+        description = cache.get(file_path)
+        if description is not None:
+            _get_logger().debug("Description of '%s' retrieved from describe cache.", file_path)
+            return description
+
     _, file_ext = os.path.splitext(file_path)
     if file_ext.lower() in (".mxd", ".aprx"):
-        return _mh._describe_map(file_path)
+        description = _mh._describe_map(file_path)
     else:
         if ARCPY_2:
             raise NotImplementedError("Describing a layer file is not supported on ArcGIS Desktop.")
 
-        return _mh._describe_layer_file(file_path)
+        description = _mh._describe_layer_file(file_path)
+
+    _add_compare_keys(description)
+
+    if cache is not None:
+        cache.put(file_path, description)
+
+    return description
+
+
+def describe_many(mxd_or_proj_paths, max_workers=None, cache=None):
+    """
+    Describe many Map Documents, ArcGIS Pro projects and/or ArcGIS Pro Layer files in parallel.
+
+    Documents are spread across a pool of worker processes, each with its own arcpy session.  Descriptions are yielded
+    as each document is described, which is not necessarily the order the paths were given in.  When called from a
+    script, the call must be guarded by ``if __name__ == "__main__":`` so worker processes can be started on Windows.
+
+    :param mxd_or_proj_paths: The paths of the documents to describe
+    :type mxd_or_proj_paths: iterable of str
+    :param max_workers: The maximum number of worker processes, defaults to the number of CPUs
+    :type max_workers: int
+    :param cache: An optional cache of descriptions, passed through to describe
+    :type cache: DescribeCache or str (path to a cache directory)
+    :returns: generator of (path, description, error) tuples, where error is None if the document was described, or an
+              (exception, traceback string) tuple if describing it failed
+    """
+    return imap_unordered(partial(describe, cache=cache), mxd_or_proj_paths, max_workers)
 
 
 def is_valid(mxd_proj_or_desc):
@@ -276,6 +328,33 @@ def is_valid(mxd_proj_or_desc):
     return True
 
 
+def validate_many(mxd_or_proj_paths, max_workers=None, cache=None):
+    """
+    Analyse many Map Documents and/or ArcGIS Pro Projects for broken layers in parallel.
+
+    Behaves as describe_many, with each result being the boolean returned by is_valid rather than a description.
+
+    :returns: generator of (path, is_valid, error) tuples, where error is None if the document was validated, or an
+              (exception, traceback string) tuple if validating it failed
+    """
+    return imap_unordered(partial(_validate_document, cache=cache), mxd_or_proj_paths, max_workers)
+
+
+def _add_compare_keys(description):
+    """Adds the precomputed data source key and fields signature to each layer and table in a description, so that
+    comparisons and matching don't have to rebuild them."""
+
+    maps = description["maps"] if "maps" in description else [description]
+
+    for m in maps:
+        for layer_or_table in chain(m["layers"], m["tables"]):
+            if layer_or_table is None:
+                continue
+
+            layer_or_table["datasourceKey"] = create_datasource_key(layer_or_table)
+            layer_or_table["fieldsSignature"] = create_fields_signature(layer_or_table)
+
+
 def _attr_shallow_eq(a, b, attr_key):
     return b[attr_key] == a[attr_key] if attr_key in a and attr_key in b else False
 
@@ -374,7 +453,19 @@ def _match_layers(was_layers, now_layers):
     
     To correlate a layer in map a and map b, we run a series of specificity tests. Tests are ordered from most 
     specific, to least specific. These tests apply a process of elimination methodology to correlate layers between 
-    the two maps
+    the two maps:
+
+     1. same id/name and datasource (unchanged)
+     2. same name and id, datasource changed
+     3. same id and datasource, name changed
+     4. same id (assumed valid if fixed data sources enabled)
+     5. same name and datasource, id changed
+     6. same name, id/datasource changed
+
+    Tests 2 to 6 only apply to layers that haven't already been resolved, so together they reduce to "an unresolved
+    layer with the same id or the same name". Rather than running every test against every pair of layers, the 'was'
+    layers are indexed once by (id, name, datasource), by id and by name, and each 'now' layer is matched to the
+    first 'was' layer (in map order) found through those indexes.
     """
 
     added = []
@@ -383,65 +474,67 @@ def _match_layers(was_layers, now_layers):
     resolved_was = {}
     resolved_now = {}
     is_resolved_was = lambda x: x['index'] in resolved_was
-    is_resolved_now = lambda x: x['index'] in resolved_now
-    same_id = lambda a, b: _attr_shallow_eq(a, b, 'serviceId')
-    same_name = lambda a, b: _attr_shallow_eq(a, b, 'name')
-    same_datasource = lambda a, b: dictionaries_eq_ignore_case(get_datasource_info(a), get_datasource_info(b))
-
-    tests = [
-        {
-            # same id/name and datasource. Unchanged
-            'fn': lambda a, b: b if same_id(a, b) and same_name(a, b) and same_datasource(a, b) else None,
-            'ignore': True
-        },
-        {
-            # same name and id, datasource changed
-            'fn': lambda a, b: b
-            if same_id(a, b) and same_name(a, b) and not is_resolved_was(a) and not is_resolved_now(b) else None
-        },
-        {
-            # same id and datasource, name changed
-            'fn': lambda a, b: b
-            if same_id(a, b) and same_datasource(a, b) and not is_resolved_was(a) and not is_resolved_now(b) else None
-        },
-        {
-            # same id. Assumed valid if fixed data sources enabled
-            # TODO this should be skipped if we can verify that fixed layer IDs are not used
-            'fn': lambda a, b: b if same_id(a, b) and not is_resolved_was(a) and not is_resolved_now(b) else None
-        },
-        {
-            # same name and datasource, id changed
-            'fn': lambda a, b: b
-            if same_name(a, b) and same_datasource(a, b) and not is_resolved_was(a) and not is_resolved_now(b) else None
-        },
-        {
-            # same name, id/datasource changed
-            'fn': lambda a, b: b if same_name(a, b) and not is_resolved_was(a) and not is_resolved_now(b) else None
-        }
-    ]
 
-    def test_if_matching_layer(was_layer, now_layer):
-        for test in tests:
-            matcher = test['fn']
-            match = matcher(was_layer, now_layer)
-            if match is not None:
-                return True
+    # index 'was' layer positions by each of the keys used for matching, positions are kept in map order
+    exact_index = {}
+    id_index = {}
+    name_index = {}
+    for position, was_layer in enumerate(was_layers):
+        if 'serviceId' in was_layer:
+            id_index.setdefault(was_layer['serviceId'], []).append(position)
+        if 'name' in was_layer:
+            name_index.setdefault(was_layer['name'], []).append(position)
+        if 'serviceId' in was_layer and 'name' in was_layer:
+            exact_key = (was_layer['serviceId'], was_layer['name'], get_datasource_key(was_layer))
+            exact_index.setdefault(exact_key, []).append(position)
+
+    # layers only ever become resolved, so the search through each partial index can resume where it last stopped
+    id_cursors = {}
+    name_cursors = {}
+
+    def first_unresolved(index, cursors, key):
+        positions = index.get(key)
+        if not positions:
+            return None
 
-        return False
+        cursor = cursors.get(key, 0)
+        while cursor < len(positions) and is_resolved_was(was_layers[positions[cursor]]):
+            cursor += 1
+        cursors[key] = cursor
 
-    for now_layer in now_layers:
-        found = False
+        return positions[cursor] if cursor < len(positions) else None
 
+    def find_matching_layer(now_layer):
+        candidates = []
+
+        # same id/name and datasource, matches regardless of whether the 'was' layer has been resolved
+        if 'serviceId' in now_layer and 'name' in now_layer:
+            exact_positions = exact_index.get(
+                (now_layer['serviceId'], now_layer['name'], get_datasource_key(now_layer))
+            )
+            if exact_positions:
+                candidates.append(exact_positions[0])
+
+        # same id or same name, the 'was' and 'now' layers must both be unresolved
+        if not now_layer['index'] in resolved_now:
+            if 'serviceId' in now_layer:
+                candidates.append(first_unresolved(id_index, id_cursors, now_layer['serviceId']))
+            if 'name' in now_layer:
+                candidates.append(first_unresolved(name_index, name_cursors, now_layer['name']))
+
+        candidates = [c for c in candidates if c is not None]
+
+        return was_layers[min(candidates)] if candidates else None
+
+    for now_layer in now_layers:
         # Find A layer that correlates to B layer
-        for was_layer in was_layers:
-            found = test_if_matching_layer(was_layer, now_layer)
-            if found:
-                resolved_was[was_layer['index']] = now_layer
-                resolved_now[now_layer['index']] = was_layer
-                break
+        was_layer = find_matching_layer(now_layer)
 
-        # Added layers
-        if found is False:
+        if was_layer is not None:
+            resolved_was[was_layer['index']] = now_layer
+            resolved_now[now_layer['index']] = was_layer
+        else:
+            # Added layers
             resolved_now[now_layer['index']] = None
             added.append(now_layer)
 
@@ -470,3 +563,7 @@ def _recursive_sort(obj):
         return sorted(_recursive_sort(x) for x in obj)
     else:
         return obj
+
+
+def _validate_document(mxd_or_proj_path, cache=None):
+    return is_valid(describe(mxd_or_proj_path, cache=cache))
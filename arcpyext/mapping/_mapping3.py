@@ -11,15 +11,20 @@ install_aliases()
 # pylint: enable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position
 
 # Standard lib imports
+import io
 import logging
 import json
 import os.path
 import shutil
+import struct
 import tempfile
+import time
 import xml.etree.ElementTree as ET
 import zipfile
 
 from decimal import Decimal
+from functools import partial
+from xml.sax.saxutils import escape as xml_escape
 from pathlib2 import Path
 try:
     from collections.abc import Mapping
@@ -35,17 +40,72 @@ from ._cim import ProProject
 from ._cim.layers import ProVectorTileLayer
 from ._mapping_helpers import tokenise_table_name
 from .. import _native as _prosdk
+from .._multiprocessing import imap_unordered
 from .._utils import get_arcgis_version
 from .._patches._mp._cim_helpers import is_query_layer
 from .._str import eformat, format_def_query
 from ..exceptions import DataSourceUpdateError
 
+# size of the blocks used when copying raw zip entry data
+_ZIP_COPY_BLOCK_SIZE = 1024 * 1024
+
+# general purpose flag bits of a zip entry, see the PKWARE APPNOTE
+_ZIP_FLAG_ENCRYPTED = 0x01
+_ZIP_FLAG_DATA_DESCRIPTOR = 0x08
+
+# positions of the file name and extra field lengths in a zip local file header
+_ZIP_FH_FILENAME_LENGTH = 10
+_ZIP_FH_EXTRA_FIELD_LENGTH = 11
+
+# zipfile internals that raw copies of zip entries rely on, of the zipfile module, and of source and target ZipFiles
+_ZIP_RAW_COPY_MODULE_ATTRIBUTES = ("structFileHeader", "sizeFileHeader")
+_ZIP_RAW_COPY_SOURCE_ATTRIBUTES = ("fp", )
+_ZIP_RAW_COPY_TARGET_ATTRIBUTES = ("fp", "filelist", "NameToInfo", "start_dir")
+
+# datum transform changes by the version level that they changed at
+# in other words, if the file is older than that, proceed:
+_DATUM_TRANSFORM_FIXES = [
+    {
+        "version": Decimal(3),
+        "transformFixes": [
+            {
+                "currentWkt": 'GEOGTRAN["GDA_1994_To_GDA2020_1",GEOGCS["GCS_GDA_1994",DATUM["D_GDA_1994",SPHEROID["GRS_1980",6378137.0,298.257222101]],PRIMEM["Greenwich",0.0],UNIT["Degree",0.0174532925199433]],GEOGCS["GDA2020",DATUM["GDA2020",SPHEROID["GRS_1980",6378137.0,298.257222101]],PRIMEM["Greenwich",0.0],UNIT["Degree",0.0174532925199433]],METHOD["Coordinate_Frame"],PARAMETER["X_Axis_Translation",0.06155],PARAMETER["Y_Axis_Translation",-0.01087],PARAMETER["Z_Axis_Translation",-0.04019],PARAMETER["X_Axis_Rotation",-0.0394924],PARAMETER["Y_Axis_Rotation",-0.0327221],PARAMETER["Z_Axis_Rotation",-0.0328979],PARAMETER["Scale_Difference",-0.009994],OPERATIONACCURACY[0.01],AUTHORITY["EPSG",8048]]',
+                "currentWkid": "8048",
+                "name": "GDA_1994_To_GDA2020_1",
+                "oldWkt": 'GEOGTRAN["GDA_1994_To_GDA2020_1",GEOGCS["GCS_GDA_1994",DATUM["D_GDA_1994",SPHEROID["GRS_1980",6378137.0,298.257222101]],PRIMEM["Greenwich",0.0],UNIT["Degree",0.0174532925199433]],GEOGCS["GDA2020",DATUM["GDA2020",SPHEROID["GRS_1980",6378137.0,298.257222101]],PRIMEM["Greenwich",0.0],UNIT["Degree",0.0174532925199433]],METHOD["Coordinate_Frame"],PARAMETER["X_Axis_Translation",0.06155],PARAMETER["Y_Axis_Translation",-0.01087],PARAMETER["Z_Axis_Translation",-0.04019],PARAMETER["X_Axis_Rotation",-0.0394924],PARAMETER["Y_Axis_Rotation",-0.0327221],PARAMETER["Z_Axis_Rotation",-0.0328979],PARAMETER["Scale_Difference",-0.009994],OPERATIONACCURACY[0.01],AUTHORITY["EPSG",108060]]',
+                "oldWkid": "108060"
+            }, {
+                "currentWkt": 'GEOGTRAN["GDA_1994_To_GDA2020_NTv2_3_Conformal",GEOGCS["GCS_GDA_1994",DATUM["D_GDA_1994",SPHEROID["GRS_1980",6378137.0,298.257222101]],PRIMEM["Greenwich",0.0],UNIT["Degree",0.0174532925199433]],GEOGCS["GDA2020",DATUM["GDA2020",SPHEROID["GRS_1980",6378137.0,298.257222101]],PRIMEM["Greenwich",0.0],UNIT["Degree",0.0174532925199433]],METHOD["NTv2"],PARAMETER["Dataset_australia/GDA94_GDA2020_conformal",0.0],OPERATIONACCURACY[0.05],AUTHORITY["EPSG",8446]]',
+                "currentWkid": "8446",
+                "name": "GDA_1994_To_GDA2020_NTv2_3_Conformal",
+                "oldWkt": 'GEOGTRAN["GDA_1994_To_GDA2020_NTv2_3_Conformal",GEOGCS["GCS_GDA_1994",DATUM["D_GDA_1994",SPHEROID["GRS_1980",6378137.0,298.257222101]],PRIMEM["Greenwich",0.0],UNIT["Degree",0.0174532925199433]],GEOGCS["GDA2020",DATUM["GDA2020",SPHEROID["GRS_1980",6378137.0,298.257222101]],PRIMEM["Greenwich",0.0],UNIT["Degree",0.0174532925199433]],METHOD["NTv2"],PARAMETER["Dataset_australia/GDA94_GDA2020_conformal",0.0],OPERATIONACCURACY[0.05],AUTHORITY["EPSG",108446]]',
+                "oldWkid": "108446"
+            }, {
+                "currentWkt": 'GEOGTRAN["GDA_1994_To_GDA2020_NTv2_2_Conformal_and_Distortion",GEOGCS["GCS_GDA_1994",DATUM["D_GDA_1994",SPHEROID["GRS_1980",6378137.0,298.257222101]],PRIMEM["Greenwich",0.0],UNIT["Degree",0.0174532925199433]],GEOGCS["GDA2020",DATUM["GDA2020",SPHEROID["GRS_1980",6378137.0,298.257222101]],PRIMEM["Greenwich",0.0],UNIT["Degree",0.0174532925199433]],METHOD["NTv2"],PARAMETER["Dataset_australia/GDA94_GDA2020_conformal_and_distortion",0.0],OPERATIONACCURACY[0.05],AUTHORITY["EPSG",8447]]',
+                "currentWkid": "8447",
+                "name": "GDA_1994_To_GDA2020_NTv2_2_Conformal_and_Distortion",
+                "oldWkt": 'GEOGTRAN["GDA_1994_To_GDA2020_NTv2_2_Conformal_and_Distortion",GEOGCS["GCS_GDA_1994",DATUM["D_GDA_1994",SPHEROID["GRS_1980",6378137.0,298.257222101]],PRIMEM["Greenwich",0.0],UNIT["Degree",0.0174532925199433]],GEOGCS["GDA2020",DATUM["GDA2020",SPHEROID["GRS_1980",6378137.0,298.257222101]],PRIMEM["Greenwich",0.0],UNIT["Degree",0.0174532925199433]],METHOD["NTv2"],PARAMETER["Dataset_australia/GDA94_GDA2020_conformal_and_distortion",0.0],OPERATIONACCURACY[0.05],AUTHORITY["EPSG",108447]]',
+                "oldWkid": "108447"
+            }
+        ]
+    }
+]
+
+# the datum transform changes compiled in to lookups by current WKT and by name
+_DATUM_TRANSFORM_LOOKUPS = [
+    {
+        "version": tf["version"],
+        "byWkt": {fix_info["currentWkt"]: fix_info for fix_info in tf["transformFixes"]},
+        "byName": {fix_info["name"]: fix_info for fix_info in tf["transformFixes"]}
+    } for tf in _DATUM_TRANSFORM_FIXES
+]
+
 # Put the map document class here so we can access the per-version type in a consistent location across Python versions
 Document = arcpy.mp.ArcGISProject
 LayerFile = arcpy.mp.LayerFile
 
 
-def fix_datum_transforms(arc_file):
+def fix_datum_transforms(arc_file, dry_run=False):
     """For various ArcGIS-type files (currently APRX and MAPX), 'fix' datum transform information so that it is 
     compatible for the document version by re-writing datum transformation information.
 
@@ -56,168 +116,78 @@ def fix_datum_transforms(arc_file):
 
     Args:
         arc_file (str|Path): The ArcGIS file to operate on.
+        dry_run (bool): If True, count the transforms that would be fixed without changing the file.
+
+    Returns:
+        int: The number of datum transforms fixed (or that would be fixed, for a dry run).
     """
 
     # treat file as Path
     arc_file = Path(str(arc_file))
 
-    # store datum transform changes by version level that they changed at
-    # in other words, if the file is older than that, proceed:
-    transforms_to_fix = [
-        {
-            "version": Decimal(3),
-            "transformFixes": [
-                {
-                    "currentWkt": 'GEOGTRAN["GDA_1994_To_GDA2020_1",GEOGCS["GCS_GDA_1994",DATUM["D_GDA_1994",SPHEROID["GRS_1980",6378137.0,298.257222101]],PRIMEM["Greenwich",0.0],UNIT["Degree",0.0174532925199433]],GEOGCS["GDA2020",DATUM["GDA2020",SPHEROID["GRS_1980",6378137.0,298.257222101]],PRIMEM["Greenwich",0.0],UNIT["Degree",0.0174532925199433]],METHOD["Coordinate_Frame"],PARAMETER["X_Axis_Translation",0.06155],PARAMETER["Y_Axis_Translation",-0.01087],PARAMETER["Z_Axis_Translation",-0.04019],PARAMETER["X_Axis_Rotation",-0.0394924],PARAMETER["Y_Axis_Rotation",-0.0327221],PARAMETER["Z_Axis_Rotation",-0.0328979],PARAMETER["Scale_Difference",-0.009994],OPERATIONACCURACY[0.01],AUTHORITY["EPSG",8048]]',
-                    "currentWkid": "8048",
-                    "name": "GDA_1994_To_GDA2020_1",
-                    "oldWkt": 'GEOGTRAN["GDA_1994_To_GDA2020_1",GEOGCS["GCS_GDA_1994",DATUM["D_GDA_1994",SPHEROID["GRS_1980",6378137.0,298.257222101]],PRIMEM["Greenwich",0.0],UNIT["Degree",0.0174532925199433]],GEOGCS["GDA2020",DATUM["GDA2020",SPHEROID["GRS_1980",6378137.0,298.257222101]],PRIMEM["Greenwich",0.0],UNIT["Degree",0.0174532925199433]],METHOD["Coordinate_Frame"],PARAMETER["X_Axis_Translation",0.06155],PARAMETER["Y_Axis_Translation",-0.01087],PARAMETER["Z_Axis_Translation",-0.04019],PARAMETER["X_Axis_Rotation",-0.0394924],PARAMETER["Y_Axis_Rotation",-0.0327221],PARAMETER["Z_Axis_Rotation",-0.0328979],PARAMETER["Scale_Difference",-0.009994],OPERATIONACCURACY[0.01],AUTHORITY["EPSG",108060]]',
-                    "oldWkid": "108060"
-                }, {
-                    "currentWkt": 'GEOGTRAN["GDA_1994_To_GDA2020_NTv2_3_Conformal",GEOGCS["GCS_GDA_1994",DATUM["D_GDA_1994",SPHEROID["GRS_1980",6378137.0,298.257222101]],PRIMEM["Greenwich",0.0],UNIT["Degree",0.0174532925199433]],GEOGCS["GDA2020",DATUM["GDA2020",SPHEROID["GRS_1980",6378137.0,298.257222101]],PRIMEM["Greenwich",0.0],UNIT["Degree",0.0174532925199433]],METHOD["NTv2"],PARAMETER["Dataset_australia/GDA94_GDA2020_conformal",0.0],OPERATIONACCURACY[0.05],AUTHORITY["EPSG",8446]]',
-                    "currentWkid": "8446",
-                    "name": "GDA_1994_To_GDA2020_NTv2_3_Conformal",
-                    "oldWkt": 'GEOGTRAN["GDA_1994_To_GDA2020_NTv2_3_Conformal",GEOGCS["GCS_GDA_1994",DATUM["D_GDA_1994",SPHEROID["GRS_1980",6378137.0,298.257222101]],PRIMEM["Greenwich",0.0],UNIT["Degree",0.0174532925199433]],GEOGCS["GDA2020",DATUM["GDA2020",SPHEROID["GRS_1980",6378137.0,298.257222101]],PRIMEM["Greenwich",0.0],UNIT["Degree",0.0174532925199433]],METHOD["NTv2"],PARAMETER["Dataset_australia/GDA94_GDA2020_conformal",0.0],OPERATIONACCURACY[0.05],AUTHORITY["EPSG",108446]]',
-                    "oldWkid": "108446"
-                }, {
-                    "currentWkt": 'GEOGTRAN["GDA_1994_To_GDA2020_NTv2_2_Conformal_and_Distortion",GEOGCS["GCS_GDA_1994",DATUM["D_GDA_1994",SPHEROID["GRS_1980",6378137.0,298.257222101]],PRIMEM["Greenwich",0.0],UNIT["Degree",0.0174532925199433]],GEOGCS["GDA2020",DATUM["GDA2020",SPHEROID["GRS_1980",6378137.0,298.257222101]],PRIMEM["Greenwich",0.0],UNIT["Degree",0.0174532925199433]],METHOD["NTv2"],PARAMETER["Dataset_australia/GDA94_GDA2020_conformal_and_distortion",0.0],OPERATIONACCURACY[0.05],AUTHORITY["EPSG",8447]]',
-                    "currentWkid": "8447",
-                    "name": "GDA_1994_To_GDA2020_NTv2_2_Conformal_and_Distortion",
-                    "oldWkt": 'GEOGTRAN["GDA_1994_To_GDA2020_NTv2_2_Conformal_and_Distortion",GEOGCS["GCS_GDA_1994",DATUM["D_GDA_1994",SPHEROID["GRS_1980",6378137.0,298.257222101]],PRIMEM["Greenwich",0.0],UNIT["Degree",0.0174532925199433]],GEOGCS["GDA2020",DATUM["GDA2020",SPHEROID["GRS_1980",6378137.0,298.257222101]],PRIMEM["Greenwich",0.0],UNIT["Degree",0.0174532925199433]],METHOD["NTv2"],PARAMETER["Dataset_australia/GDA94_GDA2020_conformal_and_distortion",0.0],OPERATIONACCURACY[0.05],AUTHORITY["EPSG",108447]]',
-                    "oldWkid": "108447"
-                }
-            ]
-        }
-    ]
-
-    def register_xml_namespaces(filename):
-        namespaces = dict([node for _, node in ET.iterparse(filename, events=['start-ns'])])
-        for ns in namespaces:
-            ET.register_namespace(ns, namespaces[ns])
-        return namespaces
-
     if arc_file.suffix.lower() == ".aprx":
         # process as ArcGIS Project
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_dir_path = Path(temp_dir)
-
-            # extract contents to temporary directory
-            shutil.unpack_archive(str(arc_file), str(temp_dir), format="zip")
-
-            # check version of the archive to see whether we need to process
-            doc_info_xml_tree = ET.parse(str(temp_dir_path / "DocumentInfo.xml"))
-            doc_version = Decimal(".".join(doc_info_xml_tree.find("./Version").text.split(".")[:2]))
-
-            # track if the project has changed
-            project_made_changes = False
-
-            for tf in transforms_to_fix:
-                if not doc_version < tf["version"]:
-                    # set of changes doesn't apply to this version
-                    continue
-
-                # process this APRX against this set of transform changes
-
-                # get paths to all maps in the project
-                gis_project_xml_tree = ET.parse(str(temp_dir_path / "GISProject.xml"))
-                project_items_xpath = "./ProjectItems/CIMProjectItem"
-                project_items = gis_project_xml_tree.findall(project_items_xpath)
-                map_project_items = [pi for pi in project_items if pi.find("./ItemType").text == "Map"]
-                map_paths = [pi.find("./CatalogPath").text.replace("CIMPATH=", "") for pi in map_project_items]
-
-                # for each map, check if the datum transforms need winding back
-                for map_path in map_paths:
-                    # track whether changes were made to the map
-                    map_made_changes = False
-
-                    # parse the map file, get the datum transforms
-                    map_xml_path = str(temp_dir_path / map_path)
-                    map_xml_namespaces = register_xml_namespaces(map_xml_path)
-                    map_xml_tree = ET.parse(map_xml_path)
-                    datum_transforms = map_xml_tree.findall("./DatumTransforms/CIMDatumTransform")
-
-                    # for each datum transform, compare current WKT to check if we need to wind back
-                    for dt in datum_transforms:
-                        transformation_items = dt.findall("./GeoTransformation/XForms/TransformationItem")
-                        for ti in transformation_items:
-                            transform = ti.find("./XForm")
-                            if transform == None:
-                                continue
-
-                            wkt_element = transform.find("./WKT")
-                            if wkt_element == None:
-                                continue
-
-                            wkt = wkt_element.text.strip()
-
-                            for fix_info in tf["transformFixes"]:
-                                if not wkt == fix_info["currentWkt"]:
-                                    continue
-
-                                # fix the transform
-                                wkt_element.text = fix_info["oldWkt"]
-                                wkid_element = transform.find("./WKID")
-                                wkid_element.text = fix_info["oldWkid"]
-                                map_made_changes = True
-
-                    if map_made_changes:
-                        # save the map back out
-                        # ensure all the original attributes are written out on the root
-                        map_xml_root = map_xml_tree.getroot()
-                        existing_uris = [k.split('}')[0].strip('{') for k in map_xml_root.keys()]
-                        for prefix, uri in map_xml_namespaces.items():
-                            if not uri in existing_uris:
-                                tag = f"xmlns:{prefix}" if prefix else "xmlns"
-                                map_xml_root.set(tag, uri)
-
-                        map_xml_tree.write(str(temp_dir_path / map_path), encoding="UTF-8")
-                        # with (temp_dir_path / map_path).open("w") as output_file_handle:
-                        #     output_file_handle.write(ET.tostring(map_xml_tree.getroot(), encoding="unicode"))
-                        # note that we made changes to the project
-                        project_made_changes = True
-
-            if project_made_changes:
-                # need to zip the APRX back up
-                with zipfile.ZipFile(
-                    str(arc_file), "w", compression=zipfile.ZIP_DEFLATED, allowZip64=True
-                ) as output_file_handle:
-                    # glob the input extracted directory
-                    files_to_archive = temp_dir_path.glob("**/*")
-                    for f in files_to_archive:
-                        if not f.is_dir():
-                            # write file in zip to relative path
-                            output_file_handle.write(f, f.relative_to(temp_dir_path))
+        return _fix_aprx_datum_transforms(arc_file, dry_run)
 
     elif arc_file.suffix.lower() == ".mapx":
-        mapx_modified = False
+        changes = 0
 
         # get the version of the map
         map_json = json.loads(arc_file.read_text(encoding="utf-8"))
         doc_version = Decimal(".".join(map_json["version"].split(".")[:2]))
 
-        for tf in transforms_to_fix:
-            if not doc_version < tf["version"]:
-                # set of changes doesn't apply to this version
-                continue
-
-            # process this MAPX against this set of transform fixes
-
-            datum_transforms = map_json.get("mapDefinition", {}).get("datumTransforms", [])
-            for dt in datum_transforms:
-                geo_transforms = dt.get("geoTransformation", {}).get("geoTransforms", [])
-                for gt in geo_transforms:
-                    for fix_info in tf["transformFixes"]:
-                        if str(gt.get("name")) == fix_info["name"]:
-                            gt["latestWkid"] = int(fix_info["oldWkid"])
-                            gt["wkid"] = int(fix_info["oldWkid"])
-                            mapx_modified = True
-
-        if mapx_modified:
+        _, fixes_by_name = _get_datum_transform_fixes(doc_version)
+        if not fixes_by_name:
+            # no set of changes applies to this version
+            return changes
+
+        datum_transforms = map_json.get("mapDefinition", {}).get("datumTransforms", [])
+        for dt in datum_transforms:
+            geo_transforms = dt.get("geoTransformation", {}).get("geoTransforms", [])
+            for gt in geo_transforms:
+                fix_info = fixes_by_name.get(str(gt.get("name")))
+                if fix_info is not None:
+                    gt["latestWkid"] = int(fix_info["oldWkid"])
+                    gt["wkid"] = int(fix_info["oldWkid"])
+                    changes += 1
+
+        if changes and not dry_run:
             with arc_file.open("w", encoding="utf-8") as output_file_handle:
                 output_file_handle.write(
                     json.dumps(map_json, sort_keys=True, indent=4, separators=(',', ': '), ensure_ascii=False)
                 )
 
+        return changes
+
+    return 0
+
+
+def fix_datum_transforms_many(directory, max_workers=None, dry_run=False):
+    """Fix the datum transforms of every APRX and MAPX file in a directory tree, in parallel.
+
+    Files are spread across a pool of worker processes, with results yielded as each file is processed.  When called
+    from a script, the call must be guarded by ``if __name__ == "__main__":`` so worker processes can be started on
+    Windows.
+
+    Args:
+        directory (str|Path): The directory to search (recursively) for files to fix.
+        max_workers (int): The maximum number of worker processes, defaults to the number of CPUs.
+        dry_run (bool): If True, report the transforms that would be fixed without changing any files.
+
+    Returns:
+        generator of (path, report, error) tuples, where report is a dictionary with the number of transforms fixed
+        ("changes") and the time taken in seconds ("seconds"), and error is None if the file was processed, or an
+        (exception, traceback string) tuple if it failed.
+    """
+
+    arc_file_paths = []
+    for dir_path, _, file_names in os.walk(str(directory)):
+        for file_name in sorted(file_names):
+            if os.path.splitext(file_name)[1].lower() in (".aprx", ".mapx"):
+                arc_file_paths.append(os.path.join(dir_path, file_name))
+
+    return imap_unordered(partial(_timed_fix_datum_transforms, dry_run=dry_run), arc_file_paths, max_workers)
+
 
 def open_document(project):
     """Open an ArcGIS Pro Project or ArcGIS Pro Layer File from a given path.
@@ -378,6 +348,75 @@ def _change_data_source(layer, new_props):
         raise DataSourceUpdateError("Layer is now broken.", layer)
 
 
+def _copy_zip_entry_raw(source_zip, target_zip, zip_info):
+    """Copies an entry from one zip file to another as its raw compressed bytes, without decompressing it."""
+
+    if (
+        not _can_copy_zip_entry_raw(source_zip, target_zip) or zip_info.flag_bits & _ZIP_FLAG_ENCRYPTED
+        or zip_info.file_size >= zipfile.ZIP64_LIMIT or zip_info.compress_size >= zipfile.ZIP64_LIMIT
+        or target_zip.fp.tell() >= zipfile.ZIP64_LIMIT
+    ):
+        # the zipfile internals a raw copy relies on aren't there, or the entry is encrypted or ZIP64 and needs headers
+        # we don't write here, let zipfile re-compress it instead
+        force_zip64 = zip_info.file_size >= zipfile.ZIP64_LIMIT
+        with source_zip.open(zip_info) as source_handle, target_zip.open(_copy_zip_info(zip_info), "w",
+                                                                         force_zip64=force_zip64) as target_handle:
+            shutil.copyfileobj(source_handle, target_handle, _ZIP_COPY_BLOCK_SIZE)
+        return
+
+    # skip past the local file header of the source entry to the start of the compressed data
+    source_zip.fp.seek(zip_info.header_offset)
+    local_header = struct.unpack(zipfile.structFileHeader, source_zip.fp.read(zipfile.sizeFileHeader))
+    source_zip.fp.seek(
+        local_header[_ZIP_FH_FILENAME_LENGTH] + local_header[_ZIP_FH_EXTRA_FIELD_LENGTH], os.SEEK_CUR
+    )
+
+    # sizes and CRC are known up front, so they go in the local header instead of a trailing data descriptor
+    target_info = _copy_zip_info(zip_info)
+    target_info.compress_type = zip_info.compress_type
+    target_info.flag_bits = zip_info.flag_bits & ~_ZIP_FLAG_DATA_DESCRIPTOR
+    target_info.CRC = zip_info.CRC
+    target_info.compress_size = zip_info.compress_size
+    target_info.file_size = zip_info.file_size
+    target_info.header_offset = target_zip.fp.tell()
+
+    target_zip.fp.write(target_info.FileHeader())
+
+    remaining = zip_info.compress_size
+    while remaining > 0:
+        block = source_zip.fp.read(min(remaining, _ZIP_COPY_BLOCK_SIZE))
+        if not block:
+            raise zipfile.BadZipFile("Unexpected end of data for zip entry '{}'.".format(zip_info.filename))
+        target_zip.fp.write(block)
+        remaining -= len(block)
+
+    # register the entry so it is written to the central directory on close
+    target_zip.filelist.append(target_info)
+    target_zip.NameToInfo[target_info.filename] = target_info
+    target_zip.start_dir = target_zip.fp.tell()
+
+
+def _can_copy_zip_entry_raw(source_zip, target_zip):
+    """Gets whether the zipfile internals that raw copies of zip entries rely on are available."""
+    return (
+        all(hasattr(zipfile, a) for a in _ZIP_RAW_COPY_MODULE_ATTRIBUTES) and hasattr(zipfile.ZipInfo, "FileHeader")
+        and all(hasattr(source_zip, a) for a in _ZIP_RAW_COPY_SOURCE_ATTRIBUTES)
+        and all(hasattr(target_zip, a) for a in _ZIP_RAW_COPY_TARGET_ATTRIBUTES)
+    )
+
+
+def _copy_zip_info(zip_info):
+    target_info = zipfile.ZipInfo(zip_info.filename, zip_info.date_time)
+    target_info.compress_type = zipfile.ZIP_DEFLATED
+    target_info.comment = zip_info.comment
+    target_info.extra = zip_info.extra
+    target_info.create_system = zip_info.create_system
+    target_info.internal_attr = zip_info.internal_attr
+    target_info.external_attr = zip_info.external_attr
+
+    return target_info
+
+
 def _describe_layer_file(file_path):
     layer_file = arcpy.mp.LayerFile(file_path)
 
@@ -422,10 +461,144 @@ def _describe_map(file_path):
         _native_document_close(ao_map_document)
 
 
+def _fix_aprx_datum_transforms(aprx_path, dry_run):
+    """Rewrites the datum transforms of an ArcGIS Project, streaming the archive in to a new copy of itself.
+
+    Map entries are only parsed when they contain one of the WKT strings being fixed, and all other entries are copied
+    across as their raw compressed bytes.  If no map needs changing, the project is left untouched.  Returns the number
+    of transforms fixed.
+    """
+
+    with zipfile.ZipFile(str(aprx_path), "r", allowZip64=True) as source_zip:
+        # check version of the archive to see whether we need to process
+        doc_info_xml_root = ET.fromstring(source_zip.read("DocumentInfo.xml"))
+        doc_version = Decimal(".".join(doc_info_xml_root.find("./Version").text.split(".")[:2]))
+
+        fixes_by_wkt, _ = _get_datum_transform_fixes(doc_version)
+        if not fixes_by_wkt:
+            # no set of changes applies to this version
+            return 0
+
+        # get paths to all maps in the project
+        gis_project_xml_root = ET.fromstring(source_zip.read("GISProject.xml"))
+        map_paths = [
+            pi.find("./CatalogPath").text.replace("CIMPATH=", "")
+            for pi in gis_project_xml_root.findall("./ProjectItems/CIMProjectItem")
+            if pi.find("./ItemType").text == "Map"
+        ]
+
+        # the WKT to look for, as it would appear in the raw XML bytes (quotes may or may not be escaped)
+        wkt_patterns = set()
+        for wkt in fixes_by_wkt:
+            wkt_patterns.add(wkt.encode("utf-8"))
+            wkt_patterns.add(xml_escape(wkt, {'"': "&quot;"}).encode("utf-8"))
+
+        # for each map, check if the datum transforms need winding back
+        changes = 0
+        changed_maps = {}
+        for map_path in map_paths:
+            map_xml_bytes = source_zip.read(map_path)
+            if not any(pattern in map_xml_bytes for pattern in wkt_patterns):
+                continue
+
+            fixed_map_xml_bytes, map_changes = _fix_map_xml_datum_transforms(map_xml_bytes, fixes_by_wkt)
+            if map_changes:
+                changes += map_changes
+                changed_maps[map_path] = fixed_map_xml_bytes
+
+        if not changed_maps or dry_run:
+            return changes
+
+        # write a new copy of the project alongside the original, swapping in the changed maps
+        temp_handle, temp_path = tempfile.mkstemp(suffix=".aprx", dir=str(aprx_path.parent))
+        os.close(temp_handle)
+
+        try:
+            with zipfile.ZipFile(temp_path, "w", compression=zipfile.ZIP_DEFLATED, allowZip64=True) as target_zip:
+                for zip_info in source_zip.infolist():
+                    if zip_info.filename in changed_maps:
+                        target_zip.writestr(_copy_zip_info(zip_info), changed_maps[zip_info.filename])
+                    else:
+                        _copy_zip_entry_raw(source_zip, target_zip, zip_info)
+
+            # temporary files are only readable by their owner, the project keeps the permissions it had
+            shutil.copymode(str(aprx_path), temp_path)
+        except:
+            os.remove(temp_path)
+            raise
+
+    # source must be closed before it can be replaced on Windows
+    os.replace(temp_path, str(aprx_path))
+
+    return changes
+
+
+def _fix_map_xml_datum_transforms(map_xml_bytes, fixes_by_wkt):
+    """Winds back the datum transforms in a map's XML, returning the new XML bytes (or None if nothing changed) and the
+    number of transforms fixed."""
+
+    # register namespaces so they are written back out with their original prefixes
+    map_xml_namespaces = dict([node for _, node in ET.iterparse(io.BytesIO(map_xml_bytes), events=["start-ns"])])
+    for prefix, uri in map_xml_namespaces.items():
+        ET.register_namespace(prefix, uri)
+
+    map_xml_tree = ET.ElementTree(ET.fromstring(map_xml_bytes))
+    changes = 0
+
+    # for each datum transform, compare current WKT to check if we need to wind back
+    for dt in map_xml_tree.findall("./DatumTransforms/CIMDatumTransform"):
+        for ti in dt.findall("./GeoTransformation/XForms/TransformationItem"):
+            transform = ti.find("./XForm")
+            if transform == None:
+                continue
+
+            wkt_element = transform.find("./WKT")
+            if wkt_element == None or wkt_element.text == None:
+                continue
+
+            fix_info = fixes_by_wkt.get(wkt_element.text.strip())
+            if fix_info is None:
+                continue
+
+            # fix the transform
+            wkt_element.text = fix_info["oldWkt"]
+            wkid_element = transform.find("./WKID")
+            wkid_element.text = fix_info["oldWkid"]
+            changes += 1
+
+    if not changes:
+        return (None, changes)
+
+    # ensure all the original attributes are written out on the root
+    map_xml_root = map_xml_tree.getroot()
+    existing_uris = [k.split('}')[0].strip('{') for k in map_xml_root.keys()]
+    for prefix, uri in map_xml_namespaces.items():
+        if not uri in existing_uris:
+            tag = f"xmlns:{prefix}" if prefix else "xmlns"
+            map_xml_root.set(tag, uri)
+
+    output = io.BytesIO()
+    map_xml_tree.write(output, encoding="UTF-8")
+    return (output.getvalue(), changes)
+
+
 def _get_data_source_desc(layer_or_table):
     return layer_or_table.connectionProperties
 
 
+def _get_datum_transform_fixes(doc_version):
+    """Gets the datum transform fixes applicable to a document version, as lookups by current WKT and by name."""
+    fixes_by_wkt = {}
+    fixes_by_name = {}
+
+    for lookup in _DATUM_TRANSFORM_LOOKUPS:
+        if doc_version < lookup["version"]:
+            fixes_by_wkt.update(lookup["byWkt"])
+            fixes_by_name.update(lookup["byName"])
+
+    return (fixes_by_wkt, fixes_by_name)
+
+
 def _get_logger():
     return logging.getLogger("arcpyext.mapping")
 
@@ -661,3 +834,10 @@ def _native_list_tables(pro_proj, map_frame):
         tables.append({"index": index, "arcpy": arcpy_table, "prosdk": prosdk_table})
 
     return tables
+
+
+def _timed_fix_datum_transforms(arc_file, dry_run=False):
+    start_time = time.time()
+    changes = fix_datum_transforms(arc_file, dry_run=dry_run)
+
+    return {"changes": changes, "seconds": time.time() - start_time}
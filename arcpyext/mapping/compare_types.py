@@ -25,11 +25,13 @@ class _ChangeTypesBase(JsonEnum):
         differences = []
 
         for change in cls:
-            was_value = change.value.get_value(was_desc_part)
-            now_value = change.value.get_value(now_desc_part)
+            was_test_value = change.value.get_test_value(was_desc_part)
+            now_test_value = change.value.get_test_value(now_desc_part)
 
-            if change.value.test(was_value, now_value):
-                differences.append(MapDocChange(change, was_value, now_value))
+            if change.value.test(was_test_value, now_test_value):
+                differences.append(
+                    MapDocChange(change, change.value.get_value(was_desc_part), change.value.get_value(now_desc_part))
+                )
                 if change.value.skip_remainder:
                     # skip all remaining tests
                     break
@@ -60,18 +62,24 @@ class ChangeType(object):
     def skip_remainder(self):
         return self._skip_remainder
 
-    def __init__(self, change_id, name, severity, get_value, test, skip_remainder=False):
+    def __init__(self, change_id, name, severity, get_value, test, skip_remainder=False, get_test_value=None):
         self._id = change_id
         self._name = name
         self._severity = severity
         self._skip_remainder = skip_remainder
         self.get_value = get_value
+        self.get_test_value = get_test_value or get_value
         self.test = test
 
     def get_value(self, obj):
         # implementation passed into init
         pass
 
+    def get_test_value(self, obj):
+        # implementation passed into init, defaults to get_value
+        # allows the test to run against a cheaper representation than the reported was/now values
+        pass
+
     def test(self, was, now):
         # implementation passed into init
         pass
@@ -129,21 +137,29 @@ class LayerChangeTypes(_ChangeTypesBase):
                              skip_remainder=True)
     LAYER_NAME_CHANGED = ChangeType(402, "Layer: Name Changed",
                                     ChangeSeverity.WARNING, lambda layer_desc: layer_desc.get("name", ""), operator.ne)
-    LAYER_DATASOURCE_CHANGED = ChangeType(403, "Layer: Datasource Changed",
-                                          ChangeSeverity.WARNING, lambda layer_desc: get_datasource_info(
-                                              layer_desc), lambda a, b: not dictionaries_eq_ignore_case(a, b))
+    LAYER_DATASOURCE_CHANGED = ChangeType(403,
+                                          "Layer: Datasource Changed",
+                                          ChangeSeverity.WARNING,
+                                          lambda layer_desc: get_datasource_info(layer_desc),
+                                          operator.ne,
+                                          get_test_value=get_datasource_key)
     LAYER_VISIBILITY_CHANGED = ChangeType(404, "Layer: Visibility Changed",
                                           ChangeSeverity.WARNING, lambda layer_desc: layer_desc["visible"], operator.ne)
 
     LAYER_ID_CHANGED = ChangeType(401, "Layer: Service ID Changed",
                                   ChangeSeverity.ERROR, lambda layer_desc: layer_desc["serviceId"], operator.ne)
-    LAYER_FIELDS_ADDED = ChangeType(
-        408, "Layer: Fields Added",
-        ChangeSeverity.INFO, lambda layer_desc: get_fields_compare_info(layer_desc["fields"] or []), lambda was_fields,
-        now_fields: is_superset(now_fields, was_fields) and not is_superset(was_fields, now_fields))
-    LAYER_FIELDS_REMOVED = ChangeType(
-        409, "Layer: Fields Removed", ChangeSeverity.ERROR, lambda layer_desc: get_fields_compare_info(layer_desc[
-            "fields"] or []), lambda was_fields, now_fields: not is_superset(now_fields, was_fields))
+    LAYER_FIELDS_ADDED = ChangeType(408,
+                                    "Layer: Fields Added",
+                                    ChangeSeverity.INFO,
+                                    lambda layer_desc: get_fields_compare_info(layer_desc["fields"] or []),
+                                    lambda was_fields, now_fields: frozenset(was_fields) < frozenset(now_fields),
+                                    get_test_value=get_fields_signature)
+    LAYER_FIELDS_REMOVED = ChangeType(409,
+                                      "Layer: Fields Removed",
+                                      ChangeSeverity.ERROR,
+                                      lambda layer_desc: get_fields_compare_info(layer_desc["fields"] or []),
+                                      lambda was_fields, now_fields: not frozenset(was_fields) <= frozenset(now_fields),
+                                      get_test_value=get_fields_signature)
     LAYER_DEFINITION_QUERY_CHANGED = ChangeType(
         406, "Layer: Definition Query Changed",
         ChangeSeverity.WARNING, lambda layer_desc: layer_desc["definitionQuery"], operator.ne)
@@ -1 +1,10 @@
-from ._schematransform import to_json, to_gdb, to_xml
\ No newline at end of file
+from ._diff import diff, diff_schemas, has_changes
+from ._schema_io import SchemaWriter, read_schema_objects
+
+from .._arcpy_import import import_arcpy as _import_arcpy
+
+# None if arcpy isn't installed, then only schemas read from JSON can be compared
+_arcpy = _import_arcpy()
+
+if _arcpy is not None:
+    from ._schematransform import apply, to_json, to_gdb, to_xml
@@ -0,0 +1,247 @@
+# coding=utf-8
+"""This module contains the comparison of JSON gdb schema representations, finding the changes needed to bring an
+existing geodatabase up to date with a schema.  Comparing two JSON schema files doesn't require arcpy."""
+
+# Python 2/3 compatibility
+# pylint: disable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+from future.builtins.disabled import *
+from future.builtins import *
+from future.standard_library import install_aliases
+install_aliases()
+# pylint: enable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position
+
+from pathlib2 import Path
+
+from ._schema_io import read_schema_objects
+
+TABLE = "Table"
+FEATURE_CLASS = "FeatureClass"
+RELATIONSHIP = "RelationshipClass"
+DOMAIN = "Domain"
+
+# field properties that can't be changed on an existing field, so must match for a field to be up to date
+_FIELD_PROPERTIES = ('type', 'length', 'domain')
+
+# index properties that must match for an index to be up to date
+_INDEX_PROPERTIES = ('ascending', 'unique')
+
+# relationship class properties that must match for a relationship class to be up to date
+_RELATIONSHIP_PROPERTIES = (
+    'originClassNames', 'destinationClassNames', 'originClassKeys', 'destinationClassKeys', 'cardinality', 'isComposite'
+)
+
+# field types that are created with their table, so can't be added to an existing one
+_TABLE_FIELD_TYPES = ('OID', 'Geometry')
+
+
+def diff(json_schema, existing):
+    """
+    Compare a JSON gdb schema representation with an existing geodatabase (or the JSON gdb schema representation of
+    one), finding the changes needed to bring the geodatabase up to date.
+
+    The changes are returned as a dictionary, which can be saved as JSON and applied with apply.  Changes only ever add
+    to a geodatabase: new domains and coded values, new tables and feature classes, fields and indexes added to
+    existing tables and feature classes, and new relationship classes.  Objects in the geodatabase that aren't in the
+    schema are left as they are.  Differences that can't be applied by adding to the geodatabase (e.g. a field with a
+    different type) are listed as conflicts, and a change set with conflicts can't be applied.
+
+    Objects are matched by name, case-insensitively as geodatabases match them.
+
+    :param json_schema: The path to a JSON gdb schema representation (as written by to_json), or a loaded schema.
+    :param existing: The path to a geodatabase (which requires arcpy to describe), the path to a JSON gdb schema
+                     representation of one, or a loaded schema.
+    """
+    target = _read_schema(json_schema)
+
+    if isinstance(existing, dict) or Path(str(existing)).suffix.lower() == ".json":
+        existing = _read_schema(existing)
+    else:
+        # describing a geodatabase requires arcpy, so the rest of schematransform is only imported when needed
+        from ._schematransform import _get_gdb_schema
+        existing = _get_gdb_schema(existing)
+
+    return diff_schemas(target, existing)
+
+
+def diff_schemas(target, existing):
+    """Compare two loaded JSON gdb schema representations, returning the changes needed to bring the existing schema
+    up to date with the target schema (see diff)."""
+    changes = {
+        'domains': [],
+        'codedValues': [],
+        'datasets': [],
+        'fields': [],
+        'indexes': [],
+        'relationships': [],
+        'conflicts': []
+    }
+
+    existing_objects = _get_objects_by_key(existing)
+
+    for x in target['schema']:
+        existing_x = existing_objects.get(_get_key(x))
+
+        if x['type'] == DOMAIN:
+            if existing_x is None:
+                changes['domains'].append(x)
+            else:
+                _diff_domain(x, existing_x, changes)
+
+        elif x['type'] == TABLE or x['type'] == FEATURE_CLASS:
+            if existing_x is None:
+                changes['datasets'].append(x)
+            else:
+                _diff_dataset(x, existing_x, changes)
+
+        elif x['type'] == RELATIONSHIP:
+            if existing_x is None:
+                changes['relationships'].append(x)
+            else:
+                _diff_properties("Relationship class", x['name'], x, existing_x, _RELATIONSHIP_PROPERTIES, changes)
+
+    return changes
+
+
+def has_changes(changes):
+    """Gets whether a change set from diff has anything to apply (or any conflicts)."""
+    return any(changes[k] for k in changes)
+
+
+def _diff_dataset(x, existing_x, changes):
+    name = x['name']
+
+    if x['type'] != existing_x['type']:
+        changes['conflicts'].append(
+            "{0} '{1}' is a {2} in the geodatabase.".format(_describe_type(x), name, _describe_type(existing_x))
+        )
+        return
+
+    if x['type'] == FEATURE_CLASS and x['geometryType'] != existing_x['geometryType']:
+        changes['conflicts'].append(
+            "Feature class '{0}' has {1} geometry, but {2} geometry in the geodatabase.".format(
+                name, x['geometryType'], existing_x['geometryType']
+            )
+        )
+
+    existing_fields = {f['name'].lower(): f for f in existing_x['fields']}
+    fields = []
+
+    for f in x['fields']:
+        existing_f = existing_fields.get(f['name'].lower())
+        field_name = "{0}.{1}".format(name, f['name'])
+
+        if existing_f is not None:
+            _diff_properties("Field", field_name, f, existing_f, _FIELD_PROPERTIES, changes)
+        elif f['type'] in _TABLE_FIELD_TYPES:
+            changes['conflicts'].append("Field '{0}' of type {1} can't be added.".format(field_name, f['type']))
+        else:
+            fields.append(f)
+
+    if fields:
+        changes['fields'].append({'name': name, 'type': x['type'], 'fields': fields})
+
+    existing_indexes = {i['name'].lower(): i for i in existing_x.get('indexes', [])}
+    indexes = []
+
+    for i in x.get('indexes', []):
+        existing_i = existing_indexes.get(i['name'].lower())
+        index_name = "{0}.{1}".format(name, i['name'])
+
+        if existing_i is None:
+            indexes.append(i)
+            continue
+
+        _diff_properties("Index", index_name, i, existing_i, _INDEX_PROPERTIES, changes)
+
+        if _get_index_fields(i) != _get_index_fields(existing_i):
+            changes['conflicts'].append(
+                "Index '{0}' is on {1}, but on {2} in the geodatabase.".format(
+                    index_name, ", ".join(_get_index_fields(i)), ", ".join(_get_index_fields(existing_i))
+                )
+            )
+
+    if indexes:
+        changes['indexes'].append({'name': name, 'type': x['type'], 'indexes': indexes})
+
+
+def _diff_domain(x, existing_x, changes):
+    name = x['name']
+
+    if _diff_properties("Domain", name, x, existing_x, ('subType', 'fieldType'), changes):
+        return
+
+    existing_values = {_get_value_key(kv['k']): kv['v'] for kv in existing_x.get('values', [])}
+    values = []
+
+    for kv in x.get('values', []):
+        key = _get_value_key(kv['k'])
+
+        if key not in existing_values:
+            values.append(kv)
+        elif existing_values[key] != kv['v']:
+            changes['conflicts'].append(
+                "Domain '{0}' code {1!r} is described as {2!r}, but {3!r} in the geodatabase.".format(
+                    name, kv['k'], kv['v'], existing_values[key]
+                )
+            )
+
+    if values:
+        changes['codedValues'].append({'name': name, 'values': values})
+
+
+def _diff_properties(description, name, x, existing_x, properties, changes):
+    """Adds a conflict for each property that differs between an object and its existing version, returning whether
+    any did."""
+    conflicts = [
+        "{0} '{1}' has {2} {3!r}, but {4!r} in the geodatabase.".format(
+            description, name, p, x.get(p), existing_x.get(p)
+        ) for p in properties if _normalise(x.get(p)) != _normalise(existing_x.get(p))
+    ]
+
+    changes['conflicts'].extend(conflicts)
+    return len(conflicts) > 0
+
+
+def _describe_type(x):
+    return "feature class" if x['type'] == FEATURE_CLASS else "table"
+
+
+def _get_index_fields(i):
+    return [f['name'].lower() for f in i['fields']]
+
+
+def _get_key(x):
+    # tables and feature classes share names, domains and relationship classes each have their own
+    kind = TABLE if x['type'] == FEATURE_CLASS else x['type']
+    return (kind, x['name'].lower())
+
+
+def _get_objects_by_key(schema):
+    return {_get_key(x): x for x in schema['schema']}
+
+
+def _get_value_key(value):
+    # coded values read from JSON can be numbers or text, depending on the domain, and whole numbers may be read as
+    # floats from one schema and integers from another
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _normalise(value):
+    # empty values (e.g. a field with no domain) are written as both None and empty strings, and lists as tuples
+    if value is None or value == "":
+        return None
+    if isinstance(value, (list, tuple)):
+        return [_normalise(v) for v in value]
+    if isinstance(value, str):
+        return value.lower()
+    return value
+
+
+def _read_schema(schema):
+    if isinstance(schema, dict):
+        return schema
+
+    return {'schema': list(read_schema_objects(schema))}
@@ -0,0 +1,201 @@
+# coding=utf-8
+"""This module contains a writer and a reader for JSON gdb schema representations that handle one schema object at a
+time, so the schemas of large geodatabases don't have to be held in memory as a whole to be written or read."""
+
+# Python 2/3 compatibility
+# pylint: disable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+from future.builtins.disabled import *
+from future.builtins import *
+from future.standard_library import install_aliases
+install_aliases()
+# pylint: enable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position
+
+import io
+import json
+import re
+
+# number of characters read from a schema file at a time
+SCHEMA_READ_CHUNK_SIZE = 64 * 1024
+
+# indentation of the schema objects written, nested in the top-level object's "schema" list
+_OBJECT_INDENT = " " * 8
+
+_WHITESPACE = " \t\n\r"
+
+# characters that can continue a number, a number followed only by these at the end of the buffer may be incomplete
+_NUMBER_CHARS = re.compile(r"[-+.eE0-9]*")
+
+
+class SchemaWriter(object):
+    """Writes a JSON gdb schema representation to a file, one schema object at a time.
+
+    The file is written exactly as it would be by writing the whole schema at once with json.dumps (indented by four
+    spaces), so it can be read by either json.loads or read_schema_objects.  The end of the schema is written when the
+    writer is closed (or its with block ends without an error).
+    """
+
+    _count = 0
+    _file = None
+
+    def __init__(self, file):
+        """
+        :param file: A file opened for writing text.
+        """
+        self._file = file
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # a schema that failed to be written is left incomplete, so it can't be mistaken for a whole schema
+        if exc_type is None:
+            self.close()
+
+    @property
+    def count(self):
+        """The number of schema objects written."""
+        return self._count
+
+    def close(self):
+        """Writes the end of the schema."""
+        if self._count == 0:
+            self._file.write('{\n    "schema": []\n}')
+        else:
+            self._file.write('\n    ]\n}')
+
+    def write(self, o):
+        """Writes a schema object (e.g. a domain or table)."""
+        text = json.dumps(o, sort_keys=False, indent=4, ensure_ascii=False)
+        text = "\n".join(_OBJECT_INDENT + line for line in text.split("\n"))
+
+        self._file.write(('{\n    "schema": [\n' if self._count == 0 else ',\n') + text)
+        self._count += 1
+
+
+def read_schema_objects(file_path, chunk_size=SCHEMA_READ_CHUNK_SIZE):
+    """Reads the objects of a JSON gdb schema representation (as written by to_json), yielding them one at a time.
+
+    Only the object being read is held in memory, so schemas can be read without loading the whole file.
+
+    :param file_path: The path to the JSON file.
+    :param chunk_size: The number of characters read from the file at a time.
+    """
+    with io.open(str(file_path), encoding="utf-8") as f:
+        reader = _JsonStreamReader(f, chunk_size)
+        reader.expect("{")
+
+        if reader.peek() == "}":
+            return
+
+        while True:
+            key = reader.read_value()
+            reader.expect(":")
+
+            if key == "schema":
+                for o in _read_array(reader):
+                    yield o
+            else:
+                # other properties aren't part of the schema, so are read and ignored
+                reader.read_value()
+
+            if reader.next_separator("}"):
+                return
+
+
+def _read_array(reader):
+    reader.expect("[")
+
+    if reader.peek() == "]":
+        reader.next_char()
+        return
+
+    while True:
+        yield reader.read_value()
+
+        if reader.next_separator("]"):
+            return
+
+
+class _JsonStreamReader(object):
+    """Reads JSON values and punctuation from a text file, keeping only the unread part of the current chunk."""
+
+    _buffer = ""
+    _chunk_size = None
+    _decoder = None
+    _file = None
+    _position = 0
+
+    def __init__(self, file, chunk_size):
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._file = file
+
+    def expect(self, char):
+        actual = self.next_char()
+        if actual != char:
+            raise ValueError("Invalid schema, expected {0!r} but found {1!r}.".format(char, actual))
+
+    def next_char(self):
+        char = self.peek()
+        if not char:
+            raise ValueError("Invalid schema, unexpected end of file.")
+
+        self._position += 1
+        return char
+
+    def next_separator(self, end_char):
+        """Reads the separator after a value in an object or array, returning whether it's the end of the object or
+        array (rather than a comma)."""
+        char = self.next_char()
+        if char != end_char and char != ",":
+            raise ValueError("Invalid schema, expected {0!r} or ',' but found {1!r}.".format(end_char, char))
+
+        return char == end_char
+
+    def peek(self):
+        """Gets the next character that isn't whitespace, without reading it (an empty string at the end of the
+        file)."""
+        while True:
+            while self._position < len(self._buffer) and self._buffer[self._position] in _WHITESPACE:
+                self._position += 1
+
+            if self._position < len(self._buffer) or not self._fill(self._chunk_size):
+                break
+
+        return self._buffer[self._position:self._position + 1]
+
+    def read_value(self):
+        self.peek()
+        size = self._chunk_size
+
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._position)
+            except ValueError:
+                # value continues past the end of the buffer, read more (reading more each time, so values much larger
+                # than a chunk aren't decoded many times over)
+                if not self._fill(size):
+                    raise
+                size *= 2
+                continue
+
+            # numbers at the end of the buffer may continue in the next chunk (including numbers split after a "." or
+            # in an exponent, which are decoded only as far as the split)
+            if not isinstance(value, (dict, list, str)) and self._is_number_end(end) and self._fill(size):
+                continue
+
+            self._position = end
+            return value
+
+    def _is_number_end(self, end):
+        return _NUMBER_CHARS.match(self._buffer, end).end() == len(self._buffer)
+
+    def _fill(self, size):
+        chunk = self._file.read(size)
+        if not chunk:
+            return False
+
+        self._buffer = self._buffer[self._position:] + chunk
+        self._position = 0
+        return True
@@ -21,16 +21,18 @@ import arcpy
 
 from pathlib2 import Path
 
-TABLE = "Table"
-FEATURE_CLASS = "FeatureClass"
-RELATIONSHIP = "RelationshipClass"
-DOMAIN = "Domain"
+from ._diff import TABLE, FEATURE_CLASS, RELATIONSHIP, DOMAIN
+from ._schema_io import SchemaWriter, read_schema_objects
+
 CODED_VALUE = "CodedValue"
 RANGE = "CodedValue"
 
 OUTPUT_GDB = 1
 OUTPUT_XML = 2
 
+# geodatabase field types added by to_gdb (other types, e.g. OID and Geometry, are created with their table)
+GDB_FIELD_TYPES = ['TEXT', 'FLOAT', 'DOUBLE', 'SHORT', 'LONG', 'DATE', 'BLOB', 'RASTER', 'GUID']
+
 
 def trace(method):
     def timed(*args, **kw):
@@ -59,27 +61,14 @@ def to_json(in_gdb, out_file):
 
     _get_logger().info("Transform GDB schema to JSON, from '{0}' to '{1}'...".format(in_gdb, out_file))
 
-    arcpy.env.workspace = in_gdb
-
-    if not arcpy.Exists(in_gdb):
-        raise IOError('Input GDB not found')
-
-    _get_logger().info("Profiling source gdb...")
-    domains = arcpy.da.ListDomains(in_gdb)
-    datasets = [c for c in arcpy.Describe(in_gdb).children]
-    tables = [c for c in datasets if c.dataType == TABLE]
-    fcs = [c for c in datasets if c.dataType == FEATURE_CLASS]
-    rs = [c for c in datasets if c.dataType == RELATIONSHIP]
+    _check_gdb(in_gdb)
 
+    # each schema object is written as soon as it's described
     _get_logger().info("Exporting...")
     with io.open(out_file, "w", encoding="utf-8") as f:
-
-        domains = list(map(lambda x: _domain_to_json(x), domains))
-        fcs = list(map(lambda x: _fc_to_json(x), fcs))
-        tables = list(map(lambda x: _t_to_json(x), tables))
-        rs = list(map(lambda x: _r_to_json(x), rs))
-
-        _json_to_file(f, {'schema': domains + fcs + tables + rs})
+        with SchemaWriter(f) as writer:
+            for x in _iter_gdb_schema(in_gdb):
+                writer.write(x)
 
     _get_logger().info("Transform done.")
 
@@ -87,6 +76,9 @@ def to_json(in_gdb, out_file):
 def to_gdb(in_file, out_gdb):
     """
     Convert a JSON gdb schema representation into a file/sde geodatabase
+
+    Schema objects are built one at a time, in dependency order: domains first, each table and feature class after the
+    domains its fields use, and each relationship class after both of its classes.
     """
 
     _get_logger().info("Transform JSOB to GDB, from '{0}' to '{1}'...".format(in_file, out_gdb))
@@ -99,67 +91,77 @@ def to_gdb(in_file, out_gdb):
         shutil.rmtree(out_gdb, ignore_errors=False)
 
     _get_logger().info("Creating output File GDB...")
-    out_gdb_mem = "in_memory"
     arcpy.env.workspace = out_gdb
     out_path = os.path.dirname(out_gdb)
     out_name = os.path.basename(out_gdb)
     arcpy.CreateFileGDB_management(out_path, out_name)
 
     _get_logger().info("Parsing json")
-    schema = json.loads(Path(in_file).read_text(encoding="utf-8"))
+    # the build is planned from the whole schema, so all of its objects are read
+    levels = _get_plan_levels(_plan_schema(list(read_schema_objects(in_file))))
 
-    # Domains
-    _get_logger().info("Domains")
-    for x in schema['schema']:
-        if x['type'] == DOMAIN:
-            _json_to_domain(OUTPUT_GDB, out_gdb, x)
+    for i, level in enumerate(levels):
+        _get_logger().info("Building {0} schema objects (level {1} of {2})".format(len(level), i + 1, len(levels)))
 
-    # Enable in-memory mode
-    arcpy.env.workspace = out_gdb_mem
+        for x in level:
+            _build_schema_object(out_gdb, x)
 
-    # Tables
-    _get_logger().info("Tables")
-    for x in schema['schema']:
-        if x['type'] == TABLE:
-            _json_to_t(OUTPUT_GDB, out_gdb_mem, x)
-        elif x['type'] == FEATURE_CLASS:
-            _json_to_fc(OUTPUT_GDB, out_gdb_mem, x)
-
-    # Move tables from memory to disk
-    for x in schema['schema']:
-        if x['type'] == TABLE:
-            _t_from_memory_to_disk(out_gdb_mem, out_gdb, x)
-        elif x['type'] == FEATURE_CLASS:
-            _fc_from_memory_to_disk(out_gdb_mem, out_gdb, x)
-
-    # Disable in-memory mode
     arcpy.env.workspace = out_gdb
 
-    # Add global ID columns (not supported by in-memory workspaces)
-    _get_logger().info("Global Ids'")
-    for x in schema['schema']:
-        if x['type'] == TABLE or x['type'] == FEATURE_CLASS:
-            _add_global_id(out_gdb, x)
+    _get_logger().info("Transform done.")
 
-    # Add global ID columns (not supported by in-memory workspaces)
-    _get_logger().info("Bind domains")
-    for x in schema['schema']:
-        if x['type'] == TABLE or x['type'] == FEATURE_CLASS:
-            _bind_domain(out_gdb, x)
 
-    # Indexes
-    _get_logger().info("Indexes")
-    for x in schema['schema']:
-        if x['type'] == TABLE or x['type'] == FEATURE_CLASS:
-            _add_indices(OUTPUT_GDB, out_gdb, x)
+def apply(changes, out_gdb):
+    """
+    Apply a change set from diff to an existing file/sde geodatabase, bringing it up to date with a JSON gdb schema
+    representation without rebuilding it.
 
-    # Relationships
-    _get_logger().info("Relationships")
-    for x in schema['schema']:
-        if x['type'] == RELATIONSHIP:
-            _add_r(out_gdb, x)
+    Only the changes are made: new domains and coded values are created first, then new tables and feature classes,
+    then fields and indexes are added to existing tables and feature classes, and new relationship classes are created
+    last.  A change set with conflicts isn't applied.
 
-    _get_logger().info("Transform done.")
+    :param changes: The change set returned by diff (or the path to a JSON file it was saved to).
+    :param out_gdb: The geodatabase to change.
+    """
+
+    if not isinstance(changes, dict):
+        changes = json.loads(Path(str(changes)).read_text(encoding="utf-8"))
+
+    if changes['conflicts']:
+        raise ValueError(
+            "Schema changes can't be applied, the geodatabase conflicts with the schema:\n{0}".format(
+                "\n".join(changes['conflicts'])
+            )
+        )
+
+    if not arcpy.Exists(out_gdb):
+        raise IOError("Output GDB not found")
+
+    _get_logger().info("Applying schema changes to '{0}'...".format(out_gdb))
+    arcpy.env.workspace = out_gdb
+
+    for x in changes['domains']:
+        _json_to_domain(OUTPUT_GDB, out_gdb, x)
+
+    for x in changes['codedValues']:
+        _add_coded_values(out_gdb, x)
+
+    for x in changes['datasets']:
+        _build_class(out_gdb, x)
+
+    for x in changes['fields']:
+        _add_fields(OUTPUT_GDB, out_gdb, x)
+        _add_global_id(out_gdb, x)
+
+    for x in changes['indexes']:
+        _add_indices(OUTPUT_GDB, out_gdb, x)
+
+    for x in changes['relationships']:
+        _add_r(out_gdb, x)
+
+    arcpy.env.workspace = out_gdb
+
+    _get_logger().info("Schema changes applied.")
 
 
 def to_xml(in_file, out_file):
@@ -179,9 +181,6 @@ def to_xml(in_file, out_file):
     if arcpy.Exists(out_file):
         os.remove(out_file)
 
-    _get_logger().info("Parsing json")
-    schema = json.loads(Path(in_file).read_text(encoding="utf-8"))
-
     _get_logger().info("Creating output xml workspace")
     with io.open(out_file, 'w', encoding="utf-8") as fo:
 
@@ -196,7 +195,7 @@ def to_xml(in_file, out_file):
         # Domains
         _get_logger().info("Domains")
         _xml_to_file(fo, """<Domains xsi:type='esri:ArrayOfDomain'>""")
-        for x in schema['schema']:
+        for x in read_schema_objects(in_file):
             if x['type'] == DOMAIN:
                 res = _json_to_domain(OUTPUT_XML, None, x)
                 _xml_to_file(fo, res)
@@ -206,7 +205,7 @@ def to_xml(in_file, out_file):
         # Tables
         _xml_to_file(fo, """<DatasetDefinitions xsi:type='esri:ArrayOfDataElement'>""")
         _get_logger().info("Tables")
-        for x in schema['schema']:
+        for x in read_schema_objects(in_file):
             if x['type'] == TABLE:
                 res = _json_to_t(OUTPUT_XML, None, x)
                 _xml_to_file(fo, res)
@@ -245,8 +244,31 @@ def _xml_to_file(f, o):
 #----------------
 
 
-def _json_to_file(f, o):
-    f.write(json.dumps(o, sort_keys=False, indent=4, ensure_ascii=False))
+def _check_gdb(in_gdb):
+    arcpy.env.workspace = in_gdb
+
+    if not arcpy.Exists(in_gdb):
+        raise IOError('Input GDB not found')
+
+
+def _get_gdb_schema(in_gdb):
+    _check_gdb(in_gdb)
+    return {'schema': list(_iter_gdb_schema(in_gdb))}
+
+
+def _iter_gdb_schema(in_gdb):
+    # objects are described one at a time as they're needed, domains first, then feature classes, tables and
+    # relationship classes
+    _get_logger().info("Profiling source gdb...")
+    datasets = arcpy.Describe(in_gdb).children
+
+    for x in arcpy.da.ListDomains(in_gdb):
+        yield _domain_to_json(x)
+
+    for data_type, x_to_json in ((FEATURE_CLASS, _fc_to_json), (TABLE, _t_to_json), (RELATIONSHIP, _r_to_json)):
+        for x in datasets:
+            if x.dataType == data_type:
+                yield x_to_json(x)
 
 
 def _fields_to_json(fields):
@@ -334,26 +356,149 @@ def _domain_to_json(x):
 #---------------
 
 
+def _build_class(out_gdb, x):
+    if not hasattr(arcpy.management, "AddFields"):
+        # without AddFields every field is added with its own tool call, which is quicker in memory, so tables and
+        # feature classes are created in memory with their fields, then copied to disk
+        _build_class_in_memory(out_gdb, x)
+        return
+
+    # tables and feature classes are created on disk, with their fields (and the domains of their fields) added in a
+    # single batch where possible, so only fields created with the dataset (e.g. the object ID, or the shape length
+    # and area) have domains bound
+    arcpy.env.workspace = out_gdb
+
+    if x['type'] == TABLE:
+        _json_to_t(OUTPUT_GDB, out_gdb, x)
+    else:
+        _json_to_fc(OUTPUT_GDB, out_gdb, x)
+
+    _add_global_id(out_gdb, x)
+
+    existing_fields = _get_existing_fields(out_gdb, x)
+    _bind_domain(
+        out_gdb, x, [
+            f for f in x['fields']
+            if f['name'].lower() in existing_fields and existing_fields[f['name'].lower()].domain != f['domain']
+        ]
+    )
+    _add_indices(OUTPUT_GDB, out_gdb, x)
+
+
+def _build_class_in_memory(out_gdb, x):
+    out_gdb_mem = "in_memory"
+    arcpy.env.workspace = out_gdb_mem
+
+    if x['type'] == TABLE:
+        _json_to_t(OUTPUT_GDB, out_gdb_mem, x)
+        _t_from_memory_to_disk(out_gdb_mem, out_gdb, x)
+    else:
+        _json_to_fc(OUTPUT_GDB, out_gdb_mem, x)
+        _fc_from_memory_to_disk(out_gdb_mem, out_gdb, x)
+
+    arcpy.env.workspace = out_gdb
+
+    # global IDs aren't supported by in-memory workspaces, and domains aren't copied, so both are added on disk
+    _add_global_id(out_gdb, x)
+    _bind_domain(out_gdb, x)
+    _add_indices(OUTPUT_GDB, out_gdb, x)
+
+
+def _build_schema_object(out_gdb, x):
+    """Builds a domain, table, feature class or relationship class in a geodatabase."""
+    if x['type'] == DOMAIN:
+        _json_to_domain(OUTPUT_GDB, out_gdb, x)
+    elif x['type'] == TABLE or x['type'] == FEATURE_CLASS:
+        _build_class(out_gdb, x)
+    elif x['type'] == RELATIONSHIP:
+        # relationship classes are created by name, in the workspace
+        arcpy.env.workspace = out_gdb
+        _add_r(out_gdb, x)
+
+
+def _get_plan_key(type, name):
+    # domains and classes are looked up by name, case-insensitively as geodatabases do
+    return (DOMAIN if type == DOMAIN else TABLE if type in (TABLE, FEATURE_CLASS) else type, name.lower())
+
+
+def _get_plan_levels(plan):
+    """Groups the objects of a plan into levels, where each object depends only on objects in earlier levels, so the
+    objects of a level can be built in any order.  Objects keep their schema order within each level."""
+    remaining = {i: dependencies for i, (_, dependencies) in enumerate(plan)}
+    levels = []
+
+    while remaining:
+        ready = sorted(i for i, dependencies in remaining.items() if not dependencies.intersection(remaining))
+        if not ready:
+            raise ValueError("Schema has circular dependencies.")
+
+        levels.append([plan[i][0] for i in ready])
+        for i in ready:
+            del remaining[i]
+
+    return levels
+
+
+def _plan_schema(objects):
+    """Plans the build of the objects of a schema, as a directed acyclic graph.
+
+    Returns a list of (schema object, dependencies) tuples, where dependencies is the set of indexes of the objects
+    that must be built first.  Tables and feature classes depend on the domains their fields use, and relationship
+    classes depend on both of their classes.  Relationship classes change the schema of their classes, so those that
+    share a class also depend on each other, in schema order.  Dependencies on objects that aren't in the schema are
+    ignored.
+    """
+    indexes = {_get_plan_key(x['type'], x['name']): i for i, x in enumerate(objects)}
+    relationships_by_class = {}
+    plan = []
+
+    for i, x in enumerate(objects):
+        dependencies = set()
+
+        if x['type'] == TABLE or x['type'] == FEATURE_CLASS:
+            for f in x['fields']:
+                if f['domain']:
+                    dependencies.add(indexes.get(_get_plan_key(DOMAIN, f['domain'])))
+
+        elif x['type'] == RELATIONSHIP:
+            for key in sorted(set(_get_plan_key(TABLE, n) for n in x['originClassNames'] + x['destinationClassNames'])):
+                dependencies.add(indexes.get(key))
+                dependencies.add(relationships_by_class.get(key))
+                relationships_by_class[key] = i
+
+        dependencies.discard(None)
+        plan.append((x, dependencies))
+
+    return plan
+
+
+@trace
+def _add_coded_values(out_gdb, x):
+    for kv in x['values']:
+        arcpy.AddCodedValueToDomain_management(out_gdb, x['name'], kv['k'], kv['v'])
+
+
 @trace
 def _add_fields(output_target, out_gdb, x):
 
     if output_target == OUTPUT_GDB:
 
-        for f in x['fields']:
-            type = _json_type_to_gdb_type(f['type'])
-            if type in ['TEXT', 'FLOAT', 'DOUBLE', 'SHORT', 'LONG', 'DATE', 'BLOB', 'RASTER', 'GUID']:
-                arcpy.AddField_management(
-                    in_table=out_gdb + '/' + x['name'],
-                    field_name=f['name'],
-                    field_type=type,
-                    field_alias=f['aliasName'],
-                    field_length=f['length'],
-                    field_precision=f['precision'],
-                    field_scale=f['scale'],
-                    field_is_nullable='NULLABLE' if f['nullable'] else 'NON_NULLABLE',
-                    field_is_required='REQUIRED' if f['required'] else 'NON_REQUIRED',
-                    field_domain=f['domain'] if f['domain'] else 'None'
-                )
+        # fields the dataset already has (e.g. the shape length and area of a new feature class) aren't added again
+        existing_fields = _get_existing_fields(out_gdb, x)
+        fields = [
+            f for f in x['fields']
+            if _json_type_to_gdb_type(f['type']) in GDB_FIELD_TYPES and f['name'].lower() not in existing_fields
+        ]
+
+        # fields are added with a single tool call where possible, and one at a time where they have properties that
+        # AddFields can't set (AddFields isn't available before ArcGIS Pro 2.5, so there all are added one at a time)
+        if hasattr(arcpy.management, "AddFields"):
+            batch_fields, single_fields = _split_field_batch(fields)
+        else:
+            batch_fields, single_fields = [], fields
+
+        _add_field_batch(out_gdb, x, batch_fields)
+        _add_fields_individually(out_gdb, x, single_fields)
 
     elif output_target == OUTPUT_XML:
 
@@ -385,6 +530,37 @@ def _add_fields(output_target, out_gdb, x):
         )
 
 
+@trace
+def _add_field_batch(out_gdb, x, fields):
+    if not fields:
+        return
+
+    arcpy.management.AddFields(out_gdb + '/' + x['name'], [_get_field_description(f) for f in fields])
+
+
+@trace
+def _add_fields_individually(out_gdb, x, fields):
+    for f in fields:
+        arcpy.AddField_management(
+            in_table=out_gdb + '/' + x['name'],
+            field_name=f['name'],
+            field_type=_json_type_to_gdb_type(f['type']),
+            field_alias=f['aliasName'],
+            field_length=f['length'],
+            field_precision=f['precision'],
+            field_scale=f['scale'],
+            field_is_nullable='NULLABLE' if f['nullable'] else 'NON_NULLABLE',
+            field_is_required='REQUIRED' if f['required'] else 'NON_REQUIRED',
+            field_domain=f['domain'] if f['domain'] else ''
+        )
+
+
+def _get_existing_fields(out_gdb, x):
+    """Gets the fields a table or feature class in a geodatabase has, keyed by their lowercase name (as geodatabase
+    field names are case-insensitive)."""
+    return {f.name.lower(): f for f in arcpy.ListFields(out_gdb + '/' + x['name'])}
+
+
 @trace
 def _add_global_id(out_gdb, x):
     for f in x['fields']:
@@ -394,8 +570,8 @@ def _add_global_id(out_gdb, x):
 
 
 @trace
-def _bind_domain(out_gdb, x):
-    for f in x['fields']:
+def _bind_domain(out_gdb, x, fields=None):
+    for f in x['fields'] if fields is None else fields:
         if f['domain']:
             _get_logger().info(f['domain'])
             arcpy.AssignDomainToField_management(
@@ -607,6 +783,29 @@ def _fc_from_memory_to_disk(in_gdb, out_gdb, x):
     arcpy.CreateFeatureclass_management(out_path=out_gdb, out_name=x['name'], template=in_gdb + '/' + x['name'])
 
 
+def _get_field_description(f):
+    # AddFields takes a name, type, alias, length, default value and domain for each field
+    type = _json_type_to_gdb_type(f['type'])
+    length = f['length'] if type == 'TEXT' else ""
+    return [f['name'], type, f['aliasName'] or "", length, "", f['domain'] if f['domain'] else ""]
+
+
+def _split_field_batch(fields):
+    """Splits fields into those that can be added together with AddFields, and those that must be added one at a time
+    with AddField (fields that aren't nullable or are required, or have a precision or scale, which AddFields can't
+    set)."""
+    batch_fields = []
+    single_fields = []
+
+    for f in fields:
+        if f['nullable'] and not f['required'] and not f['precision'] and not f['scale']:
+            batch_fields.append(f)
+        else:
+            single_fields.append(f)
+
+    return batch_fields, single_fields
+
+
 def _json_type_to_gdb_type(type):
     # type = type.lower()
     if type == 'String':
@@ -14,6 +14,12 @@ setup(
     #dependencies
     install_requires = requirements,
 
+    #optional dependencies, Parquet conversion and zstd-compressed CSV files
+    extras_require = {
+        "parquet": ["pyarrow"],
+        "zstd": ["zstandard"]
+    },
+
     #misc files to include
     package_data = {
         "": ["LICENSE"]
@@ -0,0 +1,139 @@
+# coding=utf-8
+"""Benchmark of writing cursor rows to CSV.
+
+Compares writing one row at a time to a file with the default buffer (as ToCsvBase used to) with writing chunks of
+rows through arcpyext.conversion._csv.CsvFileWriter, uncompressed and gzipped.  Rows come from a stand-in for
+arcpy.da.SearchCursor, so the benchmark doesn't need ArcGIS.  Run with ``python -m tests.benchmarks.bench_csv_writer [row count]``.
+"""
+
+# Python 2/3 compatibility
+# pylint: disable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+from future.builtins.disabled import *
+from future.builtins import *
+from future.standard_library import install_aliases
+install_aliases()
+# pylint: enable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position
+
+import csv
+import datetime
+import gzip
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from arcpyext.conversion._csv import CsvFileWriter, get_value_converters
+
+ROW_COUNT = 2000000
+
+FIELD_TYPES = ["OID", "String", "Integer", "Double", "Date", "String"]
+HEADERS = ["OBJECTID", "NAME", "CODE", "AREA", "CREATED", "REMARKS"]
+
+
+class StandInCursor(object):
+    """Yields rows like an arcpy.da.SearchCursor over a table with the fields in FIELD_TYPES."""
+
+    def __init__(self, row_count):
+        self._row_count = row_count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def __iter__(self):
+        start_date = datetime.datetime(2000, 1, 1)
+        one_minute = datetime.timedelta(minutes=1)
+
+        for i in range(self._row_count):
+            yield (
+                i + 1, "Feature {}".format(i), i % 1000, i * 0.25, start_date + one_minute * i,
+                None if i % 10 else "Remarks"
+            )
+
+
+def write_row_by_row(file_path, row_count):
+    if sys.version_info[0] < 3:
+        csv_file = io.open(file_path, "wb")
+    else:
+        csv_file = io.open(file_path, "w", newline="", encoding="utf-8")
+
+    with csv_file:
+        csv_writer = csv.writer(csv_file, dialect="excel")
+        csv_writer.writerow(HEADERS)
+
+        with StandInCursor(row_count) as cursor:
+            for row in cursor:
+                if sys.version_info[0] < 3:
+                    csv_writer.writerow([str(s).encode("utf-8") for s in row])
+                else:
+                    csv_writer.writerow(row)
+
+
+def write_chunked(file_path, row_count, compression=None):
+    with CsvFileWriter(file_path, HEADERS, compression) as csv_writer:
+        with StandInCursor(row_count) as cursor:
+            csv_writer.write_rows(cursor, get_value_converters(FIELD_TYPES))
+
+
+def write_chunked_gzip(file_path, row_count):
+    write_chunked(file_path, row_count, "gzip")
+
+
+def time_writer(writer, file_path, row_count):
+    # time the cursor on its own, so the writers can be compared without the cost of generating rows
+    start = time.time()
+    for _ in StandInCursor(row_count):
+        pass
+    cursor_seconds = time.time() - start
+
+    start = time.time()
+    writer(file_path, row_count)
+    return time.time() - start, cursor_seconds
+
+
+def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else ROW_COUNT
+    temp_dir = tempfile.mkdtemp()
+
+    try:
+        row_by_row_path = os.path.join(temp_dir, "row_by_row.csv")
+        chunked_path = os.path.join(temp_dir, "chunked.csv")
+        gzip_path = os.path.join(temp_dir, "chunked.csv.gz")
+
+        row_by_row_seconds, cursor_seconds = time_writer(write_row_by_row, row_by_row_path, row_count)
+        chunked_seconds, _ = time_writer(write_chunked, chunked_path, row_count)
+        gzip_seconds, _ = time_writer(write_chunked_gzip, gzip_path, row_count)
+
+        with io.open(row_by_row_path, "rb") as row_by_row_file, io.open(chunked_path, "rb") as chunked_file:
+            csv_data = row_by_row_file.read()
+            assert csv_data == chunked_file.read()
+
+        with gzip.open(gzip_path, "rb") as gzip_file:
+            assert gzip_file.read() == csv_data
+
+        print("{} rows, {} columns (stand-in cursor alone: {:.2f}s)".format(row_count, len(FIELD_TYPES), cursor_seconds))
+        print("Row by row: {:10.2f}s {:12,.0f} rows/sec".format(row_by_row_seconds, row_count / row_by_row_seconds))
+        print("Chunked:    {:10.2f}s {:12,.0f} rows/sec".format(chunked_seconds, row_count / chunked_seconds))
+        print(
+            "Gzipped:    {:10.2f}s {:12,.0f} rows/sec ({:.1f} MB to {:.1f} MB)".format(
+                gzip_seconds, row_count / gzip_seconds,
+                os.path.getsize(chunked_path) / 1e6,
+                os.path.getsize(gzip_path) / 1e6
+            )
+        )
+        print(
+            "Speedup (excluding the cursor): {:.2f}x".format(
+                (row_by_row_seconds - cursor_seconds) / (chunked_seconds - cursor_seconds)
+            )
+        )
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# coding=utf-8
+"""Benchmark of writing cursor rows to a GeoPackage.
+
+Writes polygon features through arcpyext.conversion._geopackage.GeoPackageWriter, with rows from a stand-in for
+arcpy.da.SearchCursor (so the benchmark doesn't need ArcGIS), and compares it with inserting and committing each row on
+its own (without a spatial index).  Run with ``python -m tests.benchmarks.bench_geopackage_writer [row count]``.
+"""
+
+# Python 2/3 compatibility
+# pylint: disable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+from future.builtins.disabled import *
+from future.builtins import *
+from future.standard_library import install_aliases
+install_aliases()
+# pylint: enable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position
+
+import datetime
+import os
+import shutil
+import sqlite3
+import struct
+import sys
+import tempfile
+import time
+
+from arcpyext.conversion._geopackage import GeoPackageWriter, get_geometry_blob
+
+ROW_COUNT = 500000
+
+# rows committed one at a time are slow, so fewer are written and the rate is compared
+ROW_BY_ROW_COUNT = 5000
+
+FIELDS = [("OBJECTID", "OID"), ("Shape", "Geometry"), ("NAME", "String"), ("AREA", "Double"), ("CREATED", "Date")]
+
+
+class StandInCursor(object):
+    """Yields rows like an arcpy.da.SearchCursor over a polygon feature class with the fields in FIELDS, with the
+    geometry as WKB."""
+
+    def __init__(self, row_count):
+        self._row_count = row_count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def __iter__(self):
+        start_date = datetime.datetime(2000, 1, 1)
+        one_minute = datetime.timedelta(minutes=1)
+
+        for i in range(self._row_count):
+            x, y = (i % 1000) * 10.0, (i // 1000) * 10.0
+            ring = [x, y, x, y + 9, x + 9, y + 9, x + 9, y, x, y]
+            wkb = struct.pack("<BIIBIII10d", 1, 6, 1, 1, 3, 1, 5, *ring)
+            yield (i + 1, wkb, "Feature {}".format(i), 81.0, start_date + one_minute * i)
+
+
+def write_row_by_row(file_path, row_count):
+    connection = sqlite3.connect(file_path, isolation_level=None)
+    try:
+        connection.execute(
+            "CREATE TABLE features (OBJECTID INTEGER PRIMARY KEY, Shape MULTIPOLYGON, NAME TEXT, AREA DOUBLE, "
+            "CREATED DATETIME)"
+        )
+
+        with StandInCursor(row_count) as cursor:
+            for object_id, wkb, name, area, created in cursor:
+                connection.execute("BEGIN")
+                connection.execute(
+                    "INSERT INTO features VALUES (?, ?, ?, ?, ?)",
+                    (object_id, get_geometry_blob(wkb, -1)[0], name, area, created.isoformat())
+                )
+                connection.execute("COMMIT")
+    finally:
+        connection.close()
+
+
+def write_bulk(file_path, row_count):
+    with GeoPackageWriter(file_path) as writer:
+        with StandInCursor(row_count) as cursor:
+            writer.write_table("features", FIELDS, cursor, "MULTIPOLYGON")
+
+
+def time_writer(writer, file_path, row_count):
+    start = time.time()
+    writer(file_path, row_count)
+    return time.time() - start
+
+
+def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else ROW_COUNT
+    temp_dir = tempfile.mkdtemp()
+
+    try:
+        row_by_row_seconds = time_writer(write_row_by_row, os.path.join(temp_dir, "row_by_row.gpkg"), ROW_BY_ROW_COUNT)
+        bulk_seconds = time_writer(write_bulk, os.path.join(temp_dir, "bulk.gpkg"), row_count)
+
+        row_by_row_rate = ROW_BY_ROW_COUNT / row_by_row_seconds
+        bulk_rate = row_count / bulk_seconds
+
+        print("{} rows, {} columns".format(row_count, len(FIELDS)))
+        print(
+            "Row by row: {:10.2f}s {:12,.0f} rows/sec ({} rows)".format(
+                row_by_row_seconds, row_by_row_rate, ROW_BY_ROW_COUNT
+            )
+        )
+        print("Bulk:       {:10.2f}s {:12,.0f} rows/sec (with spatial index)".format(bulk_seconds, bulk_rate))
+        print("Speedup: {:.1f}x".format(bulk_rate / row_by_row_rate))
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# coding=utf-8
+"""Microbenchmark of determining the type of large, renderer-heavy layer documents.
+
+Compares parsing the whole JSON document (as the layer factory used to) with sniffing the type from the start of the
+document.  Run with ``python -m tests.benchmarks.bench_layer_type_sniff``.
+"""
+
+# Python 2/3 compatibility
+# pylint: disable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+from future.builtins.disabled import *
+from future.builtins import *
+from future.standard_library import install_aliases
+install_aliases()
+# pylint: enable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position
+
+import json
+import sys
+import timeit
+
+from arcpyext.mapping._cim.helpers import get_cim_type
+
+CLASS_COUNT = 5000
+REPEAT = 20
+
+
+def create_layer_json(class_count):
+    """Creates a JSON feature layer document with a unique value renderer of the given number of classes."""
+    symbol = {
+        "type": "CIMSymbolReference",
+        "symbol": {
+            "type": "CIMPolygonSymbol",
+            "symbolLayers": [
+                {
+                    "type": "CIMSolidStroke",
+                    "enable": True,
+                    "capStyle": "Round",
+                    "joinStyle": "Round",
+                    "width": 0.7,
+                    "color": {
+                        "type": "CIMRGBColor",
+                        "values": [110, 110, 110, 100]
+                    }
+                }, {
+                    "type": "CIMSolidFill",
+                    "enable": True,
+                    "color": {
+                        "type": "CIMRGBColor",
+                        "values": [190, 232, 255, 100]
+                    }
+                }
+            ]
+        }
+    }
+
+    return json.dumps(
+        {
+            "type": "CIMFeatureLayer",
+            "name": "Renderer heavy layer",
+            "renderer": {
+                "type": "CIMUniqueValueRenderer",
+                "fields": ["CODE"],
+                "groups": [
+                    {
+                        "type": "CIMUniqueValueGroup",
+                        "classes": [
+                            {
+                                "type": "CIMUniqueValueClass",
+                                "label": "Class {}".format(i),
+                                "symbol": symbol,
+                                "values": [{
+                                    "type": "CIMUniqueValue",
+                                    "fieldValues": [str(i)]
+                                }],
+                                "visible": True
+                            } for i in range(class_count)
+                        ]
+                    }
+                ]
+            }
+        },
+        indent=2
+    ).encode("utf-8")
+
+
+def main():
+    class_count = int(sys.argv[1]) if len(sys.argv) > 1 else CLASS_COUNT
+    layer_bytes = create_layer_json(class_count)
+    layer_view = memoryview(layer_bytes)
+
+    assert json.loads(layer_bytes.decode("utf-8"))["type"] == get_cim_type(layer_view[:256]) == "CIMFeatureLayer"
+
+    parse_time = timeit.timeit(lambda: json.loads(layer_bytes.decode("utf-8"))["type"], number=REPEAT) / REPEAT
+    sniff_time = timeit.timeit(lambda: get_cim_type(layer_view[:256]), number=REPEAT) / REPEAT
+
+    print("Layer document: {} renderer classes, {:.1f} MB".format(class_count, len(layer_bytes) / 1e6))
+    print("Decode and json.loads: {:10.3f}ms".format(parse_time * 1000))
+    print("get_cim_type:          {:10.3f}ms".format(sniff_time * 1000))
+    print("Speedup:               {:10.0f}x".format(parse_time / sniff_time))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# coding=utf-8
+"""Benchmark of reading layer documents from a large ArcGIS Pro project, with and without ProjectArchive.
+
+Builds a synthetic project with 5,000 layers (from the layers in the complex mapping sample), then times the type
+sniffing pass ProMap makes over every layer.  Run with ``python -m tests.benchmarks.bench_project_archive``.
+"""
+
+# Python 2/3 compatibility
+# pylint: disable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+from future.builtins.disabled import *
+from future.builtins import *
+from future.standard_library import install_aliases
+install_aliases()
+# pylint: enable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position
+
+import os.path
+import re
+import shutil
+import sys
+import tempfile
+import timeit
+import zipfile
+
+from arcpyext.mapping._cim.archive import ProjectArchive
+
+SAMPLE_PROJECT_PATH = os.path.abspath("{0}/../samples/test_mapping_complex.aprx".format(os.path.dirname(__file__)))
+MAP_PATH = "layers/layers.xml"
+TEMPLATE_LAYER_PATH = "layers/layer_1.xml"
+LAYER_COUNT = 5000
+
+
+def create_project(project_path, layer_count):
+    """Creates a project with a single map of the given number of layers, copied from the sample project."""
+    with zipfile.ZipFile(SAMPLE_PROJECT_PATH) as sample_zip:
+        map_xml = sample_zip.read(MAP_PATH).decode("utf-8")
+        layer_xml = sample_zip.read(TEMPLATE_LAYER_PATH).decode("utf-8")
+
+        layer_paths = ["layers/layer_bench_{}.xml".format(i) for i in range(layer_count)]
+        layers_xml = "<Layers xsi:type='typens:ArrayOfString'>{}</Layers>".format(
+            "".join("<String>CIMPATH={}</String>".format(lp) for lp in layer_paths)
+        )
+        map_xml = re.sub(r"<Layers .*?</Layers>", layers_xml, map_xml, count=1)
+
+        with zipfile.ZipFile(project_path, "w", zipfile.ZIP_DEFLATED) as project_zip:
+            for info in sample_zip.infolist():
+                if info.filename != MAP_PATH:
+                    project_zip.writestr(info, sample_zip.read(info))
+            project_zip.writestr(MAP_PATH, map_xml)
+
+            for lp in layer_paths:
+                project_zip.writestr(lp, layer_xml)
+
+    return layer_paths
+
+
+def sniff_with_zipfile(project_path, layer_paths):
+    # the approach used before ProjectArchive, each member opened and fully decoded for a prefix check
+    with zipfile.ZipFile(project_path, mode="r", allowZip64=True) as project_zip:
+        for lp in layer_paths:
+            with project_zip.open(lp) as zip_file_handle:
+                layer_string = zip_file_handle.read().decode("utf-8")
+            assert layer_string.startswith("<CIMFeatureLayer")
+
+
+def sniff_with_archive(project_archive, layer_paths):
+    # only the start of each member is decompressed
+    for lp in layer_paths:
+        assert project_archive.read_view(lp, 16).tobytes() == b"<CIMFeatureLayer"
+
+
+def read_with_archive(project_archive, layer_paths):
+    # full reads, as made when each layer's CIM is parsed
+    for lp in layer_paths:
+        project_archive.read_text(lp)
+
+
+def main():
+    layer_count = int(sys.argv[1]) if len(sys.argv) > 1 else LAYER_COUNT
+    temp_dir = tempfile.mkdtemp()
+
+    try:
+        project_path = os.path.join(temp_dir, "bench.aprx")
+        layer_paths = create_project(project_path, layer_count)
+        print("Synthetic project: {} layers, {:.1f} MB".format(layer_count, os.path.getsize(project_path) / 1e6))
+
+        zipfile_time = min(timeit.repeat(lambda: sniff_with_zipfile(project_path, layer_paths), number=1, repeat=3))
+        print("zipfile, open and decode per layer:   {:8.3f}s".format(zipfile_time))
+
+        # sized so that every layer fits in the cache
+        with ProjectArchive(project_path, cache_bytes=1024 * 1024 * 1024) as project_archive:
+            sniff_time = min(
+                timeit.repeat(lambda: sniff_with_archive(project_archive, layer_paths), number=1, repeat=3)
+            )
+            cold_time = timeit.timeit(lambda: read_with_archive(project_archive, layer_paths), number=1)
+            warm_time = timeit.timeit(lambda: read_with_archive(project_archive, layer_paths), number=1)
+
+        print("ProjectArchive, type sniff per layer: {:8.3f}s".format(sniff_time))
+        print("ProjectArchive, full read per layer:  {:8.3f}s".format(cold_time))
+        print("ProjectArchive, cached full read:     {:8.3f}s".format(warm_time))
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,15 +8,26 @@ install_aliases()
 # pylint: enable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position
 
 import os
+import pickle
 import shutil
+import sqlite3
+
+from collections import namedtuple
 
 import arcpy
 import pytest
 
 import arcpyext
 
+from arcpyext.conversion._helpers import (
+    _get_max_value, _is_ordered_datasource, get_appended_rows_where_clause, get_dataset_manifest
+)
+from arcpyext.conversion._manifest import create_manifest, get_manifest_path
+from arcpyext.conversion._metadata import MetadataCache
 from pathlib2 import Path
 
+from ..helpers import read_csv
+
 TEST_INPUT_GDB_PATH = Path(__file__).parent.joinpath("input/conversion.gdb")
 TEST_INPUT_COPY_GDB_PATH = Path(__file__).parent.joinpath("input/conversion.copy.gdb")
 TEST_OUTPUT_PATH = Path(__file__).parent.parent.joinpath("output")
@@ -57,6 +68,133 @@ def test_convert_csv(in_workspace, output_path):
     assert any(child.suffix.lower() in [".csv"] for child in output_path.iterdir())
 
 
+@pytest.mark.parametrize(("output_path"), [(TEST_OUTPUT_PATH.joinpath("csv_gzip_parts"))])
+def test_convert_csv_compressed_parts(in_workspace, output_path):
+    in_workspace_str = str(in_workspace)
+    output_path_str = str(output_path)
+    arcpyext.conversion.to_csv.workspace(in_workspace_str, output_path_str, compression="gzip", max_rows_per_file=1)
+    assert output_path.exists()
+
+    # check gzipped CSV parts exist
+    assert any(child.name.lower().endswith(".part0001.csv.gz") for child in output_path.iterdir())
+
+
+@pytest.mark.parametrize(("output_path"), [(TEST_OUTPUT_PATH.joinpath("csv_parallel"))])
+def test_convert_csv_parallel(in_workspace, output_path):
+    in_workspace_str = str(in_workspace)
+    output_path_str = str(output_path)
+    results = arcpyext.conversion.to_csv.workspace(in_workspace_str, output_path_str, max_workers=2)
+    assert output_path.exists()
+
+    # check every dataset was converted to its own file
+    assert results
+    assert all(r["error"] is None for r in results)
+    assert len(set(r["outputPath"] for r in results)) == len(results)
+    assert all(r["outputPath"].exists() for r in results)
+
+
+@pytest.mark.parametrize(("output_path"), [(TEST_OUTPUT_PATH.joinpath("csv_incremental"))])
+def test_convert_csv_incremental(in_workspace, output_path):
+    in_workspace_str = str(in_workspace)
+    output_path_str = str(output_path)
+    arcpyext.conversion.to_csv.workspace(in_workspace_str, output_path_str, incremental=True)
+
+    # nothing has changed, so nothing is converted again
+    results = arcpyext.conversion.to_csv.workspace(in_workspace_str, output_path_str, incremental=True, max_workers=1)
+    assert all(r["action"] == "skipped" for r in results if r["dataType"] != "RelationshipClass")
+    assert all(Path(get_manifest_path(r["outputPath"])).exists() for r in results if r["action"] == "skipped")
+
+
+@pytest.mark.parametrize(("output_path"), [(TEST_OUTPUT_PATH.joinpath("csv_transformed"))])
+def test_convert_csv_transformed(in_workspace, output_path):
+    in_workspace_str = str(in_workspace)
+    output_path_str = str(output_path)
+    arcpyext.conversion.to_csv.workspace(
+        in_workspace_str, output_path_str, field_names=["OBJECTID"], where_clause="OBJECTID <= 2"
+    )
+
+    # check only the selected field and rows were written
+    csv_paths = [child for child in output_path.iterdir() if child.suffix.lower() == ".csv"]
+    assert csv_paths
+    for csv_path in csv_paths:
+        rows = read_csv(csv_path.read_bytes())
+        assert rows[0] == ["OBJECTID"]
+        assert len(rows) <= 3
+
+
+def test_appended_rows_where_clause(in_workspace):
+    desc = next(
+        c for c in arcpy.Describe(str(in_workspace)).children
+        if c.dataType in ("FeatureClass", "Table") and int(arcpy.management.GetCount(c.catalogPath)[0]) > 1
+    )
+    manifest = dict(get_dataset_manifest(desc), lastEdited=None)
+
+    with arcpy.da.SearchCursor(desc.catalogPath, ["OID@"]) as cursor:
+        previous_max_oid = sorted(row[0] for row in cursor)[-2]
+    previous_manifest = create_manifest(manifest["rowCount"] - 1, previous_max_oid, None, manifest["schemaHash"])
+
+    # only the last row was added since the previous manifest
+    oid_field = arcpy.AddFieldDelimiters(desc.catalogPath, desc.OIDFieldName)
+    where_clause = get_appended_rows_where_clause(desc, previous_manifest, manifest)
+    assert where_clause == "{} > {}".format(oid_field, previous_max_oid)
+
+    # rows may have been edited since a manifest recorded without editor tracking, so the dataset is converted again
+    edited_manifest = dict(manifest, lastEdited="2020-01-02T03:04:05.000000")
+    assert get_appended_rows_where_clause(desc, previous_manifest, edited_manifest) is None
+
+
+def test_get_max_value(in_workspace, tmpdir):
+    desc = next(
+        c for c in arcpy.Describe(str(in_workspace)).children
+        if c.dataType in ("FeatureClass", "Table") and int(arcpy.management.GetCount(c.catalogPath)[0]) > 1
+    )
+    with arcpy.da.SearchCursor(desc.catalogPath, ["OID@"]) as cursor:
+        oids = sorted(row[0] for row in cursor)
+
+    # the geodatabase sorts the rows, a dBASE table is scanned
+    dbf_path = str(tmpdir.join("table.dbf"))
+    arcpy.management.CopyRows(desc.catalogPath, dbf_path)
+    assert _is_ordered_datasource(desc.catalogPath) and not _is_ordered_datasource(dbf_path)
+
+    oid_field = arcpy.AddFieldDelimiters(desc.catalogPath, desc.OIDFieldName)
+    assert _get_max_value(desc.catalogPath, desc.OIDFieldName) == oids[-1]
+    assert _get_max_value(desc.catalogPath, desc.OIDFieldName, "{} < {}".format(oid_field, oids[-1])) == oids[-2]
+    assert _get_max_value(desc.catalogPath, desc.OIDFieldName, "{} < {}".format(oid_field, oids[0])) is None
+    assert _get_max_value(dbf_path, arcpy.Describe(dbf_path).OIDFieldName) == len(oids) - 1
+
+
+def test_workspace_output_collisions():
+    Child = namedtuple("Child", ["name", "dataType"])
+    children = [Child("Roads", "FeatureClass"), Child("roads", "Table"), Child("Roads_1", "FeatureClass")]
+
+    outputs = arcpyext.conversion.to_shapefile._get_workspace_outputs(children, TEST_OUTPUT_PATH)
+    output_names = [o.name for _, o in outputs]
+
+    assert output_names == ["Roads.shp", "roads_1.shp", "Roads_1_1.shp"]
+
+
+def test_metadata_cache(in_workspace):
+    cache = MetadataCache()
+    workspace_metadata = cache.describe_workspace(str(in_workspace))
+
+    assert workspace_metadata.dataType == "Workspace"
+    assert workspace_metadata.children
+    assert cache.describe_workspace(str(in_workspace)) is workspace_metadata
+
+    for child in workspace_metadata.children:
+        # children are served from the workspace description, not described again
+        assert cache.describe(child.catalogPath) is child
+
+        # snapshots can be sent to worker processes
+        assert pickle.loads(pickle.dumps(child)).name == child.name
+
+        if child.dataType in ("FeatureClass", "Table"):
+            assert [f.name for f in child.fields] == [f.name for f in arcpy.ListFields(child.catalogPath)]
+        if child.dataType == "FeatureClass":
+            assert child.shapeType == arcpy.Describe(child.catalogPath).shapeType
+            assert child.spatialReference.wkt
+
+
 @pytest.mark.parametrize(
     ("output_path", "version"), [
         (TEST_OUTPUT_PATH.joinpath("gpkg_default\\output.gpkg"), None),
@@ -71,6 +209,13 @@ def test_convert_geopackage(in_workspace, output_path, version):
     arcpyext.conversion.to_geopackage.workspace(in_workspace_str, output_path_str, version=version)
     assert output_path.exists()
 
+    # check datasets were written as GeoPackage contents
+    connection = sqlite3.connect(output_path_str)
+    try:
+        assert connection.execute("SELECT COUNT(*) FROM gpkg_contents").fetchone()[0] > 0
+    finally:
+        connection.close()
+
 
 @pytest.mark.parametrize(("output_path"), [(TEST_OUTPUT_PATH.joinpath("kml"))])
 def test_convert_kml(in_workspace, output_path):
@@ -94,6 +239,19 @@ def test_convert_mapinfo_tab(in_workspace, output_path):
     assert any(child.suffix.lower() in [".tab"] for child in output_path.iterdir())
 
 
+@pytest.mark.parametrize(("output_path"), [(TEST_OUTPUT_PATH.joinpath("parquet"))])
+def test_convert_parquet(in_workspace, output_path):
+    pytest.importorskip("pyarrow")
+
+    in_workspace_str = str(in_workspace)
+    output_path_str = str(output_path)
+    arcpyext.conversion.to_parquet.workspace(in_workspace_str, output_path_str)
+    assert output_path.exists()
+
+    # check Parquet files exist
+    assert any(child.suffix.lower() in [".parquet"] for child in output_path.iterdir())
+
+
 @pytest.mark.parametrize(("output_path"), [(TEST_OUTPUT_PATH.joinpath("shp"))])
 def test_convert_shapefile(in_workspace, output_path):
     in_workspace_str = str(in_workspace)
@@ -105,11 +263,16 @@ def test_convert_shapefile(in_workspace, output_path):
     assert any(child.suffix.lower() in [".shp"] for child in output_path.iterdir())
 
 
-@pytest.mark.parametrize(("output_path"), [(TEST_OUTPUT_PATH.joinpath("xlsx\\output.xlsx"))])
-def test_convert_ooxml_workbook(in_workspace, output_path):
+@pytest.mark.parametrize(
+    ("output_path", "constant_memory"), [
+        (TEST_OUTPUT_PATH.joinpath("xlsx\\output.xlsx"), False),
+        (TEST_OUTPUT_PATH.joinpath("xlsx_constant_memory\\output.xlsx"), True)
+    ]
+)
+def test_convert_ooxml_workbook(in_workspace, output_path, constant_memory):
     in_workspace_str = str(in_workspace)
     output_path_str = str(output_path)
-    arcpyext.conversion.to_ooxml_workbook.workspace(in_workspace_str, output_path_str)
+    arcpyext.conversion.to_ooxml_workbook.workspace(in_workspace_str, output_path_str, constant_memory=constant_memory)
     assert output_path.exists()
 
     # check OOXML Workbook exists
@@ -0,0 +1,333 @@
+# coding=utf-8
+"""Tests for the writers, row transforms and manifests used by the conversions, these don't require arcpy."""
+
+# Python 2/3 compatibility
+# pylint: disable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+from future.builtins import *
+from future.builtins.disabled import *
+from future.standard_library import install_aliases
+install_aliases()
+# pylint: enable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position
+
+import csv
+import datetime
+import gzip
+import io
+import sqlite3
+import struct
+import sys
+import time
+
+from collections import namedtuple
+
+try:
+    import lzma
+except ImportError:
+    lzma = None
+
+import pytest
+import xlsxwriter.exceptions
+
+from arcpyext.conversion._csv import (
+    CsvFileWriter, get_compression_extension, get_csv_file_paths, get_value_converters
+)
+from arcpyext.conversion._geopackage import GeoPackageWriter
+from arcpyext.conversion._manifest import (
+    create_manifest, get_manifest_path, get_schema_hash, read_manifest, remove_manifest, write_manifest
+)
+from arcpyext.conversion._ooxml import SheetNameAllocator, Workbook
+from arcpyext.conversion._parquet import ParquetFileWriter
+from arcpyext.conversion._transform import combine_where_clauses, map_values, select_fields, simplify_geometries
+from pathlib2 import Path
+
+from ..helpers import read_csv
+
+CSV_HEADERS = ["OBJECTID", "NAME", "AREA", "CREATED"]
+CSV_FIELD_TYPES = ["OID", "String", "Double", "Date"]
+CSV_ROWS = [(1, "a", 1.5, datetime.datetime(2020, 1, 2, 3, 4, 5)), (2, None, None, None), (3, "c\nd", 0.1, None)]
+
+
+def _expected_csv(rows):
+    expected = io.BytesIO() if sys.version_info[0] < 3 else io.StringIO()
+    expected_writer = csv.writer(expected, dialect="excel")
+    for row in [CSV_HEADERS] + rows:
+        expected_writer.writerow([str(s).encode("utf-8") for s in row] if sys.version_info[0] < 3 else row)
+
+    return expected.getvalue() if sys.version_info[0] < 3 else expected.getvalue().encode("utf-8")
+
+
+@pytest.mark.parametrize(("chunk_size"), [1, 2, 1000])
+def test_csv_file_writer(tmpdir, chunk_size):
+    output_path = Path(str(tmpdir)).joinpath("output.csv")
+
+    with CsvFileWriter(output_path, CSV_HEADERS) as writer:
+        assert writer.write_rows(iter(CSV_ROWS), get_value_converters(CSV_FIELD_TYPES), chunk_size) == len(CSV_ROWS)
+
+    assert writer.file_paths == [output_path]
+    assert output_path.read_bytes() == _expected_csv(list(CSV_ROWS))
+
+
+@pytest.mark.parametrize(("compression", "open_file"), [(None, io.open), ("gzip", gzip.open)])
+def test_csv_file_writer_append(tmpdir, compression, open_file):
+    output_path = Path(str(tmpdir)).joinpath("output.csv" + get_compression_extension(compression))
+
+    with CsvFileWriter(output_path, CSV_HEADERS, compression) as writer:
+        writer.write_rows(CSV_ROWS[:1], get_value_converters(CSV_FIELD_TYPES))
+
+    with CsvFileWriter(output_path, CSV_HEADERS, compression, append=True) as writer:
+        writer.write_rows(CSV_ROWS[1:], get_value_converters(CSV_FIELD_TYPES))
+
+    with open_file(str(output_path), "rb") as csv_file:
+        assert csv_file.read() == _expected_csv(list(CSV_ROWS))
+
+    assert get_csv_file_paths(output_path) == [output_path]
+
+    with pytest.raises(ValueError):
+        CsvFileWriter(output_path, CSV_HEADERS, compression, max_rows_per_file=1, append=True)
+
+
+def test_csv_file_paths_glob_characters(tmpdir):
+    output_path = Path(str(tmpdir)).joinpath("output [2020].csv")
+
+    with CsvFileWriter(output_path, CSV_HEADERS, max_rows_per_file=1) as writer:
+        writer.write_rows(CSV_ROWS, get_value_converters(CSV_FIELD_TYPES))
+
+    # the brackets in the name are matched as they are, not as a glob character class
+    Path(str(tmpdir)).joinpath("output 2.part0001.csv").write_bytes(b"")
+    assert len(writer.file_paths) == len(CSV_ROWS)
+    assert get_csv_file_paths(output_path) == writer.file_paths
+
+
+@pytest.mark.parametrize(
+    ("compression", "open_file"), [(None, io.open), ("gzip", gzip.open)] +
+    ([("xz", lzma.open)] if sys.version_info[0] >= 3 else [])
+)
+@pytest.mark.parametrize(("max_rows_per_file", "max_bytes_per_file"), [(None, None), (2, None), (None, 60)])
+def test_csv_file_writer_compressed_parts(tmpdir, compression, open_file, max_rows_per_file, max_bytes_per_file):
+    rows = CSV_ROWS * 4
+    output_path = Path(str(tmpdir)).joinpath("output.csv" + get_compression_extension(compression))
+
+    with CsvFileWriter(output_path, CSV_HEADERS, compression, max_rows_per_file, max_bytes_per_file) as writer:
+        writer.write_rows(rows, get_value_converters(CSV_FIELD_TYPES), chunk_size=5)
+
+    parts = []
+    for file_path in writer.file_paths:
+        with open_file(str(file_path), "rb") as part_file:
+            parts.append(part_file.read())
+
+    if max_rows_per_file is None and max_bytes_per_file is None:
+        assert writer.file_paths == [output_path]
+    else:
+        assert len(parts) > 1
+        assert writer.file_paths[0].name == "output.part0001.csv" + get_compression_extension(compression)
+        assert get_csv_file_paths(output_path) == writer.file_paths
+
+    # each part has the header, and the parts hold all the rows in order
+    header = _expected_csv([])
+    assert all(p.startswith(header) for p in parts)
+    assert header + b"".join(p[len(header):] for p in parts) == _expected_csv(rows)
+
+    if max_rows_per_file:
+        assert all(len(read_csv(p)) <= max_rows_per_file + 1 for p in parts)
+    if max_bytes_per_file:
+        assert all(len(p) <= max_bytes_per_file for p in parts)
+
+
+def test_row_transforms():
+    Field = namedtuple("Field", ["name", "type"])
+    fields = [Field("OBJECTID", "OID"), Field("Status", "SmallInteger"), Field("Shape", "Geometry")]
+
+    assert select_fields(fields, None) == fields
+    assert select_fields(fields, ["shape", "MISSING", "objectid"]) == [fields[2], fields[0]]
+
+    assert combine_where_clauses(None, "") is None
+    assert combine_where_clauses("A = 1", None) == "A = 1"
+    assert combine_where_clauses("A = 1", "B > 2") == "(A = 1) AND (B > 2)"
+
+    rows = [(1, 0, None), (2, 1, None), (3, 9, None)]
+    mapped_rows = list(map_values(iter(rows), [None, {0: "Proposed", 1: "Built"}, None]))
+    assert mapped_rows == [[1, "Proposed", None], [2, "Built", None], [3, 9, None]]
+
+    class Geometry(object):
+        def __init__(self, wkt):
+            self.WKT = wkt
+
+        def generalize(self, tolerance):
+            return Geometry("{} ~{}".format(self.WKT, tolerance))
+
+    simplified_rows = list(simplify_geometries([(1, Geometry("LINESTRING (0 0, 1 1)")), (2, None)], 1, 0.5, "WKT"))
+    assert simplified_rows == [[1, "LINESTRING (0 0, 1 1) ~0.5"], [2, None]]
+
+
+def test_conversion_manifest(tmpdir):
+    Field = namedtuple("Field", ["name", "type", "length", "precision", "scale", "isNullable", "domain"])
+    fields = [Field("OBJECTID", "OID", 4, 0, 0, False, ""), Field("STATUS", "String", 2, 0, 0, True, "STATUS_DOMAIN")]
+    coded_values = {"STATUS": {"A": "Active", "I": "Inactive"}}
+    output_path = Path(str(tmpdir)).joinpath("output.csv")
+
+    schema_hash = get_schema_hash(fields, coded_values)
+    manifest = create_manifest(10, 12, datetime.datetime(2020, 1, 2, 3, 4, 5), schema_hash)
+    assert manifest["lastEdited"] == "2020-01-02T03:04:05.000000"
+    assert schema_hash != get_schema_hash(fields[:1] + [fields[1]._replace(length=60)], coded_values)
+
+    # a field's domain, or the values of its domain, changing changes the schema
+    assert schema_hash != get_schema_hash(fields[:1] + [fields[1]._replace(domain="OTHER_DOMAIN")], coded_values)
+    assert schema_hash != get_schema_hash(fields, {"STATUS": {"A": "Active", "C": "Closed"}})
+    assert schema_hash == get_schema_hash(fields, {"STATUS": {"I": "Inactive", "A": "Active"}})
+
+    assert read_manifest(output_path) is None
+    write_manifest(output_path, manifest)
+    assert read_manifest(output_path) == manifest
+
+    remove_manifest(output_path)
+    assert read_manifest(output_path) is None
+
+    # unreadable manifests are ignored
+    Path(get_manifest_path(output_path)).write_text("{")
+    assert read_manifest(output_path) is None
+
+
+class _FixedOffset(datetime.tzinfo):
+    def __init__(self, hours):
+        self._offset = datetime.timedelta(hours=hours)
+
+    def dst(self, dt):
+        return datetime.timedelta(0)
+
+    def utcoffset(self, dt):
+        return self._offset
+
+
+def _polygon_wkb(min_x, min_y, max_x, max_y):
+    ring = [(min_x, min_y), (min_x, max_y), (max_x, max_y), (max_x, min_y), (min_x, min_y)]
+    return struct.pack("<BIII", 1, 3, 1, len(ring)) + b"".join(struct.pack("<2d", x, y) for x, y in ring)
+
+
+def test_geopackage_writer(tmpdir):
+    output_path = Path(str(tmpdir)).joinpath("output.gpkg")
+    fields = [("OBJECTID", "OID"), ("Shape", "Geometry"), ("NAME", "String"), ("CREATED", "Date")]
+    rows = [
+        (1, _polygon_wkb(0, 0, 1, 1), "a", datetime.datetime(2020, 1, 2, 3, 4, 5, 6000)),
+        (2, None, None, None),
+        (
+            3, struct.pack("<BII", 1, 6, 2) + _polygon_wkb(2, -1, 3, 0) + _polygon_wkb(4, 4, 5, 6), "c",
+            datetime.datetime(2020, 1, 2, 3, 4, 5, tzinfo=_FixedOffset(10))
+        )
+    ]
+
+    with GeoPackageWriter(output_path, 1.2) as writer:
+        srs_id = writer.add_spatial_reference("GDA2020 / MGA zone 55", 7855, 'PROJCS["GDA2020_MGA_Zone_55"]')
+        assert writer.add_spatial_reference("GDA2020 / MGA zone 55", 7855, 'PROJCS["GDA2020_MGA_Zone_55"]') == srs_id
+        assert writer.add_spatial_reference("Unknown", 0, "{B286C06B-0879-11D2-AACA-00C04FA33C20}") == -1
+
+        # custom spatial references are given IDs that Esri codes don't use
+        web_mercator_id = writer.add_spatial_reference("WGS 1984 Web Mercator", 102100, 'PROJCS["Web_Mercator"]')
+        custom_id = writer.add_spatial_reference("Custom", 0, 'PROJCS["Custom"]')
+        assert writer.add_spatial_reference("WGS 1984 Web Mercator", 102101, 'PROJCS["Web_Mercator_2"]') == 102101
+        assert web_mercator_id == 102100 and custom_id not in (102100, 102101)
+
+        # codes with an ID already taken are given a free ID
+        writer._connection.execute(
+            "INSERT INTO gpkg_spatial_ref_sys VALUES ('Other', 3857, 'NONE', 3857, 'PROJCS[\"Other\"]', NULL)"
+        )
+        mercator_id = writer.add_spatial_reference("WGS 84 / Pseudo-Mercator", 3857, 'PROJCS["Mercator"]')
+        assert mercator_id not in (3857, custom_id)
+        assert writer.add_spatial_reference("WGS 84 / Pseudo-Mercator", 3857, 'PROJCS["Mercator"]') == mercator_id
+
+        assert writer.write_table("parcels", fields, iter(rows), "MULTIPOLYGON", srs_id, chunk_size=2) == 3
+        assert writer.write_table("names", [("NAME", "String")], [("a", ), ("b", )]) == 2
+
+        with pytest.raises(ValueError):
+            writer.write_table("Parcels", fields, [])
+
+    # package is a single file when closed
+    assert not Path(str(output_path) + "-wal").exists()
+
+    connection = sqlite3.connect(str(output_path))
+    try:
+        assert connection.execute("PRAGMA application_id").fetchone()[0] == 0x47504B47
+        assert connection.execute("SELECT data_type, min_x, min_y, max_x, max_y, srs_id FROM gpkg_contents "
+                                  "WHERE table_name = 'parcels'").fetchone() == ("features", 0, -1, 5, 6, 7855)
+        assert connection.execute("SELECT data_type FROM gpkg_contents WHERE table_name = 'names'").fetchone() == (
+            "attributes", )
+        assert connection.execute("SELECT fid, NAME FROM names").fetchall() == [(1, "a"), (2, "b")]
+
+        blob, created = connection.execute("SELECT Shape, CREATED FROM parcels WHERE OBJECTID = 1").fetchone()
+
+        # naive date-times are written without a time zone, others are converted to UTC
+        assert created == "2020-01-02T03:04:05.006"
+        assert connection.execute("SELECT CREATED FROM parcels WHERE OBJECTID = 3").fetchone() == (
+            "2020-01-01T17:04:05.000Z", )
+        assert bytes(blob[:8]) == struct.pack("<2sBBi", b"GP", 0, 0x03, 7855)
+        assert struct.unpack_from("<4d", blob, 8) == (0, 1, 0, 1)
+        assert bytes(blob[40:]) == rows[0][1]
+
+        # features without geometry aren't indexed
+        assert connection.execute("SELECT id, minx, maxx, miny, maxy FROM rtree_parcels_Shape").fetchall() == [
+            (1, 0, 1, 0, 1), (3, 2, 5, -1, 6)
+        ]
+    finally:
+        connection.close()
+
+
+def test_parquet_file_writer(tmpdir):
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    output_path = Path(str(tmpdir)).joinpath("output.parquet")
+    fields = list(zip(CSV_HEADERS, CSV_FIELD_TYPES)) + [("SHAPE", "Geometry"), ("NOTES", "XML")]
+    rows = [row + (b"\x01\x01\x00\x00\x00" + b"\x00" * 16, "<notes />") for row in CSV_ROWS] * 3
+
+    with ParquetFileWriter(output_path, fields, row_group_size=2, compression={"NAME": "zstd"}) as writer:
+        assert writer.write_rows(rows) == len(rows)
+
+    parquet_file = pq.ParquetFile(str(output_path))
+    assert parquet_file.metadata.num_row_groups == 5
+    assert parquet_file.metadata.row_group(0).column(1).compression == "ZSTD"
+    assert parquet_file.metadata.row_group(0).column(0).compression == "SNAPPY"
+    assert [str(f.type) for f in parquet_file.schema_arrow] == [
+        "int64", "string", "double", "timestamp[us]", "binary", "string"
+    ]
+    assert [tuple(r.values()) for r in parquet_file.read().to_pylist()] == rows
+
+
+def test_ooxml_sheet_names(tmpdir):
+    output_path = Path(str(tmpdir)).joinpath("output.xlsx")
+    table_name = "A_long_table_name_that_is_truncated_to_fit_a_sheet"
+
+    workbook = Workbook(str(output_path), {"in_memory": True})
+    try:
+        # every name is the same once truncated, and some differ only by case, adding a sheet takes constant time (a
+        # linear check of each name against every sheet takes over 15 seconds for 10,000 sheets)
+        start = time.time()
+        for i in range(10000):
+            sheet_name = workbook.get_unique_sheet_name(table_name.upper() if i % 2 else table_name)
+            workbook.add_worksheet(sheet_name).write_row(0, 0, [sheet_name])
+        assert time.time() - start < 5
+
+        # sheets added by name aren't allocated again, and can't be added twice
+        workbook.add_worksheet("Roads")
+        assert workbook.get_unique_sheet_name("roads") == "roads~1"
+        with pytest.raises(xlsxwriter.exceptions.DuplicateWorksheetName):
+            workbook.add_worksheet("ROADS")
+
+        # sheets given default names are still checked by xlsxwriter (which numbers them by the sheets added so far)
+        workbook.add_worksheet("Sheet10003")
+        with pytest.raises(xlsxwriter.exceptions.DuplicateWorksheetName):
+            workbook.add_worksheet()
+    finally:
+        workbook.close()
+
+    assert output_path.exists()
+
+    sheet_names = [w.name for w in workbook.worksheets()]
+    assert len(set(n.lower() for n in sheet_names)) == len(sheet_names) == 10002
+    assert all(len(n) <= 31 for n in sheet_names)
+    assert sheet_names[:2] == [table_name[:31], table_name[:29].upper() + "~1"]
+    assert sheet_names[9999] == table_name[:26].upper() + "~9999"
+
+    sheet_names = SheetNameAllocator(["Roads"])
+    assert sheet_names.allocate("roads") == "roads~1"
+    assert sheet_names.allocate("roads~1") == "roads~1~1"
+    assert sheet_names.allocate("roads") == "roads~2"
+    assert sheet_names.allocate("'Roads: [main]'") == "Roads_ _main_"
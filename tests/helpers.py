@@ -7,6 +7,10 @@ from future.standard_library import install_aliases
 install_aliases()
 # pylint: enable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position
 
+import csv
+import io
+import sys
+
 TRUEISH_TEST_PARAMS = [
     (True, True),
     ("TRUE", True),
@@ -22,4 +26,10 @@ TRUEISH_TEST_PARAMS = [
     (0, False),
     (2, False),
     (-1, False)
-]
\ No newline at end of file
+]
+
+
+def read_csv(data):
+    """Reads the rows of CSV file contents (bytes)."""
+    csv_file = io.BytesIO(data) if sys.version_info[0] < 3 else io.StringIO(data.decode("utf-8"), newline="")
+    return list(csv.reader(csv_file, dialect="excel"))
@@ -0,0 +1,89 @@
+# coding=utf-8
+"""Tests for reading ArcGIS Pro documents, these don't require arcpy or the ArcGIS Pro SDK."""
+
+# Python 2/3 compatibility
+# pylint: disable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+from future.builtins.disabled import *
+from future.builtins import *
+from future.standard_library import install_aliases
+install_aliases()
+# pylint: enable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position
+
+import os.path
+import sys
+
+# Third-party imports
+import pytest
+
+pytestmark = pytest.mark.skipif(sys.version_info[0] < 3, reason="ArcGIS Pro documents are only read on Python 3")
+
+PROJECT_PATH = os.path.abspath("{0}/../samples/test_mapping_complex.aprx".format(os.path.dirname(__file__)))
+
+
+@pytest.fixture(scope="module")
+def project():
+    from arcpyext.mapping._cim import ProProject
+
+    with ProProject(PROJECT_PATH) as proj:
+        yield proj
+
+
+def test_project_maps(project):
+    maps = project.maps
+
+    assert [m.name for m in maps] == ["Layers"]
+    assert maps[0].spatial_reference_wkid == 4283
+
+
+def test_map_layers(project):
+    layers = project.maps[0].layers
+
+    assert [(l.long_name, l.service_id, l.visible) for l in layers] == [
+        ("Layer 1", 1, True),
+        ("Layer 2", 2, True),
+        ("New Group Layer", 33, True),
+        ("New Group Layer\\Layer 3", 3, True),
+        ("New Group Layer\\Unchanged", 4, True)
+    ]
+    assert [c.name for c in layers[2].children] == ["Layer 3", "Unchanged"]
+
+    feature_table = layers[0].feature_table
+    assert feature_table.definition_query == "FID <1"
+    assert [(f.name, f.alias, f.visible) for f in feature_table.fields][:2] == [("FID", "FID", True),
+                                                                                ("Shape", "Shape", True)]
+
+
+def test_map_tables(project):
+    tables = project.maps[0].tables
+
+    assert [(t.name, t.service_id) for t in tables] == [("DataTableTest", 34)]
+    assert tables[0].data_connection.Dataset == "DataTableTest"
+
+
+def test_pycim_from_json():
+    from arcpyext.mapping._cim.pycim import CIMFeatureLayer
+
+    layer = CIMFeatureLayer.FromJson(
+        '{"type": "CIMFeatureLayer", "name": "Roads", "serviceLayerID": 5, "visibility": false, '
+        '"featureTable": {"type": "CIMFeatureTable", "fieldDescriptions": [{"type": "CIMFieldDescription", '
+        '"fieldName": "ROAD_NAME", "alias": "Road Name", "visible": true}]}}'
+    )
+
+    assert layer.cim_type == "CIMFeatureLayer"
+    assert (layer.Name, layer.ServiceLayerID, layer.Visibility) == ("Roads", 5, False)
+    assert layer.FeatureTable.FieldDescriptions[0].Alias == "Road Name"
+    assert layer.Description is None
+
+
+def test_import_arcpy(monkeypatch):
+    from arcpyext import _arcpy_import
+
+    # an arcpy that can't be imported is only ignored if it isn't installed
+    monkeypatch.setitem(sys.modules, "arcpy", None)
+    monkeypatch.setattr(_arcpy_import, "find_spec", lambda name: None)
+    assert _arcpy_import.import_arcpy() is None
+
+    monkeypatch.setattr(_arcpy_import, "find_spec", lambda name: object())
+    with pytest.raises(ImportError):
+        _arcpy_import.import_arcpy()
@@ -13,7 +13,11 @@ install_aliases()
 # Standard libary imports
 import os.path
 import json
+import stat
+import struct
 import sys
+import zipfile
+import zlib
 
 # Third party imports
 import arcpy
@@ -173,6 +177,12 @@ def test_describe(map_doc_a, raises_ex, ex_type):
     # Tables
     assert len(result["maps"][0]["tables"]) == 1
 
+    # Precomputed comparison keys
+    assert result["maps"][0]["layers"][0]["datasourceKey"] == arcpyext.mapping._compare_helpers.create_datasource_key(
+        result["maps"][0]["layers"][0]
+    )
+    assert "fieldsSignature" in result["maps"][0]["tables"][0]
+
 
 @pytest.mark.parametrize(("expected_document_changes", "expected_first_map_changes", "layers_added", "layers_updated",
                           "layers_removed", "raises_ex", "ex_type"), [(0, 1, 1, 2, 1, False, None)])
@@ -212,3 +222,235 @@ def test_create_replacement_data_sources_list(map_doc_a, data_source_templates):
 
 def test_map_is_valid(map_doc_a):
     assert arcpyext.mapping.is_valid(map_doc_a) == True
+
+
+def test_match_layers():
+    was_layers = [
+        {"index": 0, "serviceId": 1, "name": "Roads", "datasetName": "ROADS"},
+        {"index": 1, "serviceId": 2, "name": "Rivers", "datasetName": "RIVERS"},
+        {"index": 2, "serviceId": 3, "name": "Parcels", "datasetName": "PARCELS"},
+        {"index": 3, "serviceId": 4, "name": "Suburbs", "datasetName": "SUBURBS"}
+    ]
+    now_layers = [
+        # datasource differs only by case, unchanged
+        {"index": 0, "serviceId": 1, "name": "Roads", "datasetName": "roads"},
+        # name changed
+        {"index": 1, "serviceId": 2, "name": "Waterways", "datasetName": "RIVERS"},
+        # id changed
+        {"index": 2, "serviceId": 30, "name": "Parcels", "datasetName": "PARCELS"},
+        # new layer
+        {"index": 3, "serviceId": 5, "name": "Towns", "datasetName": "TOWNS"}
+    ]
+
+    added, matched, removed = arcpyext.mapping._mapping._match_layers(was_layers, now_layers)
+
+    assert [l["name"] for l in added] == ["Towns"]
+    assert [(w["name"], n["name"]) for w, n in matched] == [("Roads", "Roads"), ("Rivers", "Waterways"),
+                                                              ("Parcels", "Parcels")]
+    assert [l["name"] for l in removed] == ["Suburbs"]
+
+
+def test_describe_cache(tmp_path):
+    cache = arcpyext.mapping.DescribeCache(str(tmp_path))
+    assert cache.get(MAP_A_PATH) is None
+
+    described = arcpyext.mapping.describe(MAP_A_PATH, cache=cache)
+    cached = arcpyext.mapping.describe(MAP_A_PATH, cache=cache)
+
+    assert cache.get(MAP_A_PATH) is not None
+    assert [l["name"] for l in cached["maps"][0]["layers"]] == [l["name"] for l in described["maps"][0]["layers"]]
+    assert arcpyext.mapping.is_valid(cached) == arcpyext.mapping.is_valid(described)
+
+
+def test_describe_many():
+    results = list(arcpyext.mapping.describe_many([MAP_A_PATH, MAP_B_PATH], max_workers=2))
+
+    assert sorted(path for path, _, _ in results) == sorted([MAP_A_PATH, MAP_B_PATH])
+    assert all(error is None for _, _, error in results)
+    assert all(len(description["maps"]) == 1 for _, description, _ in results)
+
+
+def test_validate_many():
+    results = list(arcpyext.mapping.validate_many([MAP_A_PATH, "does_not_exist.aprx"], max_workers=2))
+    results_by_path = {path: (valid, error) for path, valid, error in results}
+
+    assert results_by_path[MAP_A_PATH] == (True, None)
+    assert results_by_path["does_not_exist.aprx"][1] is not None
+
+
+def _read_zip_local_entries(zip_path):
+    """Reads the entries of a zip file from their local headers one after another, as streaming readers do, rather than
+    from its central directory as zipfile does."""
+    with open(zip_path, "rb") as zip_file:
+        data = zip_file.read()
+
+    entries = {}
+    offset = 0
+    while data[offset:offset + 4] == b"PK\x03\x04":
+        flags, method, crc, compress_size, _, name_length, extra_length = struct.unpack_from(
+            "<6xHH4xIIIHH", data, offset
+        )
+        assert not flags & 0x08, "sizes are in a data descriptor, not the local header"
+
+        offset += 30
+        name = data[offset:offset + name_length].decode("utf-8")
+        offset += name_length + extra_length
+        raw = data[offset:offset + compress_size]
+        offset += compress_size
+
+        entries[name] = zlib.decompress(raw, -15) if method == zipfile.ZIP_DEFLATED else raw
+        assert zlib.crc32(entries[name]) & 0xFFFFFFFF == crc
+
+    return entries
+
+
+@pytest.mark.skipif(sys.version_info[0] < 3, reason="Datum transform fixing is only applicable to ArcGIS Pro")
+@pytest.mark.parametrize(("raw_copy"), [True, False])
+def test_fix_datum_transforms(tmp_path, monkeypatch, raw_copy):
+    current_wkt = (
+        'GEOGTRAN["GDA_1994_To_GDA2020_NTv2_3_Conformal",GEOGCS["GCS_GDA_1994",DATUM["D_GDA_1994",SPHEROID['
+        '"GRS_1980",6378137.0,298.257222101]],PRIMEM["Greenwich",0.0],UNIT["Degree",0.0174532925199433]],GEOGCS['
+        '"GDA2020",DATUM["GDA2020",SPHEROID["GRS_1980",6378137.0,298.257222101]],PRIMEM["Greenwich",0.0],UNIT['
+        '"Degree",0.0174532925199433]],METHOD["NTv2"],PARAMETER["Dataset_australia/GDA94_GDA2020_conformal",0.0],'
+        'OPERATIONACCURACY[0.05],AUTHORITY["EPSG",8446]]'
+    )
+    map_xml = (
+        '<CIMMap xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xsi:type="typens:CIMMap" '
+        'xmlns:typens="http://www.esri.com/schemas/ArcGIS/2.9.0"><DatumTransforms><CIMDatumTransform>'
+        '<GeoTransformation><XForms><TransformationItem><XForm><WKT>{}</WKT><WKID>8446</WKID></XForm>'
+        '</TransformationItem></XForms></GeoTransformation></CIMDatumTransform></DatumTransforms></CIMMap>'
+    ).format(current_wkt.replace('"', "&quot;"))
+    thumbnail = os.urandom(4096)
+
+    def create_project(file_name, version):
+        project_path = str(tmp_path / file_name)
+        with zipfile.ZipFile(project_path, "w", zipfile.ZIP_DEFLATED) as project_zip:
+            project_zip.writestr(
+                "DocumentInfo.xml", "<DocumentInfo><Version>{}</Version></DocumentInfo>".format(version)
+            )
+            project_zip.writestr(
+                "GISProject.xml", "<GISProject><ProjectItems><CIMProjectItem><CatalogPath>CIMPATH=map/map.xml"
+                "</CatalogPath><ItemType>Map</ItemType></CIMProjectItem></ProjectItems></GISProject>"
+            )
+            project_zip.writestr("map/map.xml", map_xml)
+            project_zip.writestr("thumbnail.png", thumbnail)
+        return project_path
+
+    if not raw_copy:
+        # zipfile internals the raw copy relies on have changed, entries are copied through zipfile instead
+        monkeypatch.setattr(arcpyext.mapping._mapping3, "_can_copy_zip_entry_raw", lambda source, target: False)
+
+    old_project_path = create_project("old.aprx", "2.9.0")
+    os.chmod(old_project_path, 0o644)
+    old_project_mode = stat.S_IMODE(os.stat(old_project_path).st_mode)
+    with open(old_project_path, "rb") as project_file:
+        old_project_bytes = project_file.read()
+
+    assert arcpyext.mapping.fix_datum_transforms(old_project_path, dry_run=True) == 1
+    with open(old_project_path, "rb") as project_file:
+        assert project_file.read() == old_project_bytes
+
+    assert arcpyext.mapping.fix_datum_transforms(old_project_path) == 1
+    assert stat.S_IMODE(os.stat(old_project_path).st_mode) == old_project_mode
+
+    with zipfile.ZipFile(old_project_path) as project_zip:
+        assert project_zip.testzip() is None
+        assert project_zip.read("thumbnail.png") == thumbnail
+        assert "<WKID>108446</WKID>" in project_zip.read("map/map.xml").decode("utf-8")
+        entries = {i.filename: project_zip.read(i) for i in project_zip.infolist()}
+
+    # the local headers agree with the central directory
+    assert _read_zip_local_entries(old_project_path) == entries
+
+    # projects at or above the version the transforms changed at are left untouched
+    new_project_path = create_project("new.aprx", "3.0.0")
+    with open(new_project_path, "rb") as project_file:
+        new_project_bytes = project_file.read()
+
+    assert arcpyext.mapping.fix_datum_transforms(new_project_path) == 0
+
+    with open(new_project_path, "rb") as project_file:
+        assert project_file.read() == new_project_bytes
+
+
+@pytest.mark.skipif(sys.version_info[0] < 3, reason="Datum transform fixing is only applicable to ArcGIS Pro")
+def test_fix_datum_transforms_many(tmp_path):
+    (tmp_path / "nested").mkdir()
+    for map_path, version in [(tmp_path / "old.mapx", "2.9.0"), (tmp_path / "nested" / "new.mapx", "3.0.0")]:
+        map_path.write_text(
+            json.dumps(
+                {
+                    "version": version,
+                    "mapDefinition": {
+                        "datumTransforms": [{
+                            "geoTransformation": {
+                                "geoTransforms": [{
+                                    "name": "GDA_1994_To_GDA2020_1",
+                                    "wkid": 8048
+                                }]
+                            }
+                        }]
+                    }
+                }
+            ),
+            encoding="utf-8"
+        )
+
+    results = list(arcpyext.mapping.fix_datum_transforms_many(str(tmp_path), max_workers=2))
+    changes_by_name = {os.path.basename(path): report["changes"] for path, report, _ in results}
+
+    assert all(error is None for _, _, error in results)
+    assert changes_by_name == {"old.mapx": 1, "new.mapx": 0}
+
+
+@pytest.mark.skipif(sys.version_info[0] < 3, reason="The CIM readers are only applicable to ArcGIS Pro")
+def test_cim_lru_cache():
+    from arcpyext.mapping._cim.helpers import LruCache
+
+    cache = LruCache(2)
+    cache.get("a", lambda: 1)
+    cache.get("b", lambda: 2)
+
+    # touching "a" makes "b" the least recently used item, which is discarded when "c" is added
+    assert cache.get("a", lambda: 10) == 1
+    cache.get("c", lambda: 3)
+
+    assert "a" in cache and "c" in cache and not "b" in cache
+    assert cache.get("b", lambda: 20) == 20
+    assert len(cache) == 2
+
+
+@pytest.mark.skipif(sys.version_info[0] < 3, reason="The CIM readers are only applicable to ArcGIS Pro")
+def test_cim_project_archive():
+    from arcpyext.mapping._cim.archive import ProjectArchive
+
+    with zipfile.ZipFile(MAP_A_PATH) as project_zip, ProjectArchive(MAP_A_PATH) as project_archive:
+        assert sorted(project_archive.namelist()) == sorted(project_zip.namelist())
+
+        for name in project_zip.namelist():
+            assert project_archive.read_view(name, 16).tobytes() == project_zip.read(name)[:16]
+            assert project_archive.read(name) == project_zip.read(name)
+
+        assert project_archive.read_text("layers/layers.xml").startswith("<CIMMap")
+
+        with pytest.raises(KeyError):
+            project_archive.read("does_not_exist.xml")
+
+
+#yapf: disable
+@pytest.mark.skipif(sys.version_info[0] < 3, reason="The CIM readers are only applicable to ArcGIS Pro")
+@pytest.mark.parametrize(
+    ("cim_bytes", "expected_type"),
+    [
+        (b'{"type" : "CIMFeatureLayer", "name" : "Roads"}', "CIMFeatureLayer"),
+        (b'\xef\xbb\xbf{\n  "type" : "CIMGroupLayer",\n', "CIMGroupLayer"),
+        (b'{"name" : "Roads", "type" : "CIMFeatureLayer"}', None),
+        (b"<CIMFeatureLayer xsi:type='typens:CIMFeatureLayer'>", "CIMFeatureLayer"),
+        (b"<?xml version='1.0' encoding='utf-8'?>\n<CIMRasterLayer>", "CIMRasterLayer")
+    ]
+)
+#yapf: enable
+def test_cim_get_cim_type(cim_bytes, expected_type):
+    from arcpyext.mapping._cim.helpers import get_cim_type
+
+    assert get_cim_type(memoryview(cim_bytes)) == expected_type
@@ -0,0 +1,92 @@
+# coding=utf-8
+"""Tests for comparing JSON gdb schema representations, these don't require arcpy."""
+
+# Python 2/3 compatibility
+# pylint: disable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+from future.builtins.disabled import *
+from future.builtins import *
+from future.standard_library import install_aliases
+install_aliases()
+# pylint: enable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position
+
+import copy
+import io
+import json
+import os.path
+
+# Third-party imports
+import pytest
+
+from arcpyext.schematransform._diff import diff, diff_schemas, has_changes
+
+IN_JSON_PATH = os.path.normpath("{0}/input/input.json".format(os.path.dirname(__file__)))
+
+
+@pytest.fixture(scope="module")
+def schema():
+    with io.open(IN_JSON_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _get_object(schema, name):
+    return next(x for x in schema['schema'] if x['name'] == name)
+
+
+def test_diff_unchanged(schema, tmpdir):
+    # names are matched case-insensitively
+    existing = copy.deepcopy(schema)
+    for x in existing['schema']:
+        x['name'] = x['name'].lower()
+
+    assert not has_changes(diff_schemas(schema, existing))
+
+    # schemas can be compared as JSON files
+    existing_path = str(tmpdir.join("existing.json"))
+    with io.open(existing_path, "w", encoding="utf-8") as f:
+        f.write(json.dumps(existing, ensure_ascii=False))
+
+    assert not has_changes(diff(IN_JSON_PATH, existing_path))
+
+
+def test_diff_additions(schema):
+    target = copy.deepcopy(schema)
+
+    permit = _get_object(target, "LR_SRM_PERMIT")
+    field = dict(permit['fields'][-1], name="NEW_FIELD", domain="NEW_DOMAIN")
+    permit['fields'].append(field)
+    index = {'name': "IDX_NEW_FIELD", 'fields': [field], 'ascending': True, 'unique': False}
+    permit['indexes'].append(index)
+
+    stock_name = _get_object(target, "LR_SRM_STOCK_NAME")
+    stock_name['values'].append({'k': "Yaks", 'v': "Yaks"})
+
+    domain = dict(stock_name, name="NEW_DOMAIN", values=[{'k': "A", 'v': "A"}])
+    relationship = dict(_get_object(target, "LR_SRM_R_PERMIT_TRAVEL"), name="LR_SRM_R_NEW")
+    target['schema'].extend([domain, relationship])
+
+    changes = diff_schemas(target, schema)
+
+    assert changes['domains'] == [domain]
+    assert changes['codedValues'] == [{'name': "LR_SRM_STOCK_NAME", 'values': [{'k': "Yaks", 'v': "Yaks"}]}]
+    assert changes['datasets'] == []
+    assert changes['fields'] == [{'name': "LR_SRM_PERMIT", 'type': "Table", 'fields': [field]}]
+    assert changes['indexes'] == [{'name': "LR_SRM_PERMIT", 'type': "Table", 'indexes': [index]}]
+    assert changes['relationships'] == [relationship]
+    assert changes['conflicts'] == []
+
+    # objects only in the geodatabase are left as they are
+    assert not has_changes(diff_schemas(schema, target))
+
+
+def test_diff_conflicts(schema):
+    target = copy.deepcopy(schema)
+
+    permit = _get_object(target, "LR_SRM_PERMIT")
+    permit['fields'][-1]['type'] = "Double"
+    _get_object(target, "LR_SRM_STOCK_NAME")['values'][0]['v'] = "Changed"
+
+    changes = diff_schemas(target, schema)
+
+    assert len(changes['conflicts']) == 2
+    assert not changes['fields'] and not changes['codedValues']
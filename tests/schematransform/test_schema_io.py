@@ -0,0 +1,73 @@
+# coding=utf-8
+"""Tests for writing and reading JSON gdb schema representations one object at a time, these don't require arcpy."""
+
+# Python 2/3 compatibility
+# pylint: disable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+from future.builtins.disabled import *
+from future.builtins import *
+from future.standard_library import install_aliases
+install_aliases()
+# pylint: enable=wildcard-import,unused-wildcard-import,wrong-import-order,wrong-import-position
+
+import io
+import json
+import os.path
+
+# Third-party imports
+import pytest
+
+from arcpyext.schematransform._schema_io import SchemaWriter, read_schema_objects
+
+IN_JSON_PATH = os.path.normpath("{0}/input/input.json".format(os.path.dirname(__file__)))
+
+
+@pytest.fixture(scope="module")
+def schema_text():
+    with io.open(IN_JSON_PATH, encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize(("chunk_size"), [1, 7, 64 * 1024])
+def test_read_schema_objects(schema_text, chunk_size):
+    assert list(read_schema_objects(IN_JSON_PATH, chunk_size)) == json.loads(schema_text)['schema']
+
+
+@pytest.mark.parametrize(("text"), ['{"version": 1.5, "schema": [{"a": 1}]}', '{"version": 1.5e-7, "schema": []}'])
+def test_read_schema_objects_split_numbers(text, tmpdir):
+    input_path = str(tmpdir.join("input.json"))
+    with io.open(input_path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+    # numbers split across chunks (e.g. after "1." or "1.5e-") are read whole
+    for chunk_size in range(1, len(text) + 1):
+        assert list(read_schema_objects(input_path, chunk_size)) == json.loads(text)['schema']
+
+
+def test_schema_round_trip(schema_text, tmpdir):
+    output_path = str(tmpdir.join("output.json"))
+
+    with io.open(output_path, "w", encoding="utf-8") as f:
+        with SchemaWriter(f) as writer:
+            for x in read_schema_objects(IN_JSON_PATH):
+                writer.write(x)
+
+    # written as the whole schema would be written at once
+    with io.open(output_path, encoding="utf-8") as f:
+        assert f.read() == schema_text
+
+
+@pytest.mark.parametrize(("objects"), [[], [{'name': "[\"ë\", {,}]", 'values': [12345, -1.5e-07, None, True]}]])
+def test_schema_writer(objects, tmpdir):
+    output_path = str(tmpdir.join("output.json"))
+
+    with io.open(output_path, "w", encoding="utf-8") as f:
+        with SchemaWriter(f) as writer:
+            for x in objects:
+                writer.write(x)
+
+    with io.open(output_path, encoding="utf-8") as f:
+        assert f.read() == json.dumps({'schema': objects}, indent=4, ensure_ascii=False)
+
+    for chunk_size in (1, 3, 1024):
+        assert list(read_schema_objects(output_path, chunk_size)) == objects
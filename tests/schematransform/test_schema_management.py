@@ -1,3 +1,5 @@
+import io
+import json
 import os
 import shutil
 
@@ -47,6 +49,62 @@ def test_to_gdb(in_json, out_gdb):
     arcpyext.schematransform.to_gdb(in_json, out_gdb)
     assert(1==1)
 
+def test_to_gdb_fields(in_json, out_gdb):
+    with io.open(in_json, encoding="utf-8") as f:
+        schema = json.load(f)
+
+    # every field is created once, including those a new feature class already has (e.g. SHAPE_Length)
+    for x in schema['schema']:
+        if x['type'] in ("Table", "FeatureClass"):
+            field_names = [f.name.lower() for f in arcpy.ListFields(out_gdb + '/' + x['name'])]
+            assert set(field_names) >= set(f['name'].lower() for f in x['fields'])
+
 def test_to_xml(in_json, out_xml):
     arcpyext.schematransform.to_xml(in_json, out_xml)
     assert(1==1)    
+
+def test_split_field_batch(in_json):
+    with io.open(in_json, encoding="utf-8") as f:
+        schema = json.load(f)
+
+    fields = [f for x in schema['schema'] for f in x.get('fields', [])]
+
+    # a precision or scale can't be set by AddFields either
+    nullable_field = next(f for f in fields if f['nullable'] and not f['required'])
+    precision_field = dict(nullable_field, name="PRECISION_FIELD", precision=10)
+    scale_field = dict(nullable_field, name="SCALE_FIELD", scale=2)
+    fields.extend([precision_field, scale_field])
+
+    batch_fields, single_fields = arcpyext.schematransform._schematransform._split_field_batch(fields)
+
+    # only fields with properties AddFields can't set are added one at a time
+    assert len(batch_fields) + len(single_fields) == len(fields)
+    assert all(f['nullable'] and not f['required'] and not f['precision'] and not f['scale'] for f in batch_fields)
+    assert all(not f['nullable'] or f['required'] or f['precision'] or f['scale'] for f in single_fields)
+    assert nullable_field in batch_fields
+    assert precision_field in single_fields and scale_field in single_fields
+
+def test_get_field_description():
+    st = arcpyext.schematransform._schematransform
+    field = {'name': "STATUS", 'aliasName': "Status", 'type': "String", 'length': 2, 'domain': "STATUS_DOMAIN"}
+
+    # AddFields takes each field as [name, type, alias, length, default value, domain], length only applies to text
+    assert st._get_field_description(field) == ["STATUS", "TEXT", "Status", 2, "", "STATUS_DOMAIN"]
+    assert st._get_field_description(dict(field, type="Double", aliasName=None, domain=None)) == [
+        "STATUS", "DOUBLE", "", "", "", ""
+    ]
+
+def test_plan_schema(in_json):
+    with io.open(in_json, encoding="utf-8") as f:
+        schema = json.load(f)
+
+    st = arcpyext.schematransform._schematransform
+    levels = st._get_plan_levels(st._plan_schema(schema['schema']))
+
+    # every object is built once, after the objects it depends on
+    assert sorted(x['name'] for level in levels for x in level) == sorted(x['name'] for x in schema['schema'])
+    assert set(x['type'] for x in levels[0]) == set([st.DOMAIN])
+    assert set(x['type'] for x in levels[1]) == set([st.TABLE, st.FEATURE_CLASS])
+
+    # relationship classes sharing a class are built one after another
+    assert [len(level) for level in levels[2:]] == [1, 1]